@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from constants import ANALYSIS_POSITION_BUDGET, BLUNDER_THRESHOLD, DFPN_ANALYSIS_NODES
+from engine.dfpn import DfpnSolver, WIN, NO_WIN, UNKNOWN
+from engine.patterns import FIVE
+from engine.evaluation import best_moves, board_from_moves, evaluate_position, score_cell
+from log import get_logger
+
+log = get_logger("analysis")
+
+Move = Tuple[int, int]
+
+_solver: Optional[DfpnSolver] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: Optional[int] = None
+
+def shared_solver() -> DfpnSolver:
+    """One solver per worker process, so its solved cache carries over between plies."""
+    global _solver
+    if _solver is None:
+        _solver = DfpnSolver(max_nodes=DFPN_ANALYSIS_NODES)
+    return _solver
+
+def shared_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """One process pool for every analysis, so workers (and their solvers) stay warm between games."""
+    global _pool, _pool_workers
+    if _pool is None or workers != _pool_workers:
+        shutdown_pool()
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def load_record(path: str) -> List[Move]:
+    """Reads the move list from a saved game record (a `get_state_data` dump)."""
+    with open(path) as f:
+        data = json.load(f)
+    return [tuple(move) for move in data['history']]
+
+def analyse_position(moves: List[Move], ply: int, budget: float = ANALYSIS_POSITION_BUDGET,
+                     engine_command: Optional[str] = None) -> dict:
+    """Compares the move played at `ply` against the engine's choice. Runs in a worker process.
+
+    With `engine_command` the suggestion comes from that protocol engine and is
+    scored with the built-in evaluation, so losses stay comparable.
+    """
+    deadline = time.perf_counter() + budget
+    board = board_from_moves(moves[:ply])
+    if engine_command:
+        from engine.protocol import shared_client
+        best = shared_client(engine_command).best_move(moves[:ply])
+        best_score, candidates, complete = score_cell(board, *best), [best], True
+    else:
+        best_score, candidates, complete = best_moves(board, deadline)
+    x, y = moves[ply]
+    played_score = score_cell(board, x, y)
+
+    # Forced wins (VCF) are proven outright: one the mover had and dropped, or one the move handed over.
+    # The solver shares the position's deadline; a proof cut short by it claims nothing.
+    char, other = ['X', 'O'][ply % 2], ['O', 'X'][ply % 2]
+    solver = shared_solver()
+    forced = solver.solve(board, char, deadline=deadline)
+    forced_win = forced.move if forced.result == WIN else None
+    won = max(solver.patterns.threats(board, x, y, char)) == FIVE
+    board[y][x] = char
+    missed_win = (forced_win is not None and (x, y) != forced_win and not won
+                  and solver.solve(board, char, to_move=False, deadline=deadline).result == NO_WIN)
+    allows = None if won else solver.solve(board, other, deadline=deadline)
+    allows_win = allows is not None and allows.result == WIN
+    complete = complete and forced.result != UNKNOWN and (allows is None or allows.result != UNKNOWN)
+    return {
+        'ply': ply,
+        'move': (x, y),
+        'best_move': candidates[0] if candidates else None,
+        'best_score': best_score,
+        'played_score': played_score,
+        'loss': max(0, best_score - played_score),
+        'evaluation': evaluate_position(board),
+        'complete': complete,
+        'forced_win': forced_win,
+        'missed_win': missed_win,
+        'allows_win': allows_win
+    }
+
+def iter_analysis(moves: List[Move], workers: Optional[int] = None,
+                  budget: float = ANALYSIS_POSITION_BUDGET,
+                  engine_command: Optional[str] = None,
+                  stop: Optional[threading.Event] = None) -> Iterator[dict]:
+    """Spreads every ply across the shared process pool and yields results as they finish (not in ply order).
+
+    Setting `stop` cancels the plies that have not started; the ones running are dropped.
+    """
+    moves = [tuple(move) for move in moves]
+    pool = shared_pool(workers)
+    pending = {pool.submit(analyse_position, moves, ply, budget, engine_command) for ply in range(len(moves))}
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if stop is not None and stop.is_set():
+                return
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+class GameAnalysis:
+    """Runs `iter_analysis` in a background thread so the UI can poll partial results every frame."""
+
+    def __init__(self, moves: List[Move], workers: Optional[int] = None,
+                 budget: float = ANALYSIS_POSITION_BUDGET):
+        self.moves = list(moves)
+        self.workers = workers
+        self.budget = budget
+        self.results: Dict[int, dict] = {}
+        self.done = False
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+
+    def cancel(self):
+        """Abandons an unfinished analysis; plies still queued in the pool are not run."""
+        if not self.done:
+            self._stop.set()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            for result in iter_analysis(self.moves, self.workers, self.budget, stop=self._stop):
+                with self._lock:
+                    self.results[result['ply']] = result
+        except Exception as e:
+            log.error("Analysis failed", error=str(e))
+        self.elapsed = time.perf_counter() - start
+        self.done = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stop.is_set()
+
+    @property
+    def progress(self) -> float:
+        return len(self.results) / len(self.moves) if self.moves else 1.0
+
+    def evaluation_curve(self) -> List[Tuple[int, int]]:
+        """(ply, evaluation) pairs for the plies analysed so far, in ply order."""
+        with self._lock:
+            return [(ply, self.results[ply]['evaluation']) for ply in sorted(self.results)]
+
+    def blunders(self, threshold: int = BLUNDER_THRESHOLD) -> List[dict]:
+        """Analysed moves that gave up at least `threshold` points or a proven win, worst first."""
+        with self._lock:
+            found = [r for r in self.results.values()
+                     if r['loss'] >= threshold or r['missed_win'] or r['allows_win']]
+        return sorted(found, key=lambda r: (r['missed_win'] or r['allows_win'], r['loss']), reverse=True)
+
+if __name__ == "__main__":
+    import sys
+    record = load_record(sys.argv[1])
+    engine_command = sys.argv[2] if len(sys.argv) > 2 else None # e.g. "python -m engine"
+    started = time.perf_counter()
+    for result in sorted(iter_analysis(record, engine_command=engine_command), key=lambda r: r['ply']):
+        flag = " BLUNDER" if result['loss'] >= BLUNDER_THRESHOLD else ""
+        if result['missed_win']:
+            flag += f" MISSED WIN {result['forced_win']}"
+        if result['allows_win']:
+            flag += " ALLOWS WIN"
+        print(f"{result['ply'] + 1:3d} {result['move']} best={result['best_move']} loss={result['loss']}{flag}")
+    print(f"Analysed {len(record)} positions in {time.perf_counter() - started:.2f}s")
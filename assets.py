@@ -0,0 +1,57 @@
+import os
+import struct
+import pygame as pg
+from typing import Dict, Optional, Tuple
+from constants import ASSET_BUNDLE, BG_IMG, BLACK_CHESS, WHITE_CHESS
+
+# Bundle layout: magic, entry count, then per entry a header followed by raw RGBA pixels
+BUNDLE_MAGIC = b"GBA1"
+_HEADER = struct.Struct("<4sI")
+_ENTRY = struct.Struct("<HHHI")
+
+_bundle: Optional[Dict[str, Tuple[int, int, memoryview]]] = None
+
+def _load_bundle() -> Dict[str, Tuple[int, int, memoryview]]:
+    """Reads the whole bundle in one go and indexes the pixel blocks by asset path."""
+    global _bundle
+    if _bundle is None:
+        _bundle = {}
+        if os.path.exists(ASSET_BUNDLE):
+            with open(ASSET_BUNDLE, "rb") as f:
+                data = memoryview(f.read())
+            magic, count = _HEADER.unpack_from(data, 0)
+            if magic == BUNDLE_MAGIC:
+                offset = _HEADER.size
+                for _ in range(count):
+                    name_len, w, h, size = _ENTRY.unpack_from(data, offset)
+                    offset += _ENTRY.size
+                    name = bytes(data[offset:offset + name_len]).decode("utf-8")
+                    offset += name_len
+                    _bundle[name] = (w, h, data[offset:offset + size])
+                    offset += size
+    return _bundle
+
+def load_image(path: str) -> pg.Surface:
+    """Loads an image from the packed bundle if present, otherwise decodes the PNG."""
+    entry = _load_bundle().get(path)
+    if entry:
+        w, h, pixels = entry
+        return pg.image.frombuffer(pixels, (w, h), "RGBA").convert_alpha()
+    return pg.image.load(path).convert_alpha()
+
+def pack_assets(paths=(BG_IMG, BLACK_CHESS, WHITE_CHESS), out_path: str = ASSET_BUNDLE):
+    """Decodes the PNGs once and writes their raw pixels to the bundle."""
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, len(paths)))
+        for path in paths:
+            surface = pg.image.load(path)
+            pixels = pg.image.tobytes(surface, "RGBA")
+            name = path.encode("utf-8")
+            w, h = surface.get_size()
+            f.write(_ENTRY.pack(len(name), w, h, len(pixels)))
+            f.write(name)
+            f.write(pixels)
+    print(f"Packed {len(paths)} images into {out_path} ({os.path.getsize(out_path)} bytes)")
+
+if __name__ == "__main__":
+    pack_assets()
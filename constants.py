@@ -16,13 +16,16 @@ GREEN = (0, 139, 0)
 
 # Paths
 DATA_DIR = "data"
-TITLE_FONT_PATH = "font/game_title.TTF"
-MENU_FONT_PATH = "font/game_menu.TTF"
+TITLE_FONT_PATH = "font/game_title.ttf"
+MENU_FONT_PATH = "font/game_menu.ttf"
 
 # Assets
 BG_IMG = f"{DATA_DIR}/bg.png"
 BLACK_CHESS = f"{DATA_DIR}/chess_black.png"
 WHITE_CHESS = f"{DATA_DIR}/chess_white.png"
+ASSET_BUNDLE = f"{DATA_DIR}/assets.bundle"
+WEIGHTS_FILE = f"{DATA_DIR}/weights.json"  # written by tools.tune; hand-picked weights when absent
+CACHE_DIR = ".cache"
 
 # Game States
 STATE_MENU = "MENU"
@@ -30,6 +33,7 @@ STATE_PVC_CONFIG = "PVC_CONFIG"
 STATE_LAN_MENU = "LAN_MENU"
 STATE_PLAYING = "PLAYING"
 STATE_NAME_INPUT = "NAME_INPUT"
+STATE_ANALYSIS = "ANALYSIS"
 
 # Player Colors/Roles
 PLAYER_BLACK = 0
@@ -43,9 +47,46 @@ MODE_LAN = "LAN"
 # Networking
 DEFAULT_PORT = 5005
 NET_BUFFER_SIZE = 1024
-DISCOVERY_PORT = 5006
-DISCOVERY_INTERVAL = 1.0  # seconds
-SCAN_TIMEOUT = 7.0  # seconds
+DISCOVERY_PORT = 5006  # hosts answer probes here
+BROWSE_PORT = 5007  # browsing clients hear replies and beacons here
+DISCOVERY_VERSION = 1
+DISCOVERY_INTERVAL = 1.0  # first beacon gap in seconds; doubles while the host waits
+DISCOVERY_IDLE_INTERVAL = 8.0  # slowest beacon
+PROBE_INTERVAL = 3.0  # browsing clients re-probe this often
+HOST_TTL = 10.0  # hosts not heard from for this long drop off the list
+SCAN_TIMEOUT = 1.0  # seconds before "No hosts discovered."
+HEARTBEAT_INTERVAL = 0.5  # seconds between pings
+HEARTBEAT_TIMEOUT = 2.0  # silence before the link is considered dead
+RECONNECT_INTERVAL = 0.25  # seconds between client reconnect attempts
+SESSION_GRACE_PERIOD = 30.0  # seconds the host holds a dropped session open
+JOURNAL_FILE = f"{CACHE_DIR}/host.journal"  # the hosted game, recovered after a crash
+JOURNAL_COMMIT_INTERVAL = 0.05  # seconds appended moves may wait for a group fsync
+JOURNAL_MAX_BATCH = 64  # records that trigger a commit without waiting
+JOURNAL_SNAPSHOT_EVERY = 64  # records between snapshots, bounding the replay on recovery
+
+# Post-game analysis
+ANALYSIS_POSITION_BUDGET = 0.5  # seconds per position
+BLUNDER_THRESHOLD = 8000  # score lost vs. the best move
+
+# Engine
+TT_SIZE = 4096  # cached score grids
+CPU_EVALUATOR = "patterns"  # "patterns" (lookup tables) or "windows" (5-window counts)
+PONDER_REPLIES = 8  # opponent replies searched ahead while they think
+DFPN_MAX_NODES = 100000  # nodes per solver query
+DFPN_TT_SIZE = 500000  # proof table entries (about 100 MB) before garbage collection
+DFPN_SOLVED_CACHE = 4096  # solved positions remembered by hash
+DFPN_CPU_NODES = 3000  # the CPU looks for a forced win within this many nodes each move
+DFPN_CPU_TT_SIZE = 20000  # proof table entries (about 4 MB) for the in-game solver; ample for DFPN_CPU_NODES queries
+DFPN_ANALYSIS_NODES = 5000  # per position when analysing a game for missed wins
+CPU_ENGINES = ["search", "mcts"]  # choices on the PVC screen: one-ply pattern search or Monte Carlo tree search
+MCTS_SECONDS = 1.0  # thinking time per MCTS move
+MCTS_WIDTH = 12  # children per node, best by pattern score
+MCTS_EXPLORATION = 1.4  # PUCT exploration constant
+MCTS_ROLLOUT_LIMIT = 40  # plies before a playout is scored as a draw
+HINT_LINES = 5  # candidate moves shown by the hint panel
+HINT_CANDIDATES = 10  # moves refined at depth 2
+HINT_SECONDS = 2.0  # time budget for one hint
+ENGINE_COMMAND = None  # e.g. "python -m engine" or a pbrain-* executable; None plays in-process
 
 # Prefilled Names
 PREFILLED_NAMES = ["Stella", "Sheryl", "Aaron", "Jessie"]
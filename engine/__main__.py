@@ -0,0 +1,28 @@
+import argparse
+import json
+import os
+import random
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # stdout carries the protocol
+
+import log
+from .protocol import serve, serve_unix
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Gobang engine as a pbrain-style protocol process.")
+    parser.add_argument("--socket", help="serve on this Unix socket path instead of stdin/stdout")
+    parser.add_argument("--config", help="engine config (JSON), see engine.search.create_searcher; defaults to the GUI's CPU")
+    parser.add_argument("--seed", type=int, help="seed the choice between equally good moves, for reproducible games")
+    args = parser.parse_args()
+
+    log.configure(log.OFF)
+    if args.seed is not None:
+        random.seed(args.seed)
+    config = json.loads(args.config) if args.config else None
+    if args.socket:
+        serve_unix(args.socket, config)
+    else:
+        serve(config)
+
+if __name__ == "__main__":
+    main()
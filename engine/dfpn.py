@@ -0,0 +1,258 @@
+"""Depth-first proof-number search for forced wins.
+
+The attacker is the side to move. OR nodes are the attacker's turn and AND
+nodes the defender's; proof and disproof numbers are kept in a bounded table
+keyed by Zobrist hash and collected by subtree size when it fills up.
+
+Moves are restricted to threat space. By default the attacker may only play
+fours (VCF), so every defender reply is forced and a proof is a real win. With
+`threes=True` open threes are allowed too (VCT); the defender then tries every
+cell where the attacker could make a four, plus its own fours, which covers the
+usual defences but is not exhaustive. A disproof only means no win was found in threat space.
+"""
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from constants import GRID_SIZE, DFPN_MAX_NODES, DFPN_TT_SIZE, DFPN_SOLVED_CACHE
+from .patterns import PatternEvaluator, THREE, OPEN_THREE, FOUR, OPEN_FOUR, FIVE
+from .evaluation import DIRECTIONS
+from . import zobrist
+import metrics
+
+DFPN_NODES = metrics.counter("gobang_dfpn_nodes_total", "Nodes expanded by the proof-number solver")
+DFPN_SOLVED_HITS = metrics.counter("gobang_dfpn_solved_hits_total", "Solver queries answered from the solved cache")
+DFPN_GCS = metrics.counter("gobang_dfpn_gc_total", "Proof table garbage collections")
+
+Move = Tuple[int, int]
+
+INF = 10 ** 9
+WIN, NO_WIN, UNKNOWN = "win", "no_win", "unknown"
+
+# Roughly what one table entry costs in CPython (dict slot, int key, 3-item list)
+ENTRY_BYTES = 200
+GC_KEEP = 0.5 # share of the table kept by a collection
+
+_rng = random.Random(0xDF9)
+OR_KEY = _rng.getrandbits(64)
+ATTACKER_KEY = {'X': 0, 'O': _rng.getrandbits(64)}
+
+# Cells whose threat class can change when (x, y) is played, and the new candidates near it
+LINE_CELLS = [[[(x + dx * step, y + dy * step) for dx, dy in DIRECTIONS for step in (-4, -3, -2, -1, 1, 2, 3, 4)
+                if 0 <= x + dx * step < GRID_SIZE and 0 <= y + dy * step < GRID_SIZE]
+               for x in range(GRID_SIZE)] for y in range(GRID_SIZE)]
+SQUARE_CELLS = [[[(nx, ny) for ny in range(max(0, y - 2), min(GRID_SIZE, y + 3))
+                  for nx in range(max(0, x - 2), min(GRID_SIZE, x + 3)) if (nx, ny) != (x, y)]
+                 for x in range(GRID_SIZE)] for y in range(GRID_SIZE)]
+
+class Solution(NamedTuple):
+    result: str # WIN, NO_WIN or UNKNOWN
+    move: Optional[Move] # first move of the win
+    nodes: int
+    cached: bool
+
+class _OutOfBudget(Exception):
+    pass
+
+def _other(char: str) -> str:
+    return 'O' if char == 'X' else 'X'
+
+def _near(board: List[List[str]], char: str, radius: int) -> List[Move]:
+    """Empty cells within `radius` (Chebyshev) of a `char` stone."""
+    cells = set()
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            if board[y][x] == char:
+                for ny in range(max(0, y - radius), min(GRID_SIZE, y + radius + 1)):
+                    for nx in range(max(0, x - radius), min(GRID_SIZE, x + radius + 1)):
+                        if board[ny][nx] == ' ':
+                            cells.add((nx, ny))
+    return sorted(cells)
+
+class DfpnSolver:
+    """df-pn over threat sequences with a bounded proof table and a cache of solved positions.
+
+    `max_nodes` bounds each query; `max_entries` (or `memory_mb`) bounds the table,
+    which is collected down to GC_KEEP of its size by dropping the entries with the
+    least work behind them, unsolved ones first.
+    """
+
+    def __init__(self, max_nodes: int = DFPN_MAX_NODES, max_entries: int = DFPN_TT_SIZE,
+                 memory_mb: Optional[float] = None, threes: bool = False,
+                 solved_size: int = DFPN_SOLVED_CACHE):
+        self.max_nodes = max_nodes
+        self.max_entries = int(memory_mb * 1e6 // ENTRY_BYTES) if memory_mb else max_entries
+        self.threes = threes
+        self.patterns = PatternEvaluator()
+        self.table: Dict[int, List[int]] = {} # key -> [pn, dn, work]
+        self.solved: "OrderedDict[int, Tuple[str, Optional[Move]]]" = OrderedDict()
+        self.solved_size = solved_size
+        self.nodes = 0
+        self.gcs = 0
+        self.solved_hits = 0
+        self._budget = 0
+        self._deadline: Optional[float] = None
+
+    def solve(self, board: List[List[str]], attacker: str, max_nodes: Optional[int] = None,
+              to_move: bool = True, deadline: Optional[float] = None) -> Solution:
+        """Tries to prove that `attacker` wins on `board`. `board` is left unchanged.
+
+        With `to_move=False` the defender moves first, which asks whether the
+        attacker's last move kept a win. Past `deadline` (a perf_counter time)
+        the search stops as if out of nodes.
+        """
+        root = zobrist.hash_board(board) ^ (OR_KEY if to_move else 0) ^ ATTACKER_KEY[attacker]
+        cached = self.solved.get(root)
+        if cached is not None:
+            self.solved.move_to_end(root)
+            self.solved_hits += 1
+            DFPN_SOLVED_HITS.inc()
+            return Solution(cached[0], cached[1], 0, True)
+
+        board = [row[:] for row in board]
+        started_nodes = self.nodes
+        self._budget = self.nodes + (max_nodes or self.max_nodes)
+        self._deadline = deadline
+        try:
+            maps = (self._threat_map(board, attacker), self._threat_map(board, _other(attacker)))
+            self._mid(board, root, attacker, to_move, INF - 1, INF - 1, maps)
+        except _OutOfBudget:
+            pass
+        nodes = self.nodes - started_nodes
+        DFPN_NODES.inc(nodes)
+
+        pn, dn, _ = self.table.get(root, (1, 1, 0))
+        if pn == 0:
+            result, move = WIN, self._winning_move(board, root, attacker) if to_move else None
+        elif dn == 0:
+            result, move = NO_WIN, None
+        else:
+            return Solution(UNKNOWN, None, nodes, False)
+        self.solved[root] = (result, move)
+        while len(self.solved) > self.solved_size:
+            self.solved.popitem(last=False)
+        return Solution(result, move, nodes, False)
+
+    def _winning_move(self, board: List[List[str]], root: int, attacker: str) -> Optional[Move]:
+        wins = [cell for cell, threat in self._threat_map(board, attacker).items() if threat == FIVE]
+        if wins:
+            return wins[0]
+        maps = (self._threat_map(board, attacker), self._threat_map(board, _other(attacker)))
+        for x, y in self._moves(board, attacker, True, maps)[1]:
+            child = zobrist.toggle(root, x, y, attacker) ^ OR_KEY
+            if self.table.get(child, (1,))[0] == 0:
+                return x, y
+        return None
+
+    def _threat_map(self, board: List[List[str]], char: str) -> Dict[Move, int]:
+        """`char`'s strongest threat class, over the four lines, for every cell it could threaten from."""
+        threats = self.patterns.threats
+        return {cell: max(threats(board, cell[0], cell[1], char)) for cell in _near(board, char, 2)}
+
+    def _update_map(self, board: List[List[str]], threat_map: Dict[Move, int], char: str,
+                    x: int, y: int, placed: str) -> Dict[Move, int]:
+        """`char`'s threat map after `placed` played (x, y): only cells in line with it change."""
+        updated = dict(threat_map)
+        updated.pop((x, y), None)
+        stale = [cell for cell in LINE_CELLS[y][x] if cell in updated]
+        if placed == char:
+            stale += [cell for cell in SQUARE_CELLS[y][x] if board[cell[1]][cell[0]] == ' ' and cell not in updated]
+        threats = self.patterns.threats
+        for cx, cy in stale:
+            updated[(cx, cy)] = max(threats(board, cx, cy, char))
+        return updated
+
+    def _moves(self, board: List[List[str]], attacker: str, or_node: bool,
+               maps: Tuple[Dict[Move, int], Dict[Move, int]]) -> Tuple[Optional[bool], List[Move]]:
+        """(terminal result for the attacker or None, moves to search)."""
+        attack, defence = maps
+        own_wins = [cell for cell, threat in attack.items() if threat == FIVE]
+        their_wins = [cell for cell, threat in defence.items() if threat == FIVE]
+        if or_node:
+            if own_wins:
+                return True, []
+            if len(their_wins) >= 2:
+                return False, []
+            if their_wins:
+                return None, their_wins # forced block
+            least = OPEN_THREE if self.threes else FOUR
+            moves = [cell for cell, threat in attack.items() if least <= threat < FIVE and threat != THREE]
+            return (None, moves) if moves else (False, [])
+
+        if their_wins:
+            return False, []
+        if len(own_wins) >= 2:
+            return True, []
+        if own_wins:
+            return None, own_wins # forced block
+        if not self.threes:
+            return False, [] # the attacker's move was a forced block that made no four
+        # An open three is answered on a cell where it would become a four, or with a counter-four
+        if OPEN_FOUR not in attack.values():
+            return False, [] # no open three: the attacker stopped threatening
+        return None, sorted(cell for cell in set(attack) | set(defence)
+                            if attack.get(cell, 0) >= FOUR or defence.get(cell, 0) >= FOUR)
+
+    def _mid(self, board: List[List[str]], key: int, attacker: str, or_node: bool, thpn: int, thdn: int,
+             maps: Tuple[Dict[Move, int], Dict[Move, int]]):
+        self.nodes += 1
+        if self.nodes > self._budget:
+            raise _OutOfBudget
+        if self._deadline is not None and self.nodes & 63 == 0 and time.perf_counter() > self._deadline:
+            raise _OutOfBudget
+        terminal, moves = self._moves(board, attacker, or_node, maps)
+        if terminal is not None:
+            self._store(key, (0, INF) if terminal else (INF, 0), 1)
+            return
+
+        char = attacker if or_node else _other(attacker)
+        children = [(x, y, zobrist.toggle(key, x, y, char) ^ OR_KEY) for x, y in moves]
+        work_start = self.nodes
+        while True:
+            bounds = [self.table.get(child, (1, 1, 0)) for _, _, child in children]
+            if or_node:
+                pn = min(b[0] for b in bounds)
+                dn = min(INF, sum(b[1] for b in bounds))
+            else:
+                pn = min(INF, sum(b[0] for b in bounds))
+                dn = min(b[1] for b in bounds)
+            if pn >= thpn or dn >= thdn:
+                self._store(key, (pn, dn), self.nodes - work_start + 1)
+                return
+
+            # Descend into the most proving child with thresholds from the runner-up
+            index = min(range(len(children)), key=lambda i: bounds[i][0] if or_node else bounds[i][1])
+            best = bounds[index]
+            if or_node:
+                second = min((b[0] for i, b in enumerate(bounds) if i != index), default=INF)
+                child_thpn, child_thdn = min(thpn, second + 1), thdn - dn + best[1]
+            else:
+                second = min((b[1] for i, b in enumerate(bounds) if i != index), default=INF)
+                child_thpn, child_thdn = thpn - pn + best[0], min(thdn, second + 1)
+            x, y, child = children[index]
+            board[y][x] = char
+            try:
+                child_maps = (self._update_map(board, maps[0], attacker, x, y, char),
+                              self._update_map(board, maps[1], _other(attacker), x, y, char))
+                self._mid(board, child, attacker, not or_node, child_thpn, child_thdn, child_maps)
+            finally:
+                board[y][x] = ' '
+
+    def _store(self, key: int, bounds: Tuple[int, int], work: int):
+        entry = self.table.get(key)
+        if entry is None:
+            self.table[key] = [bounds[0], bounds[1], work]
+            if len(self.table) > self.max_entries:
+                self.collect()
+        else:
+            entry[0], entry[1] = bounds
+            entry[2] += work
+
+    def collect(self):
+        """Drops the cheapest entries, unsolved before solved, down to GC_KEEP of the limit."""
+        keep = int(self.max_entries * GC_KEEP)
+        ranked = sorted(self.table.items(), key=lambda item: (item[1][0] == 0 or item[1][1] == 0, item[1][2]))
+        for key, _ in ranked[:len(ranked) - keep]:
+            del self.table[key]
+        self.gcs += 1
+        DFPN_GCS.inc()
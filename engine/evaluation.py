@@ -0,0 +1,132 @@
+import json
+import time
+from typing import List, Optional, Tuple
+from constants import GRID_SIZE, WEIGHTS_FILE
+from log import get_logger
+
+log = get_logger("evaluation")
+
+Board = List[List[str]]
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+# Points per open 5-window through the cell, keyed by how many stones it already holds
+HAND_WEIGHTS = {
+    'four': 1000000, # Win
+    'three': 10000,
+    'two': 1000,
+    'block_four': 900000, # Critical Block
+    'block_three': 8000,
+    'block_two': 500
+}
+
+# A cell lies in at most 20 five-windows; blocking a four must outrank any mix of lesser windows
+WINDOWS_PER_CELL = 20
+LESSER_WEIGHTS = ('three', 'two', 'block_three', 'block_two')
+
+def check_weights(weights: dict):
+    """Raises ValueError unless four > block_four and block_four outweighs every lesser window together."""
+    if not weights['four'] > weights['block_four'] > WINDOWS_PER_CELL * max(weights[name] for name in LESSER_WEIGHTS):
+        raise ValueError(f"weights must keep four > block_four >> three: {weights}")
+
+def load_weights(path: str = WEIGHTS_FILE) -> dict:
+    """Tuned weights from `path` merged over HAND_WEIGHTS; the hand-picked ones if there is no usable file.
+
+    This runs at import time, so a malformed or out-of-order file is logged and
+    ignored rather than stopping the game from starting.
+    """
+    try:
+        with open(path) as f:
+            tuned = json.load(f)
+        if not isinstance(tuned, dict):
+            raise ValueError("expected an object of weights")
+        unknown = set(tuned) - set(HAND_WEIGHTS)
+        if unknown:
+            raise ValueError(f"unknown weights {sorted(unknown)}")
+        weights = dict(HAND_WEIGHTS, **{name: int(value) for name, value in tuned.items()})
+        check_weights(weights)
+    except FileNotFoundError:
+        return dict(HAND_WEIGHTS)
+    except (OSError, TypeError, ValueError) as e: # json.JSONDecodeError is a ValueError
+        log.warning("Ignoring weights file, using hand-picked weights", path=path, error=str(e))
+        return dict(HAND_WEIGHTS)
+    return weights
+
+DEFAULT_WEIGHTS = load_weights()
+
+def evaluate_move(board: Board, x: int, y: int, player_char: str, weights: dict = DEFAULT_WEIGHTS) -> int:
+    """Scores an empty cell by counting the 5-windows through it for both sides."""
+    score = 0
+    opponent_char = 'X' if player_char == 'O' else 'O'
+
+    for dx, dy in DIRECTIONS:
+        for start_offset in range(-4, 1):
+            window = []
+            for i in range(5):
+                nx, ny = x + dx * (start_offset + i), y + dy * (start_offset + i)
+                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
+                    window.append(board[ny][nx])
+                else:
+                    break
+
+            if len(window) == 5:
+                count_p = window.count(player_char)
+                count_o = window.count(opponent_char)
+
+                if count_p > 0 and count_o == 0:
+                    if count_p == 4: score += weights['four']
+                    elif count_p == 3: score += weights['three']
+                    elif count_p == 2: score += weights['two']
+                elif count_o > 0 and count_p == 0:
+                    if count_o == 4: score += weights['block_four']
+                    elif count_o == 3: score += weights['block_three']
+                    elif count_o == 2: score += weights['block_two']
+    return score
+
+def score_cell(board: Board, x: int, y: int, weights: dict = DEFAULT_WEIGHTS) -> int:
+    """Combined attack and defence score the CPU uses to rank a cell."""
+    return evaluate_move(board, x, y, 'O', weights) + evaluate_move(board, x, y, 'X', weights)
+
+def best_moves(board: Board, deadline: Optional[float] = None) -> Tuple[int, List[Tuple[int, int]], bool]:
+    """Returns (best_score, tied_moves, complete). Stops early once `deadline` (perf_counter) passes."""
+    best_score = -1
+    moves = []
+
+    for y in range(GRID_SIZE):
+        if deadline is not None and moves and time.perf_counter() > deadline:
+            return best_score, moves, False
+        for x in range(GRID_SIZE):
+            if board[y][x] == ' ':
+                score = score_cell(board, x, y)
+                if score > best_score:
+                    best_score = score
+                    moves = [(x, y)]
+                elif score == best_score:
+                    moves.append((x, y))
+    return best_score, moves, True
+
+def evaluate_position(board: Board) -> int:
+    """Static evaluation from Black's point of view: open windows for X minus those for O."""
+    weights = {2: 1000, 3: 10000, 4: 1000000, 5: 100000000}
+    total = 0
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            for dx, dy in DIRECTIONS:
+                ex, ey = x + dx * 4, y + dy * 4
+                if not (0 <= ex < GRID_SIZE and 0 <= ey < GRID_SIZE):
+                    continue
+                window = [board[y + dy * i][x + dx * i] for i in range(5)]
+                count_x = window.count('X')
+                count_o = window.count('O')
+                if count_x and not count_o:
+                    total += weights.get(count_x, 0)
+                elif count_o and not count_x:
+                    total -= weights.get(count_o, 0)
+    return total
+
+def board_from_moves(moves: List[Tuple[int, int]]) -> Board:
+    """Builds a board from a move list, Black moving first."""
+    board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+    for i, (bx, by) in enumerate(moves):
+        board[by][bx] = ['X', 'O'][i % 2]
+    return board
@@ -0,0 +1,286 @@
+"""Monte Carlo tree search (PUCT) as an alternative to the one-ply searcher.
+
+Playouts run on a flat copy of the board that keeps, for every 5-cell window,
+how many stones of each colour it holds: a move updates the 20-odd windows
+through it, so spotting a five, a four to complete or block, or a three to
+extend costs a few list lookups. The same counts score cells the way
+`evaluation.evaluate_move` does, and the MCTS_WIDTH best cells become a node's
+children, with priors in proportion to their scores. The rollout policy wins
+if it can, blocks a four, usually extends a three, and otherwise plays next to
+a random stone; rollouts longer than MCTS_ROLLOUT_LIMIT plies count as draws.
+
+The tree is kept between moves: the next search starts from the node the
+game reached, if it is within two plies of the previous root.
+
+Being pure Python on one board, it reaches about 5.5k iterations per second
+(about 16k bare rollouts), well short of a vectorised engine. Comparisons with
+the one-ply searcher are not like-for-like: that searcher has no time budget
+and answers in well under a millisecond, so `tools.tournament` can only give
+MCTS more time and report both sides' ms_per_move next to the score.
+"""
+import math
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+from constants import GRID_SIZE, MCTS_SECONDS, MCTS_WIDTH, MCTS_EXPLORATION, MCTS_ROLLOUT_LIMIT
+from .evaluation import DEFAULT_WEIGHTS, DIRECTIONS
+from . import zobrist
+import metrics
+
+MCTS_PLAYOUTS = metrics.counter("gobang_mcts_playouts_total", "Playouts run by the MCTS engine")
+MCTS_PPS = metrics.gauge("gobang_mcts_playouts_per_second", "Playout rate of the most recent MCTS search")
+MCTS_REUSED = metrics.counter("gobang_mcts_reused_visits_total", "Visits inherited from the previous search's tree")
+
+Move = Tuple[int, int]
+
+CELLS = GRID_SIZE * GRID_SIZE
+WINDOWS: List[Tuple[int, ...]] = [
+    tuple((y + dy * i) * GRID_SIZE + x + dx * i for i in range(5))
+    for dx, dy in DIRECTIONS for y in range(GRID_SIZE) for x in range(GRID_SIZE)
+    if 0 <= x + dx * 4 < GRID_SIZE and 0 <= y + dy * 4 < GRID_SIZE
+]
+CELL_WINDOWS: List[List[int]] = [[] for _ in range(CELLS)]
+for _w, _cells in enumerate(WINDOWS):
+    for _cell in _cells:
+        CELL_WINDOWS[_cell].append(_w)
+
+def _square(radius: int) -> List[List[int]]:
+    return [[ny * GRID_SIZE + nx for ny in range(max(0, y - radius), min(GRID_SIZE, y + radius + 1))
+             for nx in range(max(0, x - radius), min(GRID_SIZE, x + radius + 1)) if (nx, ny) != (x, y)]
+            for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+
+NEIGHBOURS = _square(1)
+CANDIDATES = _square(2)
+
+class Playout:
+    """Flat board (0 empty, 1 Black, 2 White) with per-window stone counts."""
+
+    __slots__ = ('board', 'counts', 'fours', 'threes', 'near')
+
+    def __init__(self, board: Optional[List[List[str]]] = None):
+        self.board = [0] * CELLS
+        self.counts = [None, [0] * len(WINDOWS), [0] * len(WINDOWS)]
+        self.fours = [None, [], []] # windows a colour can complete
+        self.threes = [None, [], []] # windows a colour can make a four in
+        self.near: List[int] = [] # cells next to a stone (may be stale)
+        if board is not None:
+            for y in range(GRID_SIZE):
+                for x in range(GRID_SIZE):
+                    if board[y][x] != ' ':
+                        self.play(y * GRID_SIZE + x, 1 if board[y][x] == 'X' else 2)
+
+    def copy(self) -> "Playout":
+        other = Playout.__new__(Playout)
+        other.board = self.board[:]
+        other.counts = [None, self.counts[1][:], self.counts[2][:]]
+        other.fours = [None, self.fours[1][:], self.fours[2][:]]
+        other.threes = [None, self.threes[1][:], self.threes[2][:]]
+        other.near = self.near[:]
+        return other
+
+    def play(self, cell: int, colour: int) -> bool:
+        """Places a stone; True if it made five."""
+        self.board[cell] = colour
+        own, opp = self.counts[colour], self.counts[3 - colour]
+        five = False
+        for w in CELL_WINDOWS[cell]:
+            n = own[w] + 1
+            own[w] = n
+            if opp[w] == 0:
+                if n == 5:
+                    five = True
+                elif n == 4:
+                    self.fours[colour].append(w)
+                elif n == 3:
+                    self.threes[colour].append(w)
+        self.near.extend(NEIGHBOURS[cell])
+        return five
+
+    def score(self, cell: int, colour: int, attack: List[int], defence: List[int]) -> int:
+        """`evaluation.evaluate_move` for `colour` at an empty cell, from the window counts."""
+        own, opp = self.counts[colour], self.counts[3 - colour]
+        total = 0
+        for w in CELL_WINDOWS[cell]:
+            if opp[w] == 0:
+                total += attack[own[w]]
+            elif own[w] == 0:
+                total += defence[opp[w]]
+        return total
+
+    def _open_cell(self, windows: List[int], colour: int, stones: int) -> int:
+        """An empty cell of a window still holding `stones` of `colour` and none of the other; -1 if none."""
+        own, opp = self.counts[colour], self.counts[3 - colour]
+        for i in range(len(windows) - 1, -1, -1):
+            w = windows[i]
+            if own[w] == stones and opp[w] == 0:
+                for cell in WINDOWS[w]:
+                    if self.board[cell] == 0:
+                        return cell
+            windows.pop(i) # completed, blocked or already used
+        return -1
+
+    def rollout(self, colour: int, rng: random.Random, limit: int) -> int:
+        """Plays on with `colour` to move; returns the winning colour, or 0 for a draw."""
+        board, near = self.board, self.near
+        for _ in range(limit):
+            cell = self._open_cell(self.fours[colour], colour, 4)
+            if cell >= 0:
+                return colour
+            cell = self._open_cell(self.fours[3 - colour], 3 - colour, 4)
+            if cell < 0 and self.threes[colour] and rng.random() < 0.7:
+                cell = self._open_cell(self.threes[colour], colour, 3)
+            while cell < 0 and near:
+                i = rng.randrange(len(near))
+                near[i], near[-1] = near[-1], near[i]
+                candidate = near.pop()
+                if board[candidate] == 0:
+                    cell = candidate
+            if cell < 0:
+                return 0 # nothing left near the stones
+            if self.play(cell, colour):
+                return colour
+            colour = 3 - colour
+        return 0
+
+class Node:
+    __slots__ = ('move', 'parent', 'children', 'prior', 'visits', 'value', 'terminal')
+
+    def __init__(self, move: Optional[Move], parent: Optional["Node"], prior: float):
+        self.move = move
+        self.parent = parent
+        self.children: Optional[List["Node"]] = None
+        self.prior = prior
+        self.visits = 0
+        self.value = 0.0 # summed results for the side that played `move`
+        self.terminal = False
+
+    def size(self) -> int:
+        return 1 + sum(child.size() for child in self.children or ())
+
+class MctsSearcher:
+    """PUCT search with window-score priors and window-count playouts; keeps its tree between moves."""
+
+    def __init__(self, seconds: float = MCTS_SECONDS, width: int = MCTS_WIDTH,
+                 exploration: float = MCTS_EXPLORATION, rollout_limit: int = MCTS_ROLLOUT_LIMIT,
+                 playouts: Optional[int] = None, seed: Optional[int] = None):
+        self.seconds = seconds
+        self.width = width
+        self.exploration = exploration
+        self.rollout_limit = rollout_limit
+        self.playouts = playouts
+        self.attack = [0, 0, DEFAULT_WEIGHTS['two'], DEFAULT_WEIGHTS['three'], DEFAULT_WEIGHTS['four']]
+        self.defence = [0, 0, DEFAULT_WEIGHTS['block_two'], DEFAULT_WEIGHTS['block_three'], DEFAULT_WEIGHTS['block_four']]
+        self.rng = random.Random(seed)
+        self.root: Optional[Node] = None
+        self.root_key: Optional[int] = None
+        self.last_playouts = 0
+        self.last_reused = 0
+
+    def best_moves(self, board: List[List[str]], key: Optional[int] = None, last_move: Optional[Move] = None,
+                   stop: Optional[threading.Event] = None) -> Tuple[int, List[Move]]:
+        """(visits, [move]) for the most visited move after a search of `seconds` (or `playouts`).
+
+        Setting `stop` ends the search early with the best move found so far.
+        """
+        if key is None:
+            key = zobrist.hash_board(board)
+        stones = sum(cell != ' ' for row in board for cell in row)
+        if stones == CELLS:
+            return -1, []
+        colour = 1 if stones % 2 == 0 else 2
+        root = self._reuse(board, key, colour)
+        self.last_reused = root.visits
+        MCTS_REUSED.inc(root.visits)
+
+        base = Playout(board)
+        started = time.perf_counter()
+        deadline = started + self.seconds
+        count = 0
+        while (count < self.playouts) if self.playouts else (count == 0 or time.perf_counter() < deadline):
+            if stop is not None and stop.is_set() and count:
+                break
+            for _ in range(16 if not self.playouts else 1):
+                self._iterate(root, base, colour)
+                count += 1
+        elapsed = time.perf_counter() - started
+        self.last_playouts = count
+        MCTS_PLAYOUTS.inc(count)
+        if elapsed > 0:
+            MCTS_PPS.set(round(count / elapsed))
+
+        best = max(root.children, key=lambda child: child.visits)
+        return best.visits, [best.move]
+
+    def _reuse(self, board: List[List[str]], key: int, colour: int) -> Node:
+        """The node of the previous tree for this position, made the root; a new root otherwise."""
+        found = None
+        if self.root is not None:
+            frontier = [(self.root, self.root_key)]
+            for _ in range(3):
+                match = next((node for node, node_key in frontier if node_key == key), None)
+                if match is not None:
+                    found = match
+                    break
+                frontier = [(child, zobrist.toggle(node_key, *child.move, board[child.move[1]][child.move[0]]))
+                            for node, node_key in frontier for child in node.children or ()
+                            if board[child.move[1]][child.move[0]] != ' ']
+        if found is None or found.terminal:
+            found = Node(None, None, 1.0)
+        found.parent = None
+        self.root, self.root_key = found, key
+        return found
+
+    def _expand(self, node: Node, playout: Playout, colour: int):
+        board = playout.board
+        cells = {near for cell in range(CELLS) if board[cell] for near in CANDIDATES[cell] if not board[near]}
+        if not cells:
+            centre = GRID_SIZE // 2
+            node.children = [] if any(board) else [Node((centre, centre), node, 1.0)]
+            return
+        scored = sorted(((playout.score(cell, colour, self.attack, self.defence), cell) for cell in cells),
+                        reverse=True)[:self.width]
+        total = sum(max(score, 1) for score, _ in scored)
+        node.children = [Node((cell % GRID_SIZE, cell // GRID_SIZE), node, max(score, 1) / total)
+                         for score, cell in scored]
+
+    def _iterate(self, root: Node, base: Playout, colour: int):
+        playout = base.copy()
+        node = root
+        result = None
+        # Selection and expansion on the playout board
+        while True:
+            if node.children is None:
+                self._expand(node, playout, colour)
+                if not node.children:
+                    result = 0
+                    break
+            sqrt_visits = math.sqrt(node.visits + 1)
+            explore = self.exploration * sqrt_visits
+            best, best_score = None, -1.0
+            for child in node.children:
+                q = child.value / child.visits if child.visits else 0.5
+                score = q + explore * child.prior / (1 + child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+            x, y = node.move
+            if node.terminal or playout.play(y * GRID_SIZE + x, colour):
+                node.terminal = True
+                result = colour
+                break
+            colour = 3 - colour
+            if node.visits == 0:
+                result = playout.rollout(colour, self.rng, self.rollout_limit)
+                break
+
+        # Backpropagation: a node's value counts for the side that played its move
+        mover = colour if result == colour and node.terminal else 3 - colour
+        while node is not None:
+            node.visits += 1
+            if result == 0:
+                node.value += 0.5
+            elif result == mover:
+                node.value += 1.0
+            mover = 3 - mover
+            node = node.parent
@@ -0,0 +1,130 @@
+"""Streaming multi-PV hints: the best few moves, re-ranked as the search deepens.
+
+`iter_multipv` yields an update after every completed depth or time slice:
+depth 1 scores every cell with the CPU's searcher, then depth 2 refines the best
+candidates one at a time by subtracting the strongest attack the opponent has
+after the move. Each update carries only the cells whose value changed, so a
+consumer can patch what it shows instead of rebuilding it. `HintWorker` runs the
+generator on a background thread and hands updates over through a queue.
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from constants import GRID_SIZE, HINT_LINES, HINT_CANDIDATES, HINT_SECONDS
+from .patterns import PatternEvaluator, ATTACK_SCORES, FIVE
+from .search import Searcher, create_searcher
+from . import zobrist
+
+Move = Tuple[int, int]
+
+class PvLine(NamedTuple):
+    move: Move
+    score: int
+    reply: Optional[Move] # the opponent's strongest answer, once refined
+
+class MultiPvUpdate(NamedTuple):
+    depth: int
+    lines: List[PvLine] # best first
+    changed: Dict[Move, int] # cells whose value changed since the previous update
+    complete: bool
+
+def _best_attack(patterns: PatternEvaluator, board: List[List[str]], char: str) -> Tuple[int, Optional[Move]]:
+    """`char`'s strongest threat-making move, scored by ATTACK_SCORES over the four lines."""
+    best, best_move = 0, None
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            if board[y][x] != ' ':
+                continue
+            if not any(board[ny][nx] != ' ' for ny in range(max(0, y - 2), min(GRID_SIZE, y + 3))
+                       for nx in range(max(0, x - 2), min(GRID_SIZE, x + 3))):
+                continue
+            score = sum(ATTACK_SCORES[threat] for threat in patterns.threats(board, x, y, char))
+            if score > best:
+                best, best_move = score, (x, y)
+    return best, best_move
+
+def iter_multipv(board: List[List[str]], count: int = HINT_LINES, searcher: Optional[Searcher] = None,
+                 candidates: int = HINT_CANDIDATES, deadline: Optional[float] = None,
+                 stop: Optional[threading.Event] = None) -> Iterator[MultiPvUpdate]:
+    """Yields multi-PV updates for the side to move on `board` (which is not modified)."""
+    board = [row[:] for row in board]
+    searcher = searcher or create_searcher()
+    patterns = PatternEvaluator()
+    stones = sum(cell != ' ' for row in board for cell in row)
+    char, other = ('X', 'O') if stones % 2 == 0 else ('O', 'X')
+
+    key = zobrist.hash_board(board)
+    ranked = searcher.ranked_moves(board, key)
+    if not ranked:
+        yield MultiPvUpdate(0, [], {}, True)
+        return
+    values: Dict[Move, int] = {move: score for score, move in ranked}
+    lines = [PvLine(move, score, None) for score, move in ranked[:count]]
+    yield MultiPvUpdate(1, lines, dict(values), False)
+
+    refined: List[PvLine] = []
+    for _, (x, y) in ranked[:max(count, candidates)]:
+        if (stop is not None and stop.is_set()) or (deadline is not None and time.perf_counter() > deadline):
+            break
+        score = values[(x, y)]
+        if max(patterns.threats(board, x, y, char)) == FIVE:
+            refined.append(PvLine((x, y), score, None))
+        else:
+            board[y][x] = char
+            threat, reply = _best_attack(patterns, board, other)
+            board[y][x] = ' '
+            refined.append(PvLine((x, y), score - threat, reply))
+        refined.sort(key=lambda line: line.score, reverse=True)
+        # Unrefined moves keep their depth-1 order behind the refined ones
+        seen = {line.move for line in refined}
+        lines = (refined + [PvLine(move, s, None) for s, move in ranked if move not in seen])[:count]
+        values[(x, y)] = refined_score = next(line.score for line in refined if line.move == (x, y))
+        yield MultiPvUpdate(2, lines, {(x, y): refined_score}, False)
+    yield MultiPvUpdate(2, lines, {}, True)
+
+class HintWorker:
+    """Runs `iter_multipv` on a background thread; the UI drains updates with `poll` each frame.
+
+    `on_update`, if given, is also called from the worker thread with every update.
+    """
+
+    def __init__(self, board: List[List[str]], searcher: Optional[Searcher] = None, count: int = HINT_LINES,
+                 seconds: float = HINT_SECONDS, on_update: Optional[Callable[[MultiPvUpdate], None]] = None):
+        self.board = [row[:] for row in board]
+        self.searcher = searcher
+        self.count = count
+        self.seconds = seconds
+        self.on_update = on_update
+        self.latest: Optional[MultiPvUpdate] = None
+        self._updates: "queue.Queue[MultiPvUpdate]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        deadline = time.perf_counter() + self.seconds
+        for update in iter_multipv(self.board, self.count, self.searcher, deadline=deadline, stop=self._stop):
+            self._updates.put(update)
+            if self.on_update is not None:
+                self.on_update(update)
+
+    def poll(self) -> Tuple[Optional[MultiPvUpdate], Dict[Move, int]]:
+        """(latest update, cells changed since the last poll); never blocks."""
+        changed: Dict[Move, int] = {}
+        while True:
+            try:
+                update = self._updates.get_nowait()
+            except queue.Empty:
+                return self.latest, changed
+            changed.update(update.changed)
+            self.latest = update
@@ -0,0 +1,175 @@
+import os
+import threading
+from array import array
+from typing import List, Tuple
+from constants import GRID_SIZE, CACHE_DIR
+from .evaluation import DIRECTIONS
+
+# Threat classes for the side that plays the centre cell of a line segment
+NONE, TWO, OPEN_TWO, THREE, OPEN_THREE, FOUR, OPEN_FOUR, FIVE = range(8)
+THREAT_NAMES = ["none", "two", "open two", "three", "open three", "four", "open four", "five"]
+
+ATTACK_SCORES = [0, 100, 500, 1000, 8000, 10000, 100000, 1000000]
+DEFENCE_SCORES = [0, 50, 300, 500, 6000, 9000, 90000, 900000]
+
+# Cell codes within a segment; the 8 neighbours of the centre pack into 2 bits each
+EMPTY, OWN, OPP, EDGE = range(4)
+TABLE_SIZE = 4 ** 8
+TABLE_VERSION = 2
+TABLE_PATH = os.path.join(CACHE_DIR, f"pattern_threats_v{TABLE_VERSION}.bin")
+
+def _completes_five(line: Tuple[int, ...]) -> bool:
+    run = 1
+    i = 3
+    while i >= 0 and line[i] == OWN:
+        run += 1
+        i -= 1
+    i = 5
+    while i < 9 and line[i] == OWN:
+        run += 1
+        i += 1
+    return run >= 5
+
+def _classify(line: Tuple[int, ...], memo: dict) -> int:
+    """Threat class of a 9-cell segment whose centre (index 4) holds an OWN stone."""
+    cached = memo.get(line)
+    if cached is not None:
+        return cached
+
+    if _completes_five(line):
+        result = FIVE
+    else:
+        empties = [i for i in range(9) if line[i] == EMPTY]
+        completions = sum(_completes_five(line[:i] + (OWN,) + line[i + 1:]) for i in empties)
+        if completions >= 2:
+            result = OPEN_FOUR
+        elif completions == 1:
+            result = FOUR
+        else:
+            # One more stone away: an open four makes an open three, a four makes a three, ...
+            best = max((_classify(line[:i] + (OWN,) + line[i + 1:], memo) for i in empties), default=NONE)
+            result = {OPEN_FOUR: OPEN_THREE, FOUR: THREE, OPEN_THREE: OPEN_TWO, THREE: TWO}.get(best, NONE)
+    memo[line] = result
+    return result
+
+def _decode(code: int) -> Tuple[int, ...]:
+    cells = [(code >> (2 * i)) & 3 for i in range(8)]
+    return tuple(cells[:4]) + (OWN,) + tuple(cells[4:])
+
+def _swap(code: int) -> int:
+    """The same segment seen from the other colour."""
+    swapped = 0
+    for i in range(8):
+        cell = (code >> (2 * i)) & 3
+        if cell in (OWN, OPP):
+            cell = OWN + OPP - cell
+        swapped |= cell << (2 * i)
+    return swapped
+
+def build_threats() -> bytearray:
+    """OWN's threat class in the low nibble, OPP's in the high nibble, indexed by segment code."""
+    memo: dict = {}
+    own_class = bytearray(TABLE_SIZE)
+    for code in range(TABLE_SIZE):
+        own_class[code] = _classify(_decode(code), memo)
+    threats = bytearray(TABLE_SIZE)
+    for code in range(TABLE_SIZE):
+        threats[code] = own_class[code] | (own_class[_swap(code)] << 4)
+    return threats
+
+def score_tables(threats: bytearray, attack: List[int] = ATTACK_SCORES,
+                 defence: List[int] = DEFENCE_SCORES) -> Tuple[array, array]:
+    """Returns (move_scores, cell_scores) indexed by segment code.
+
+    move_scores: attack plus block value of playing the centre for the OWN side.
+    cell_scores: move_scores summed over both colours, so it does not depend on who moves.
+    """
+    move_by_pair, cell_by_pair = [0] * 256, [0] * 256
+    for own in range(len(THREAT_NAMES)):
+        for opp in range(len(THREAT_NAMES)):
+            move_by_pair[own | opp << 4] = attack[own] + defence[opp]
+            cell_by_pair[own | opp << 4] = attack[own] + defence[opp] + attack[opp] + defence[own]
+    return array('i', [move_by_pair[t] for t in threats]), array('i', [cell_by_pair[t] for t in threats])
+
+def build_tables() -> Tuple[array, array, bytearray]:
+    """Returns (move_scores, cell_scores, threats); see `score_tables` and `build_threats`."""
+    threats = build_threats()
+    return score_tables(threats) + (threats,)
+
+def load_tables(path: str = TABLE_PATH) -> Tuple[array, array, bytearray]:
+    """Loads the threat table from the disk cache, building and saving it on first use.
+
+    Only the threat classes are cached; the score tables are derived from
+    ATTACK_SCORES and DEFENCE_SCORES on every load, so editing those lists takes
+    effect without invalidating the cache.
+    """
+    threats = None
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) == TABLE_SIZE:
+            threats = bytearray(data)
+
+    if threats is None:
+        threats = build_threats()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(bytes(threats))
+        os.replace(tmp_path, path)
+    return score_tables(threats) + (threats,)
+
+_tables = None
+_tables_lock = threading.Lock()
+
+def get_tables() -> Tuple[array, array, bytearray]:
+    global _tables
+    with _tables_lock:
+        if _tables is None:
+            _tables = load_tables()
+    return _tables
+
+def warm_up():
+    """Loads (or builds) the tables in the background so the first CPU move does not stall."""
+    threading.Thread(target=get_tables, daemon=True).start()
+
+class PatternEvaluator:
+    """Scores moves with four table lookups, one per line direction."""
+
+    def __init__(self):
+        self.move_scores, self.cell_scores, self.threat_table = get_tables()
+
+    @staticmethod
+    def line_code(board: List[List[str]], x: int, y: int, dx: int, dy: int, player_char: str) -> int:
+        """Packs the 4 cells either side of (x, y) along (dx, dy), relative to `player_char`."""
+        code = 0
+        shift = 0
+        for step in (-4, -3, -2, -1, 1, 2, 3, 4):
+            nx, ny = x + dx * step, y + dy * step
+            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
+                char = board[ny][nx]
+                cell = EMPTY if char == ' ' else (OWN if char == player_char else OPP)
+            else:
+                cell = EDGE
+            code |= cell << shift
+            shift += 2
+        return code
+
+    def score_move(self, board: List[List[str]], x: int, y: int, player_char: str) -> int:
+        """Attack plus block value of `player_char` playing (x, y)."""
+        return sum(self.move_scores[self.line_code(board, x, y, dx, dy, player_char)] for dx, dy in DIRECTIONS)
+
+    def score_cell(self, board: List[List[str]], x: int, y: int) -> int:
+        """Colour-independent cell score, a drop-in for `evaluation.score_cell`."""
+        return sum(self.cell_scores[self.line_code(board, x, y, dx, dy, 'X')] for dx, dy in DIRECTIONS)
+
+    def threats(self, board: List[List[str]], x: int, y: int, player_char: str) -> List[int]:
+        """`player_char`'s threat class in each direction if it plays (x, y)."""
+        return [self.threat_table[self.line_code(board, x, y, dx, dy, player_char)] & 0xF for dx, dy in DIRECTIONS]
+
+if __name__ == "__main__":
+    import time
+    started = time.perf_counter()
+    build = not os.path.exists(TABLE_PATH)
+    get_tables()
+    print(f"Pattern tables {'built' if build else 'loaded'} in {time.perf_counter() - started:.2f}s ({TABLE_PATH})")
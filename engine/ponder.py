@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from constants import PONDER_REPLIES
+from .search import Searcher
+from . import zobrist
+import metrics
+
+PONDER_HITS = metrics.counter("gobang_ponder_hits_total", "Opponent replies answered from pondering")
+PONDER_MISSES = metrics.counter("gobang_ponder_misses_total", "Opponent replies that were not pondered")
+PONDER_SAVED = metrics.counter("gobang_ponder_saved_seconds_total", "Search time saved by ponder hits")
+
+Move = Tuple[int, int]
+
+class Ponderer:
+    """Searches the opponent's most likely replies while they think.
+
+    Answers are stored by the hash of the position after the reply, so a
+    matching human move is answered from `lookup` without searching again.
+    Every grid computed here also lands in the shared `Searcher` table, which
+    lets a mispredicted reply be scored incrementally from its parent.
+    """
+
+    def __init__(self, searcher: Searcher, replies: int = PONDER_REPLIES):
+        self.searcher = searcher
+        self.replies = replies
+        self.answers: Dict[int, Tuple[List[Move], float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, board: List[List[str]]):
+        """Begins pondering on a private copy of `board` (the position the opponent must answer)."""
+        self.stop()
+        self.answers = {}
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=([row[:] for row in board],), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, board: List[List[str]]):
+        stones = sum(cell != ' ' for row in board for cell in row)
+        reply_char = ['X', 'O'][stones % 2]
+        key = zobrist.hash_board(board)
+        for _, (rx, ry) in self.searcher.ranked_moves(board, key)[:self.replies]:
+            if self._stop.is_set():
+                return
+            started = time.perf_counter()
+            board[ry][rx] = reply_char
+            child_key = zobrist.toggle(key, rx, ry, reply_char)
+            _, moves = self.searcher.best_moves(board, child_key, (rx, ry))
+            board[ry][rx] = ' '
+            self.answers[child_key] = (moves, time.perf_counter() - started)
+
+    def lookup(self, board: List[List[str]]) -> Optional[List[Move]]:
+        """Returns the pondered answers for `board`, or None if the reply was not predicted."""
+        entry = self.answers.get(zobrist.hash_board(board))
+        if entry is None:
+            self.misses += 1
+            PONDER_MISSES.inc()
+            return None
+        self.hits += 1
+        self.time_saved += entry[1]
+        PONDER_HITS.inc()
+        PONDER_SAVED.inc(entry[1])
+        return entry[0]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,259 @@
+"""Line-based engine protocol in the style of Gomocup/Piskvork ("pbrain").
+
+The engine side (`EngineServer`) speaks it over stdin/stdout or a Unix socket and
+keeps one Searcher for its whole life, so its transposition table stays warm
+across moves and games. The GUI side (`EngineClient`) drives either our own
+engine (`python -m engine`) or any external pbrain-compatible executable.
+
+Supported commands: START n, RESTART, BEGIN, TURN x,y, BOARD ... DONE,
+INFO key value, ABOUT, END. Coordinates are "x,y" with x the column.
+"""
+import errno
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+from typing import IO, Dict, List, Optional, Tuple
+from constants import GRID_SIZE, CPU_EVALUATOR
+from .search import create_searcher
+from . import zobrist
+
+Move = Tuple[int, int]
+
+OWN, OPPONENT = 'O', 'X'
+ABOUT = 'name="gobang", version="1.0", country="-", www="-"'
+
+class EngineServer:
+    """Protocol state machine; `handle` takes one command line and returns the reply line (or None)."""
+
+    def __init__(self, config: Optional[dict] = None):
+        self.searcher = create_searcher(config if config is not None else {'evaluator': CPU_EVALUATOR})
+        self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.key = 0
+        self.info = {}
+        self._board_lines: Optional[List[str]] = None
+
+    def _clear(self):
+        self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.key = 0
+
+    def _put(self, x: int, y: int, char: str) -> bool:
+        if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE) or self.board[y][x] != ' ':
+            return False
+        self.board[y][x] = char
+        self.key = zobrist.toggle(self.key, x, y, char)
+        return True
+
+    def _think(self, last_move: Optional[Move] = None) -> str:
+        _, moves = self.searcher.best_moves(self.board, self.key, last_move)
+        if not moves:
+            return "ERROR board is full"
+        x, y = random.choice(moves)
+        self._put(x, y, OWN)
+        # Score the new position now so the opponent's reply is derived incrementally
+        self.searcher.score_grid(self.board, self.key, (x, y))
+        return f"{x},{y}"
+
+    def handle(self, line: str) -> Optional[str]:
+        line = line.strip()
+        if not line:
+            return None
+        if self._board_lines is not None:
+            if line.upper() == "DONE":
+                return self._load_board()
+            self._board_lines.append(line)
+            return None
+
+        command, _, args = line.partition(" ")
+        command = command.upper()
+        if command == "START":
+            if args.strip() != str(GRID_SIZE):
+                return f"ERROR only {GRID_SIZE}x{GRID_SIZE} boards are supported"
+            self._clear()
+            return "OK"
+        if command == "RESTART":
+            self._clear()
+            return "OK"
+        if command == "BEGIN":
+            return self._think()
+        if command == "TURN":
+            try:
+                x, y = (int(v) for v in args.split(","))
+            except ValueError:
+                return f"ERROR bad coordinates: {args}"
+            if not self._put(x, y, OPPONENT):
+                return f"ERROR illegal move: {args}"
+            return self._think((x, y))
+        if command == "BOARD":
+            self._board_lines = []
+            return None
+        if command == "INFO":
+            key, _, value = args.partition(" ")
+            self.info[key] = value
+            return None
+        if command == "ABOUT":
+            return ABOUT
+        if command == "END":
+            raise EOFError
+        return f"UNKNOWN {command}"
+
+    def _load_board(self) -> str:
+        lines, self._board_lines = self._board_lines, None
+        self._clear()
+        last_move = None
+        for entry in lines:
+            try:
+                x, y, who = (int(v) for v in entry.split(",")[:3])
+            except ValueError:
+                return f"ERROR bad board line: {entry}"
+            if not self._put(x, y, OWN if who == 1 else OPPONENT):
+                return f"ERROR illegal board line: {entry}"
+            last_move = (x, y)
+        return self._think(last_move)
+
+def serve(config: Optional[dict] = None, infile: IO[str] = sys.stdin, outfile: IO[str] = sys.stdout):
+    """Runs the engine on a pair of text streams until END or EOF."""
+    server = EngineServer(config)
+    for line in infile:
+        try:
+            reply = server.handle(line)
+        except EOFError:
+            break
+        if reply is not None:
+            outfile.write(reply + "\n")
+            outfile.flush()
+
+def remove_stale_socket(path: str):
+    """Unlinks a socket left at `path` by a server that is gone; raises if one is still listening."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, f"an engine is already serving on {path}")
+
+def serve_unix(path: str, config: Optional[dict] = None):
+    """Serves clients one at a time on a Unix socket. The engine (and its tables) outlive each client."""
+    server = EngineServer(config)
+    remove_stale_socket(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    try:
+        while True:
+            conn, _ = listener.accept()
+            with conn, conn.makefile("r") as infile, conn.makefile("w") as outfile:
+                for line in infile:
+                    try:
+                        reply = server.handle(line)
+                    except EOFError:
+                        break
+                    if reply is not None:
+                        outfile.write(reply + "\n")
+                        outfile.flush()
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+class EngineClient:
+    """Talks to an engine process over pipes (`command`) or to an engine on a Unix socket (`socket_path`)."""
+
+    def __init__(self, command: Optional[str] = None, socket_path: Optional[str] = None):
+        self.process = None
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+            self.reader = self.sock.makefile("r")
+            self.writer = self.sock.makefile("w")
+        else:
+            args = shlex.split(command) if command else [sys.executable, "-m", "engine"]
+            self.process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            text=True, bufsize=1)
+            self.reader = self.process.stdout
+            self.writer = self.process.stdin
+        self.moves: Optional[List[Move]] = [] # the game as the engine knows it; None if unknown
+
+    def send(self, line: str):
+        self.writer.write(line + "\n")
+        self.writer.flush()
+
+    def read_reply(self) -> str:
+        """Next meaningful line, skipping MESSAGE/DEBUG chatter; raises on ERROR."""
+        while True:
+            line = self.reader.readline()
+            if not line:
+                raise ConnectionError("engine exited")
+            line = line.strip()
+            if line.startswith(("MESSAGE", "DEBUG")) or not line:
+                continue
+            if line.startswith(("ERROR", "UNKNOWN")):
+                raise RuntimeError(f"engine: {line}")
+            return line
+
+    def request(self, line: str) -> str:
+        self.send(line)
+        return self.read_reply()
+
+    @staticmethod
+    def _parse_move(reply: str) -> Move:
+        x, y = (int(v) for v in reply.split(","))
+        return x, y
+
+    def start(self, size: int = GRID_SIZE):
+        self.request(f"START {size}")
+        self.moves = []
+
+    def info(self, key: str, value):
+        self.send(f"INFO {key} {value}")
+
+    def best_move(self, moves: List[Move]) -> Move:
+        """Asks for the next move after `moves` (the whole game so far).
+
+        Sends a single TURN when the game only grew by the opponent's move since
+        the engine last answered, and falls back to a full BOARD otherwise (undo,
+        new game, a different position).
+        """
+        # Until this answer arrives the engine's position is unknown, so a failed request forces a BOARD next time
+        known, self.moves = self.moves, None
+        if not moves:
+            self.request("RESTART")
+            reply = self.request("BEGIN")
+        elif known is not None and len(moves) == len(known) + 1 and moves[:-1] == known:
+            reply = self.request("TURN {},{}".format(*moves[-1]))
+        else:
+            self.send("BOARD")
+            to_move = len(moves) % 2
+            for i, (x, y) in enumerate(moves):
+                self.send(f"{x},{y},{1 if i % 2 == to_move else 2}")
+            reply = self.request("DONE")
+        move = self._parse_move(reply)
+        self.moves = list(moves) + [move]
+        return move
+
+    def close(self):
+        try:
+            self.send("END")
+        except (OSError, ValueError):
+            pass
+        if self.process:
+            self.process.wait(timeout=5)
+        else:
+            self.sock.close()
+
+_shared: Dict[str, EngineClient] = {}
+
+def shared_client(command: str) -> EngineClient:
+    """One long-lived engine per command in this process, so its tables stay warm across games."""
+    client = _shared.get(command)
+    if client is None:
+        client = _shared[command] = EngineClient(command)
+        client.start()
+    return client
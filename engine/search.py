@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from constants import GRID_SIZE, TT_SIZE
+from .evaluation import DEFAULT_WEIGHTS, DIRECTIONS, score_cell
+from . import zobrist
+import metrics
+
+SEARCH_NODES = metrics.counter("gobang_search_nodes_total", "Cells scored by the CPU search")
+TT_HITS = metrics.counter("gobang_tt_hits_total", "Score grids found in the transposition table")
+TT_DERIVED = metrics.counter("gobang_tt_derived_total", "Score grids derived incrementally from a cached parent")
+TT_MISSES = metrics.counter("gobang_tt_misses_total", "Score grids computed from scratch")
+TT_HIT_RATIO = metrics.gauge("gobang_tt_hit_ratio", "Share of grid lookups served from the table, fully or incrementally")
+SEARCH_NPS = metrics.gauge("gobang_search_nps", "Cells scored per second in the most recent search")
+
+Move = Tuple[int, int]
+
+class Searcher:
+    """The CPU's one-ply search, backed by a transposition table of per-cell score grids.
+
+    A cell's score only depends on the 5-windows through it, so the grid of a child
+    position is derived from its parent's by rescoring the cells in line with the new stone.
+    """
+
+    def __init__(self, max_entries: int = TT_SIZE,
+                 score: Callable[[List[List[str]], int, int], int] = score_cell):
+        self.max_entries = max_entries
+        self.score = score
+        self.table: "OrderedDict[int, List[int]]" = OrderedDict()
+        self.hits = 0
+        self.derived = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: int) -> Optional[List[int]]:
+        with self._lock:
+            grid = self.table.get(key)
+            if grid is not None:
+                self.table.move_to_end(key)
+            return grid
+
+    def _put(self, key: int, grid: List[int]):
+        with self._lock:
+            self.table[key] = grid
+            self.table.move_to_end(key)
+            while len(self.table) > self.max_entries:
+                self.table.popitem(last=False)
+
+    def score_grid(self, board: List[List[str]], key: Optional[int] = None,
+                   last_move: Optional[Move] = None) -> List[int]:
+        """Flat GRID_SIZE*GRID_SIZE list of cell scores (-1 where occupied)."""
+        if key is None:
+            key = zobrist.hash_board(board)
+        started = time.perf_counter()
+        grid = self._get(key)
+        if grid is not None:
+            self._count('hits')
+            TT_HITS.inc()
+            return grid
+
+        parent = None
+        if last_move is not None:
+            lx, ly = last_move
+            parent = self._get(zobrist.toggle(key, lx, ly, board[ly][lx]))
+
+        nodes = 0
+        if parent is not None:
+            self._count('derived')
+            TT_DERIVED.inc()
+            grid = list(parent)
+            grid[ly * GRID_SIZE + lx] = -1
+            for dx, dy in DIRECTIONS:
+                for step in range(-4, 5):
+                    nx, ny = lx + dx * step, ly + dy * step
+                    if step and 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and board[ny][nx] == ' ':
+                        grid[ny * GRID_SIZE + nx] = self.score(board, nx, ny)
+                        nodes += 1
+        else:
+            self._count('misses')
+            TT_MISSES.inc()
+            grid = [self.score(board, x, y) if board[y][x] == ' ' else -1
+                    for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+            nodes = sum(score >= 0 for score in grid)
+
+        self._put(key, grid)
+        SEARCH_NODES.inc(nodes)
+        elapsed = time.perf_counter() - started
+        if elapsed > 0:
+            SEARCH_NPS.set(round(nodes / elapsed))
+        return grid
+
+    def _count(self, outcome: str):
+        """Bumps the hits/derived/misses counter; under the table lock, as the ponderer and hints search too."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            total = self.hits + self.derived + self.misses
+            TT_HIT_RATIO.set(round((self.hits + self.derived) / total, 4))
+
+    def best_moves(self, board: List[List[str]], key: Optional[int] = None,
+                   last_move: Optional[Move] = None) -> Tuple[int, List[Move]]:
+        """Same result as `evaluation.best_moves`: the top score and every cell tied on it."""
+        grid = self.score_grid(board, key, last_move)
+        best_score = max(grid)
+        if best_score < 0:
+            return best_score, []
+        return best_score, [(i % GRID_SIZE, i // GRID_SIZE) for i, score in enumerate(grid) if score == best_score]
+
+    def ranked_moves(self, board: List[List[str]], key: Optional[int] = None,
+                     last_move: Optional[Move] = None) -> List[Tuple[int, Move]]:
+        """All empty cells as (score, move), best first."""
+        grid = self.score_grid(board, key, last_move)
+        ranked = [(score, (i % GRID_SIZE, i // GRID_SIZE)) for i, score in enumerate(grid) if score >= 0]
+        ranked.sort(reverse=True)
+        return ranked
+
+def create_searcher(config: Optional[dict] = None) -> Searcher:
+    """Builds a Searcher from an engine config: {'evaluator': 'windows'|'patterns', 'weights': {...}}.
+
+    Weight overrides apply to the window evaluator and are merged over DEFAULT_WEIGHTS.
+    {'engine': 'mcts', 'seconds': s, 'playouts': n} builds an MctsSearcher instead.
+    """
+    config = config or {}
+    if config.get('engine') == 'mcts':
+        from .mcts import MctsSearcher
+        options = {name: config[name] for name in ('seconds', 'playouts', 'width', 'exploration', 'seed')
+                   if name in config}
+        return MctsSearcher(**options)
+    if config.get('evaluator', 'windows') == 'patterns':
+        from .patterns import PatternEvaluator
+        return Searcher(score=PatternEvaluator().score_cell)
+    weights = dict(DEFAULT_WEIGHTS, **config.get('weights', {}))
+    return Searcher(score=lambda board, x, y: score_cell(board, x, y, weights))
@@ -0,0 +1,21 @@
+import random
+from typing import List
+from constants import GRID_SIZE
+
+# One random 64-bit key per (cell, colour); fixed seed so hashes are stable across processes
+_rng = random.Random(0x60BA46)
+KEYS = {char: [[_rng.getrandbits(64) for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        for char in ('X', 'O')}
+
+def hash_board(board: List[List[str]]) -> int:
+    h = 0
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            char = board[y][x]
+            if char != ' ':
+                h ^= KEYS[char][y][x]
+    return h
+
+def toggle(h: int, x: int, y: int, char: str) -> int:
+    """Adds or removes a stone from a hash (XOR is its own inverse)."""
+    return h ^ KEYS[char][y][x]
@@ -1,10 +1,107 @@
+import random
+import threading
+import time
+from constants import MODE_PVC, STATE_PLAYING, DFPN_CPU_NODES
+from engine.dfpn import WIN
+from log import get_logger
+import metrics
+
+log = get_logger("cpu")
+
+CPU_MOVE_SECONDS = metrics.histogram("gobang_cpu_move_seconds", "Latency of CPU moves as seen by the player")
+
+def forced_win(game):
+    """The first move of a proven win for the CPU, as a one-move list, or None."""
+    if not game.state.history:
+        return None
+    char = ['X', 'O'][game.state.current_turn]
+    solution = game.solver.solve(game.state.board, char, DFPN_CPU_NODES)
+    if solution.result != WIN or solution.move is None:
+        return None
+    log.debug("Forced win", move=solution.move, nodes=solution.nodes, cached=solution.cached)
+    return [solution.move]
+
+class CpuMoveWorker:
+    """Runs a slow CPU search (MCTS) on a background thread; the frame loop collects the move.
+
+    `position` is the move list the search is for: a result is only played if
+    the game is still there when it arrives.
+    """
+
+    def __init__(self, searcher, board, last_move, position):
+        self.position = position
+        self.started = time.perf_counter()
+        self.moves = None
+        self.searcher = searcher
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=([row[:] for row in board], last_move), daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self, board, last_move):
+        _, self.moves = self.searcher.best_moves(board, last_move=last_move, stop=self._stop)
+        log.debug("MCTS move", playouts=self.searcher.last_playouts, reused_visits=self.searcher.last_reused)
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
 def handle_cpu_move(game):
-    """The AI evaluates the board to find the best move."""
-    move = game.state.get_best_move()
-    if move:
-        bx, by = move
+    """The AI evaluates the board to find the best move.
+
+    MCTS thinks for a second, so it runs on a CpuMoveWorker and the move is
+    played later by `poll_cpu_move`; the other engines answer in place.
+    """
+    game.stop_ponderer()
+    game.stop_cpu_move()
+    started = time.perf_counter()
+
+    moves = None
+    if game.engine_client is not None:
+        try:
+            moves = [game.engine_client.best_move(game.state.get_move_list())]
+        except (OSError, RuntimeError, ValueError) as e:
+            # A misbehaving external engine costs one in-process move, not the game
+            log.warning("External engine failed, searching in-process", error=str(e))
+    if moves is None:
+        moves = forced_win(game)
+        if moves is None and game.state.cpu_engine == "mcts":
+            last_move = game.state.get_move_list()[-1] if game.state.history else None
+            game.cpu_move = CpuMoveWorker(game.mcts, game.state.board, last_move, game.state.get_move_list())
+            game.cpu_move.start()
+            return
+        elif moves is None:
+            moves = game.ponderer.lookup(game.state.board) if game.state.history else None
+            if moves is None:
+                last_move = game.state.get_move_list()[-1] if game.state.history else None
+                _, moves = game.searcher.best_moves(game.state.board, last_move=last_move)
+            else:
+                log.debug("Ponder hit", hit_rate=round(game.ponderer.hit_rate, 3),
+                          saved_ms=round(game.ponderer.time_saved * 1000, 1))
+    play_cpu_move(game, moves, started)
+
+def poll_cpu_move(game):
+    """Plays the background search's move once it is ready, if the game is still where it started."""
+    worker = game.cpu_move
+    if worker is None or not worker.done:
+        return
+    game.cpu_move = None
+    if game.state.game_state == STATE_PLAYING and game.state.get_move_list() == worker.position:
+        play_cpu_move(game, worker.moves, worker.started)
+
+def play_cpu_move(game, moves, started: float):
+    CPU_MOVE_SECONDS.observe(time.perf_counter() - started)
+    if moves:
+        bx, by = random.choice(moves)
         stone_img = [game.black_img, game.white_img][game.state.current_turn]
         if game.state.place_stone(bx, by, stone_img):
             if game.state.winner is not None:
                 winner_name = ["BLACK", "WHITE"][game.state.winner]
-                print(f"Winner: CPU ({winner_name})")
+                log.info("CPU wins", color=winner_name)
+            elif game.state.game_mode == MODE_PVC and game.engine_client is None and game.state.cpu_engine != "mcts":
+                game.ponderer.start(game.state.board)
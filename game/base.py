@@ -3,59 +3,199 @@ import time
 from typing import Tuple
 from constants import (WIDTH, HEIGHT, BLACK_CHESS, WHITE_CHESS, 
                        STATE_MENU, STATE_PVC_CONFIG, STATE_LAN_MENU, 
-                       STATE_PLAYING, STATE_NAME_INPUT, PREFILLED_NAMES)
+                       STATE_PLAYING, STATE_NAME_INPUT, PREFILLED_NAMES, MODE_LAN, CPU_EVALUATOR,
+                       ENGINE_COMMAND, DFPN_CPU_NODES, DFPN_CPU_TT_SIZE)
 from models import GameState
 from renderer import Renderer
-from network import NetworkManager
+from assets import load_image
+import metrics
+
+FRAME_SECONDS = metrics.histogram("gobang_frame_seconds", "Time to draw and present one frame")
 
 # Import modular components
-from .handlers import handle_click, confirm_name
-from .network_callbacks import on_connection_established, on_connection_lost, on_remote_data_received
-from .ai import handle_cpu_move
+from .handlers import handle_click, confirm_name, handle_playing_key, handle_lan_menu_key
+from .network_callbacks import (on_connection_established, on_connection_lost, on_remote_data_received,
+                                on_connection_interrupted, on_connection_resumed)
 
 class GobangGame:
     def __init__(self):
-        pg.init()
+        # Only the modules the menu needs; mixer, joystick etc. are never used
+        pg.display.init()
+        pg.font.init()
         self.screen = pg.display.set_mode((WIDTH, HEIGHT))
         pg.display.set_caption("Gobang")
         
-        self.black_img = pg.image.load(BLACK_CHESS).convert_alpha()
-        self.white_img = pg.image.load(WHITE_CHESS).convert_alpha()
-        
         self.state = GameState()
         self.renderer = Renderer(self.screen)
-        self.network_manager = NetworkManager()
-        
-        # Rig callbacks
-        self.network_manager.on_data_received = lambda data: on_remote_data_received(self, data)
-        self.network_manager.on_connection_established = lambda: on_connection_established(self)
-        self.network_manager.on_connection_lost = lambda: on_connection_lost(self)
         
+        # Stone images, the network stack and the engine load on first use
+        self._black_img = None
+        self._white_img = None
+        self._network_manager = None
+        self._searcher = None
+        self._ponderer = None
+        self._mcts = None
+        self._solver = None
+        self._journal = None
+        self._engine_client = None
+        self.analysis = None
+        self.hints = None  # engine.multipv.HintWorker for the position in hints_position
+        self.hints_position = []
+        self.cpu_move = None  # game.ai.CpuMoveWorker while MCTS thinks in the background
         self.clock = pg.time.Clock()
         self.running = True
 
+    @property
+    def black_img(self) -> pg.Surface:
+        if self._black_img is None:
+            self._black_img = load_image(BLACK_CHESS)
+        return self._black_img
+
+    @property
+    def white_img(self) -> pg.Surface:
+        if self._white_img is None:
+            self._white_img = load_image(WHITE_CHESS)
+        return self._white_img
+
+    @property
+    def network_manager(self):
+        if self._network_manager is None:
+            from network import NetworkManager
+            self._network_manager = NetworkManager()
+            
+            # Rig callbacks
+            self._network_manager.on_data_received = lambda data: on_remote_data_received(self, data)
+            self._network_manager.on_connection_established = lambda: on_connection_established(self)
+            self._network_manager.on_connection_lost = lambda: on_connection_lost(self)
+            self._network_manager.on_connection_interrupted = lambda: on_connection_interrupted(self)
+            self._network_manager.on_connection_resumed = lambda: on_connection_resumed(self)
+        return self._network_manager
+
+    @property
+    def searcher(self):
+        if self._searcher is None:
+            from engine.search import create_searcher
+            self._searcher = create_searcher({'evaluator': CPU_EVALUATOR})
+        return self._searcher
+
+    @property
+    def mcts(self):
+        if self._mcts is None:
+            from engine.search import create_searcher
+            self._mcts = create_searcher({'engine': 'mcts'})
+        return self._mcts
+
+    @property
+    def ponderer(self):
+        if self._ponderer is None:
+            from engine.ponder import Ponderer
+            self._ponderer = Ponderer(self.searcher)
+        return self._ponderer
+
+    @property
+    def solver(self):
+        if self._solver is None:
+            from engine.dfpn import DfpnSolver
+            # Only short forced-win checks run in game, so the full-size table (for analysis and tools) is not needed
+            self._solver = DfpnSolver(max_nodes=DFPN_CPU_NODES, max_entries=DFPN_CPU_TT_SIZE)
+        return self._solver
+
+    @property
+    def journal(self):
+        if self._journal is None:
+            from journal import Journal
+            self._journal = Journal()
+        return self._journal
+
+    @property
+    def engine_client(self):
+        """External protocol engine, or None when the CPU plays in-process."""
+        if self._engine_client is None and ENGINE_COMMAND:
+            from engine.protocol import EngineClient
+            self._engine_client = EngineClient(ENGINE_COMMAND)
+            self._engine_client.start()
+        return self._engine_client
+
+    def toggle_hints(self):
+        if self.hints is not None:
+            self.stop_hints()
+            return
+        from engine.multipv import HintWorker
+        self.hints = HintWorker(self.state.board, self.searcher)
+        self.hints_position = self.state.get_move_list()
+        self.renderer.heatmap.clear()
+        self.hints.start()
+
+    def stop_hints(self):
+        if self.hints is not None:
+            self.hints.stop()
+            self.hints = None
+            self.renderer.heatmap.clear()
+
+    def poll_hints(self):
+        """The latest hint update, after patching the heatmap with what changed; None without hints."""
+        if self.hints is None:
+            return None
+        if self.state.game_state != STATE_PLAYING or self.state.get_move_list() != self.hints_position:
+            self.stop_hints()
+            return None
+        update, changed = self.hints.poll()
+        if changed:
+            self.renderer.heatmap.apply(changed)
+        return update
+
+    def stop_ponderer(self):
+        # Only a PVC game ever builds the ponderer; don't load the engine just to stop it
+        if self._ponderer is not None:
+            self._ponderer.stop()
+
+    def stop_cpu_move(self):
+        if self.cpu_move is not None:
+            self.cpu_move.stop()
+            self.cpu_move = None
+
     def run(self):
-        from constants import MODE_LAN
         while self.running:
             self.handle_events()
-            
-            network_info = None
-            elapsed_scan_time = 0.0
-            if self.state.game_state == STATE_LAN_MENU:
-                elapsed_scan_time = time.time() - self.state.scan_start_time
-            
-            if self.state.game_mode == MODE_LAN:
-                if self.network_manager.is_host:
-                    ip = self.network_manager.get_local_ip()
-                    network_info = f"IP: {ip}"
-                elif self.network_manager.client_socket:
-                    network_info = "CONNECTED"
-                
-            self.renderer.draw(self.state, network_info, self.network_manager.found_hosts, elapsed_scan_time)
-            pg.display.update()
+            if self.cpu_move is not None:
+                from .ai import poll_cpu_move
+                poll_cpu_move(self)
+            self.draw_frame()
             self.clock.tick(60)
+        self.stop_cpu_move()
+        if self.analysis is not None:
+            from analysis import shutdown_pool
+            self.analysis.cancel()
+            shutdown_pool()
+        if self._engine_client is not None:
+            self._engine_client.close()
+        if self._journal is not None:
+            # Closing the window mid-game keeps the journal, so hosting again resumes the game
+            self._journal.detach(discard=False)
         pg.quit()
 
+    def draw_frame(self):
+        started = time.perf_counter()
+        network_info = None
+        found_hosts = None
+        elapsed_scan_time = 0.0
+        if self.state.game_state == STATE_LAN_MENU:
+            elapsed_scan_time = time.time() - self.state.scan_start_time
+            found_hosts = self.network_manager.hosts()
+        
+        if self.state.game_mode == MODE_LAN and self._network_manager:
+            if self.network_manager.session_token and not self.network_manager.link_up:
+                network_info = "RECONNECTING..."
+            elif self.network_manager.is_host:
+                ip = self.network_manager.get_local_ip()
+                network_info = f"IP: {ip}"
+            elif self.network_manager.client_socket:
+                network_info = "CONNECTED"
+            
+        self.renderer.draw(self.state, network_info, found_hosts, elapsed_scan_time, self.analysis, self.poll_hints())
+        pg.display.update()
+        FRAME_SECONDS.observe(time.perf_counter() - started)
+
     def handle_events(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
@@ -63,8 +203,11 @@ class GobangGame:
             elif event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
                 self.running = False
             elif event.type == pg.MOUSEBUTTONDOWN:
-                pos = pg.mouse.get_pos()
-                handle_click(self, pos)
+                handle_click(self, event.pos)
+            elif self.state.game_state == STATE_PLAYING and event.type == pg.KEYDOWN:
+                handle_playing_key(self, event.key)
+            elif self.state.game_state == STATE_LAN_MENU and event.type == pg.KEYDOWN:
+                handle_lan_menu_key(self, event.key)
             elif self.state.game_state == STATE_NAME_INPUT:
                 if event.type == pg.KEYDOWN:
                     if event.key in [pg.K_RETURN, pg.K_KP_ENTER]:
@@ -75,4 +218,5 @@ class GobangGame:
                         self.state.selected_name_index = (self.state.selected_name_index + 1) % len(PREFILLED_NAMES)
 
     def handle_cpu_move(self):
+        from .ai import handle_cpu_move
         handle_cpu_move(self)
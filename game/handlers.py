@@ -1,8 +1,13 @@
 import time
+import pygame as pg
 from typing import Tuple
-from constants import (STATE_MENU, STATE_PVC_CONFIG, STATE_LAN_MENU, STATE_PLAYING, STATE_NAME_INPUT,
+from constants import (STATE_MENU, STATE_PVC_CONFIG, STATE_LAN_MENU, STATE_PLAYING, STATE_NAME_INPUT, STATE_ANALYSIS,
                        MODE_PVP, MODE_PVC, MODE_LAN, PLAYER_BLACK, PLAYER_WHITE, 
-                       OFFSET, CELL_SIZE, GRID_SIZE, SCAN_TIMEOUT, PREFILLED_NAMES)
+                       OFFSET, CELL_SIZE, GRID_SIZE, PREFILLED_NAMES, CPU_EVALUATOR, CPU_ENGINES)
+from log import get_logger
+from renderer.menu_renderer import MAX_HOST_ROWS, host_row_rect
+
+log = get_logger("ui")
 
 def handle_click(game, pos: Tuple[int, int]):
     if game.state.game_state == STATE_MENU:
@@ -13,6 +18,8 @@ def handle_click(game, pos: Tuple[int, int]):
         handle_lan_menu_click(game, pos)
     elif game.state.game_state == STATE_PLAYING:
         handle_playing_click(game, pos)
+    elif game.state.game_state == STATE_ANALYSIS:
+        handle_analysis_click(game, pos)
 
 def handle_menu_click(game, pos: Tuple[int, int]):
     if game.renderer.menu_buttons['pvp'].is_clicked(pos):
@@ -21,46 +28,80 @@ def handle_menu_click(game, pos: Tuple[int, int]):
     elif game.renderer.menu_buttons['pvc'].is_clicked(pos):
         game.state.game_mode = MODE_PVC
         game.state.game_state = STATE_PVC_CONFIG
+        if CPU_EVALUATOR == "patterns":
+            from engine.patterns import warm_up
+            warm_up()
     elif game.renderer.menu_buttons['lan'].is_clicked(pos):
         game.state.game_mode = MODE_LAN
         game.state.game_state = STATE_LAN_MENU
         game.state.scan_start_time = time.time()
+        game.state.selected_host_index = 0
         game.network_manager.start_discovery_listener()
     elif game.renderer.menu_buttons['quit'].is_clicked(pos):
         game.running = False
 
 def handle_lan_menu_click(game, pos: Tuple[int, int]):
-    elapsed_time = time.time() - game.state.scan_start_time
-    found_hosts = game.network_manager.found_hosts
-    show_join = len(found_hosts) > 0
-    show_new = not show_join and elapsed_time >= SCAN_TIMEOUT
+    hosts = game.network_manager.hosts()
+    for i in range(min(len(hosts), MAX_HOST_ROWS)):
+        if host_row_rect(i).collidepoint(pos):
+            game.state.selected_host_index = i
+            return
 
-    if show_new and game.renderer.lan_menu_buttons['new_game'].is_clicked(pos):
+    if hosts and game.renderer.lan_menu_buttons['join'].is_clicked(pos):
+        join_selected_host(game, hosts)
+    elif game.renderer.lan_menu_buttons['new_game'].is_clicked(pos):
         game.state.reset()
+        resume_hosted_game(game)
         game.network_manager.stop_discovery()
         game.network_manager.start_server()
         game.network_manager.start_discovery_beacon()
         game.state.player_color = PLAYER_BLACK
         game.state.game_state = STATE_NAME_INPUT
-        print("Host started. Entering name selection.")
-    elif show_join and 'join' in game.renderer.lan_menu_buttons and game.renderer.lan_menu_buttons['join'].is_clicked(pos):
-        host_ip = list(found_hosts)[0]
-        if game.network_manager.connect_to_server(host_ip):
-            game.state.reset()
-            game.network_manager.stop_discovery()
-            game.state.player_color = PLAYER_WHITE
-            game.state.game_state = STATE_NAME_INPUT
-            print(f"Joined host {host_ip}. Entering name selection.")
+        log.info("Host started, entering name selection")
     elif game.renderer.lan_menu_buttons['back'].is_clicked(pos):
         game.network_manager.stop_discovery()
         game.state.game_state = STATE_MENU
 
+def handle_lan_menu_key(game, key: int):
+    hosts = game.network_manager.hosts()
+    if not hosts:
+        return
+    if key == pg.K_UP:
+        game.state.selected_host_index = (game.state.selected_host_index - 1) % min(len(hosts), MAX_HOST_ROWS)
+    elif key == pg.K_DOWN:
+        game.state.selected_host_index = (game.state.selected_host_index + 1) % min(len(hosts), MAX_HOST_ROWS)
+    elif key in (pg.K_RETURN, pg.K_KP_ENTER):
+        join_selected_host(game, hosts)
+
+def join_selected_host(game, hosts):
+    host_ip, info = hosts[min(game.state.selected_host_index, len(hosts) - 1)]
+    if game.network_manager.connect_to_server(host_ip, info.get('port')):
+        game.state.reset()
+        game.network_manager.stop_discovery()
+        game.state.player_color = PLAYER_WHITE
+        game.state.game_state = STATE_NAME_INPUT
+        log.info("Joined host, entering name selection", host=host_ip, room=info.get('room'))
+
+def resume_hosted_game(game):
+    """Restores a hosted game a crash interrupted, then journals this one."""
+    recovered = game.journal.load(game.state, game.black_img, game.white_img)
+    if recovered and game.state.winner is not None:
+        game.state.reset()
+        recovered = None
+    if recovered:
+        log.info("Resumed hosted game", moves=recovered['moves'], replayed=recovered['replayed'],
+                 ms=round(recovered['seconds'] * 1000, 2))
+    game.state.game_mode = MODE_LAN
+    game.journal.attach(game.state)
+
 def confirm_name(game):
     name = PREFILLED_NAMES[game.state.selected_name_index]
-    game.state.player_names[game.state.player_color] = name
+    game.state.set_player_name(game.state.player_color, name)
     game.state.game_state = STATE_PLAYING
     
     if game.state.game_mode == MODE_LAN:
+        if game.network_manager.is_host:
+            game.network_manager.advertise(name=name)
         game.network_manager.send_data({
             'type': 'name_update',
             'player_index': game.state.player_color,
@@ -79,12 +120,17 @@ def handle_pvc_config_click(game, pos: Tuple[int, int]):
         game.state.player_names[PLAYER_BLACK] = "CPU"
         game.state.game_state = STATE_PLAYING
         game.handle_cpu_move() 
+    elif game.renderer.pvc_config_buttons['engine'].is_clicked(pos):
+        game.state.cpu_engine = CPU_ENGINES[(CPU_ENGINES.index(game.state.cpu_engine) + 1) % len(CPU_ENGINES)]
+        game.renderer.pvc_config_buttons['engine'].set_text(f"ENGINE: {game.state.cpu_engine.upper()}")
     elif game.renderer.pvc_config_buttons['back'].is_clicked(pos):
         game.state.game_state = STATE_MENU
 
 def handle_playing_click(game, pos: Tuple[int, int]):
     if game.state.game_mode != MODE_LAN:
         if game.renderer.buttons['undo'].is_clicked(pos):
+            game.stop_ponderer()
+            game.stop_cpu_move()
             if game.state.undo():
                 if game.state.game_mode == MODE_PVC and game.state.current_turn != game.state.player_color and game.state.winner is None:
                     game.handle_cpu_move()
@@ -92,8 +138,21 @@ def handle_playing_click(game, pos: Tuple[int, int]):
         elif game.renderer.buttons['redo'].is_clicked(pos):
             if game.state.redo():
                 return
+        elif game.state.winner is None and game.renderer.buttons['hint'].is_clicked(pos):
+            game.toggle_hints()
+            return
 
-    if game.renderer.buttons['restart'].is_clicked(pos):
+    if game.state.winner is not None and game.renderer.buttons['analyze'].is_clicked(pos):
+        from analysis import GameAnalysis
+        moves = game.state.get_move_list()
+        # A finished analysis of this game is shown again rather than redone
+        if game.analysis is None or game.analysis.moves != moves or game.analysis.cancelled:
+            game.analysis = GameAnalysis(moves)
+            game.analysis.start()
+        game.state.game_state = STATE_ANALYSIS
+    elif game.renderer.buttons['restart'].is_clicked(pos):
+        game.stop_ponderer()
+        game.stop_cpu_move()
         game.state.reset()
         if game.state.game_mode == MODE_PVC and game.state.player_color == PLAYER_WHITE:
             game.handle_cpu_move()
@@ -104,6 +163,8 @@ def handle_playing_click(game, pos: Tuple[int, int]):
                     'state': game.state.get_state_data()
                 })
     elif game.renderer.buttons['exit'].is_clicked(pos):
+        game.stop_ponderer()
+        game.stop_cpu_move()
         game.state.exit_to_menu()
         if game.state.game_mode == MODE_LAN:
             game.network_manager.stop()
@@ -132,3 +193,34 @@ def handle_playing_click(game, pos: Tuple[int, int]):
                 
                 if game.state.game_mode == MODE_PVC and game.state.winner is None:
                     game.handle_cpu_move()
+
+def handle_playing_key(game, key: int):
+    """Arrow keys browse the variation tree: LEFT/RIGHT step through the line, UP/DOWN swap variations."""
+    if game.state.game_mode == MODE_LAN:
+        return
+    moved = False
+    if key == pg.K_LEFT:
+        moved = game.state.step_back()
+    elif key == pg.K_RIGHT:
+        moved = game.state.step_forward()
+    elif key == pg.K_UP:
+        moved = game.state.switch_variation(-1)
+    elif key == pg.K_DOWN:
+        moved = game.state.switch_variation(1)
+    if moved and game.state.game_mode == MODE_PVC:
+        game.stop_ponderer()
+        game.stop_cpu_move()
+        # In PVC, LEFT/RIGHT step over the CPU's ply as well, so browsing stays on the player's turns
+        if game.state.current_turn != game.state.player_color:
+            if key == pg.K_LEFT:
+                game.state.step_back()
+            elif key == pg.K_RIGHT:
+                game.state.step_forward()
+        # Still on the CPU's turn (the start of the game, or no stored reply): let it move
+        if game.state.current_turn != game.state.player_color and game.state.winner is None:
+            game.handle_cpu_move()
+
+def handle_analysis_click(game, pos: Tuple[int, int]):
+    if game.renderer.analysis_buttons['back'].is_clicked(pos):
+        game.analysis.cancel()
+        game.state.game_state = STATE_PLAYING
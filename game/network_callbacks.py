@@ -1,4 +1,7 @@
 from constants import STATE_NAME_INPUT, STATE_LAN_MENU, STATE_PLAYING, PLAYER_BLACK, PLAYER_WHITE
+from log import get_logger
+
+log = get_logger("lan")
 
 def on_connection_established(game):
     """Called when a LAN connection is established (both host and client)."""
@@ -8,11 +11,19 @@ def on_connection_established(game):
             'type': 'sync_state',
             'state': game.state.get_state_data()
         })
-        print("Host: Connection established. Initial state sent.")
+        log.info("Connection established, initial state sent")
+
+def on_connection_interrupted(game):
+    """Called when the link drops but the session is still held open for a reconnect."""
+    log.warning("Connection interrupted, waiting for the session to resume")
+
+def on_connection_resumed(game):
+    """Called once the link is back; missed messages have already been replayed."""
+    log.info("Connection resumed")
 
 def on_connection_lost(game):
-    """Called when the LAN connection is dropped."""
-    print("LAN: Connection lost. Returning to main menu.")
+    """Called when the LAN session ends (peer left or the grace period expired)."""
+    log.warning("Connection lost, returning to main menu")
     game.network_manager.stop()
     game.state.exit_to_menu()
 
@@ -22,12 +33,12 @@ def on_remote_data_received(game, data: dict):
         # ONLY clients accept authoritative state from host
         if not game.network_manager.is_host:
             game.state.sync_from_data(data['state'], game.black_img, game.white_img)
-            print(f"Client: Synced from Host. Turn: {['BLACK','WHITE'][game.state.current_turn]}, Names: {game.state.player_names}")
+            log.debug("Synced from host", turn=['BLACK', 'WHITE'][game.state.current_turn], moves=len(game.state.history))
     elif data.get('type') == 'name_update':
         idx = data['player_index']
         name = data['name']
-        game.state.player_names[idx] = name
-        print(f"LAN: Remote name update: Player {idx+1} is {name}. Current names: {game.state.player_names}")
+        game.state.set_player_name(idx, name)
+        log.info("Remote name update", player=idx + 1, name=name)
         # If host, broadcast the updated state to everyone (authorized change)
         if game.network_manager.is_host:
             game.network_manager.send_data({
@@ -37,11 +48,11 @@ def on_remote_data_received(game, data: dict):
     elif data.get('type') == 'move':
         # Processes incoming move
         bx, by = data['x'], data['y']
-        print(f"Host: Received move from client: ({bx}, {by}). Current turn: {['BLACK','WHITE'][game.state.current_turn]}")
+        log.debug("Received move from client", x=bx, y=by, turn=['BLACK', 'WHITE'][game.state.current_turn])
         if game.state.game_state == STATE_PLAYING:
             stone_img = [game.black_img, game.white_img][game.state.current_turn]
             if game.state.place_stone(bx, by, stone_img):
-                print(f"Host: Successfully placed stone at ({bx}, {by}). Broadcasting authoritative state.")
+                log.debug("Placed client stone, broadcasting state", x=bx, y=by)
                 # If host, broadcast final authoritative state
                 if game.network_manager.is_host:
                     game.network_manager.send_data({
@@ -49,4 +60,4 @@ def on_remote_data_received(game, data: dict):
                         'state': game.state.get_state_data()
                     })
             else:
-                print(f"Host: FAILED to place stone at ({bx}, {by}). Board might be occupied or game over.")
+                log.warning("Rejected client move, cell occupied or game over", x=bx, y=by)
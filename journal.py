@@ -0,0 +1,286 @@
+"""Crash-safe journal of the hosted game.
+
+The host's GameState appends every change (stone, undo, redo, name, restart)
+as an 8-byte record plus payload to an append-only file. Appends only fill a
+buffer; a writer thread commits whatever has gathered every
+JOURNAL_COMMIT_INTERVAL seconds (or once JOURNAL_MAX_BATCH records are
+waiting) with a single write and fsync, so a move costs the frame loop a few
+microseconds and at most one interval of moves is lost in a crash.
+
+Every JOURNAL_SNAPSHOT_EVERY records the state is written as a JSON snapshot
+(atomically, by rename) and a new journal generation starts, so recovery is
+one snapshot load plus a short replay. A torn or corrupt tail record ends the
+replay; a journal older than the snapshot is ignored.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import List, Optional, Union
+from constants import JOURNAL_FILE, JOURNAL_COMMIT_INTERVAL, JOURNAL_MAX_BATCH, JOURNAL_SNAPSHOT_EVERY
+from log import get_logger
+import metrics
+
+log = get_logger("journal")
+
+JOURNAL_RECORDS = metrics.counter("gobang_journal_records_total", "Records appended to the host journal")
+JOURNAL_COMMITS = metrics.counter("gobang_journal_commits_total", "Group commits (write + fsync) of the host journal")
+JOURNAL_SNAPSHOTS = metrics.counter("gobang_journal_snapshots_total", "Snapshots written by the host journal")
+JOURNAL_COMMIT_SECONDS = metrics.histogram("gobang_journal_commit_seconds", "Time to write and fsync one group")
+
+MAGIC = b"GBJ1"
+HEADER = struct.Struct("<4sI") # magic, generation
+RECORD = struct.Struct("<IBBBB") # crc32 of the rest, op, a, b, payload length
+OP_PLACE, OP_UNDO, OP_REDO, OP_NAME, OP_RESET = range(1, 6)
+
+def _fsync_dir(path: str):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+def encode(op: int, a: int = 0, b: int = 0, payload: bytes = b"") -> bytes:
+    body = struct.pack("<BBBB", op, a, b, len(payload)) + payload
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+def decode(data: bytes) -> tuple:
+    """(records as (op, a, b, payload), bytes consumed); stops at the first torn or corrupt record."""
+    records, offset = [], 0
+    while offset + RECORD.size <= len(data):
+        crc, op, a, b, length = RECORD.unpack_from(data, offset)
+        end = offset + RECORD.size + length
+        if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+            break
+        records.append((op, a, b, data[offset + RECORD.size:end]))
+        offset = end
+    return records, offset
+
+class Journal:
+    """Append-only journal for one GameState, with group-committed fsync and snapshots.
+
+    `commit_interval=0` commits (and fsyncs) every record before returning.
+    """
+
+    def __init__(self, path: str = JOURNAL_FILE, commit_interval: float = JOURNAL_COMMIT_INTERVAL,
+                 max_batch: int = JOURNAL_MAX_BATCH, snapshot_every: int = JOURNAL_SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.snapshot_every = snapshot_every
+        self.state = None
+        self.generation = 0
+        self.since_snapshot = 0
+        self.appended = 0
+        self.committed = 0
+        self.commits = 0
+        self._file = None
+        # Encoded records, or a dict: a snapshot that starts the next generation
+        self._pending: List[Union[bytes, dict]] = []
+        self._flush_requested = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+
+    # Recovery
+
+    def load(self, state, black_img, white_img) -> Optional[dict]:
+        """Rebuilds `state` from the snapshot and journal tail on disk; None if there is no game."""
+        started = time.perf_counter()
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        state.sync_from_data(snapshot['state'], black_img, white_img)
+        state.game_mode = snapshot['game_mode']
+
+        records, discarded = [], 0
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        if len(data) >= HEADER.size and HEADER.unpack_from(data)[0] == MAGIC:
+            if HEADER.unpack_from(data)[1] == snapshot['generation']:
+                records, used = decode(data[HEADER.size:])
+                discarded = len(data) - HEADER.size - used
+        for op, a, b, payload in records:
+            apply(state, op, a, b, payload)
+
+        self.generation = snapshot['generation']
+        stats = {
+            'moves': len(state.history),
+            'snapshot_moves': len(snapshot['state']['history']),
+            'replayed': len(records),
+            'discarded_bytes': discarded,
+            'seconds': time.perf_counter() - started
+        }
+        log.info("Journal loaded", replayed=len(records), moves=len(state.history),
+                 discarded_bytes=discarded, ms=round(stats['seconds'] * 1000, 2))
+        return stats
+
+    # Writing
+
+    def attach(self, state):
+        """Starts journaling `state` from a fresh snapshot of it."""
+        self.state = state
+        state.journal = self
+        self.snapshot()
+
+    def detach(self, discard: bool = True):
+        """Stops journaling; `discard` deletes the files, as when the game is deliberately left."""
+        if self.state is not None:
+            self.state.journal = None
+            self.state = None
+        self.close()
+        if discard:
+            for path in (self.path, self.snapshot_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def place(self, x: int, y: int):
+        self._append(encode(OP_PLACE, x, y))
+
+    def undo(self):
+        self._append(encode(OP_UNDO))
+
+    def redo(self):
+        self._append(encode(OP_REDO))
+
+    def name(self, index: int, name: str):
+        self._append(encode(OP_NAME, index, 0, name.encode("utf-8")[:255]))
+
+    def reset(self):
+        self._append(encode(OP_RESET))
+
+    def snapshot(self):
+        """Queues the current state as a snapshot; later records go to the next generation."""
+        self.since_snapshot = 0
+        self._enqueue({'state': self.state.get_state_data(), 'game_mode': self.state.game_mode})
+
+    def _append(self, record: bytes):
+        JOURNAL_RECORDS.inc()
+        self._enqueue(record)
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _enqueue(self, item: Union[bytes, dict]):
+        if self.commit_interval <= 0:
+            self.appended += 1
+            self._commit([item])
+            return
+        with self._cond:
+            self._pending.append(item)
+            self.appended += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, daemon=True)
+                self._writer.start()
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Blocks until everything appended so far is on disk."""
+        with self._cond:
+            target = self.appended
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self.committed >= target or self._writer is None)
+
+    def close(self):
+        writer = self._writer
+        if writer is not None:
+            with self._cond:
+                self._closing = True
+                self._cond.notify_all()
+            writer.join()
+            self._writer = None
+            self._closing = False
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closing)
+                # Let a group gather unless a flush or close wants it now
+                self._cond.wait_for(lambda: len(self._pending) >= self.max_batch or self._flush_requested
+                                    or self._closing, timeout=self.commit_interval)
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                closing = self._closing
+            if batch:
+                self._commit(batch)
+            with self._cond:
+                self._cond.notify_all()
+            if closing and not batch:
+                return
+
+    def _commit(self, batch: List[Union[bytes, dict]]):
+        started = time.perf_counter()
+        try:
+            chunk = bytearray()
+            for item in batch:
+                if isinstance(item, dict):
+                    self._write(chunk)
+                    chunk.clear()
+                    self._rotate(item)
+                else:
+                    chunk += item
+            self._write(chunk)
+        except OSError as e:
+            log.error("Journal write failed", path=self.path, error=str(e))
+        JOURNAL_COMMIT_SECONDS.observe(time.perf_counter() - started)
+        with self._cond:
+            self.committed += len(batch)
+            self.commits += 1
+        JOURNAL_COMMITS.inc()
+
+    def _write(self, chunk: bytes):
+        if chunk and self._file is not None:
+            self._file.write(chunk)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _rotate(self, snapshot: dict):
+        """Writes the snapshot, then an empty journal of its generation; a crash between the two leaves
+        the old journal, whose generation no longer matches and is ignored."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.generation += 1
+        snapshot['generation'] = self.generation
+        _write_atomic(self.snapshot_path, json.dumps(snapshot).encode("utf-8"))
+        if self._file is not None:
+            self._file.close()
+        _write_atomic(self.path, HEADER.pack(MAGIC, self.generation))
+        self._file = open(self.path, "ab")
+        JOURNAL_SNAPSHOTS.inc()
+
+def apply(state, op: int, a: int, b: int, payload: bytes):
+    """Replays one record onto `state` (which must not be journaling)."""
+    if op == OP_PLACE:
+        state.place_stone(a, b, state.stone_images[state.current_turn])
+    elif op == OP_UNDO:
+        state.undo()
+    elif op == OP_REDO:
+        state.redo()
+    elif op == OP_NAME:
+        state.set_player_name(a, payload.decode("utf-8"))
+    elif op == OP_RESET:
+        state.reset()
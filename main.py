@@ -1,6 +1,10 @@
+import log
+import metrics
 from game import GobangGame
 
 def main():
+    log.configure()
+    metrics.start_from_env()
     game = GobangGame()
     game.run()
 
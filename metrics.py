@@ -0,0 +1,157 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Latency buckets in seconds, from sub-millisecond cell scoring up to multi-second searches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Counter:
+    """Monotonic count. `inc` is a single attribute add, cheap enough for hot paths."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.value}"]
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+    kind = "gauge"
+
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help_text: str, *args):
+        with self._lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, help_text, *args)
+            return self.metrics[name]
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, buckets)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY):
+    """Serves `registry` at http://host:port/metrics from a daemon thread; returns the ThreadingHTTPServer."""
+    # Imported here: http.server pulls in email and costs ~40 ms, and the game imports metrics at startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # scrapes are not worth a log line each
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_file_dump(path: str, interval: float = 10.0, registry: Registry = REGISTRY) -> threading.Event:
+    """Rewrites `path` with the current metrics every `interval` seconds. Set the returned event to stop."""
+    stop = threading.Event()
+
+    def dump():
+        while not stop.wait(interval):
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(registry.render())
+            os.replace(tmp_path, path)
+
+    threading.Thread(target=dump, daemon=True).start()
+    return stop
+
+class Timer:
+    """Context manager that observes its elapsed time into a histogram."""
+
+    def __init__(self, hist: Histogram):
+        self.hist = hist
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        self.hist.observe(self.elapsed)
+
+def start_from_env(registry: Registry = REGISTRY):
+    """Starts the exporters requested by $GOBANG_METRICS_PORT and/or $GOBANG_METRICS_FILE."""
+    port = os.environ.get("GOBANG_METRICS_PORT")
+    if port:
+        start_http_server(int(port), registry=registry)
+    path = os.environ.get("GOBANG_METRICS_FILE")
+    if path:
+        start_file_dump(path, float(os.environ.get("GOBANG_METRICS_INTERVAL", "10")), registry)
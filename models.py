@@ -1,6 +1,11 @@
 import pygame as pg
 from typing import List, Tuple, Optional
-from constants import GRID_SIZE, OFFSET, CELL_SIZE, STATE_MENU, STATE_PLAYING, MODE_PVP, PLAYER_BLACK
+from constants import GRID_SIZE, OFFSET, CELL_SIZE, STATE_MENU, STATE_PLAYING, MODE_PVP, PLAYER_BLACK, CPU_ENGINES
+from engine import evaluation
+from variations import VariationTree, NO_NODE, ROOT
+import metrics
+
+MOVES_APPLIED = metrics.counter("gobang_moves_applied_total", "Stones placed on the board")
 
 class GameObject:
     def __init__(self, image: pg.Surface, color_key: str, pos: Tuple[int, int]):
@@ -12,37 +17,42 @@ class GameState:
     def __init__(self):
         self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
         self.history: List[GameObject] = []
-        self.undone_history: List[GameObject] = []
+        self.tree = VariationTree()  # every line explored; history is the path to tree.current
+        self.stone_images: List[Optional[pg.Surface]] = [None, None]  # for stones rebuilt from the tree
         self.current_turn = 0  # 0 for Black, 1 for White
         self.winner: Optional[int] = None
         self.game_state = STATE_MENU
         self.game_mode = MODE_PVP
         self.player_color = PLAYER_BLACK
+        self.cpu_engine = CPU_ENGINES[0]  # kept across games
         self.scan_start_time = 0.0
         self.player_names = {0: "Player 1", 1: "Player 2"}
         self.selected_name_index = 0
+        self.selected_host_index = 0
+        self.journal = None  # journal.Journal recording this game, while hosting
 
     def reset(self):
         self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
         self.history.clear()
-        self.undone_history.clear()
+        self.tree = VariationTree()
         self.current_turn = 0
         self.winner = None
         self.player_names = {0: "Player 1", 1: "Player 2"}
+        if self.journal is not None:
+            self.journal.reset()
 
     def exit_to_menu(self):
+        if self.journal is not None:
+            self.journal.detach()
         self.reset()
         self.game_state = STATE_MENU
 
     def get_state_data(self) -> dict:
         """Serializes current game state for synchronization."""
         return {
-            'history': [(int(round((obj.rect.centerx - OFFSET) / CELL_SIZE)), 
-                         int(round((obj.rect.centery - OFFSET) / CELL_SIZE))) 
-                        for obj in self.history],
-            'undone_history': [(int(round((obj.rect.centerx - OFFSET) / CELL_SIZE)), 
-                                int(round((obj.rect.centery - OFFSET) / CELL_SIZE))) 
-                               for obj in self.undone_history],
+            'history': self.get_move_list(),
+            # Redo stack order: the next move to redo is last
+            'undone_history': [self.tree.move(node) for node in reversed(self.tree.continuation())],
             'current_turn': self.current_turn,
             'winner': self.winner,
             'player_names': {str(k): v for k, v in self.player_names.items()}
@@ -52,26 +62,19 @@ class GameState:
         """Reconstructs state from serialized data."""
         self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
         self.history.clear()
-        self.undone_history.clear()
+        self.tree = VariationTree()
+        self.stone_images = [black_img, white_img]
         
         # Restore history
         for bx, by in data['history']:
-            color_key = ['X', 'O'][len(self.history) % 2]
-            self.board[by][bx] = color_key
-            img = [black_img, white_img][len(self.history) % 2]
-            pos = (OFFSET + bx * CELL_SIZE, OFFSET + by * CELL_SIZE)
-            self.history.append(GameObject(img, color_key, pos))
+            self._add_stone(bx, by)
+            self.tree.play(bx, by)
             
-        # Restore undone history (simple coordinates)
-        # Note: We don't strictly need to reconstruct the full undone history objects 
-        # unless we plan to redo from them locally, but let's do it for consistency.
-        current_len = len(self.history)
-        for i, (bx, by) in enumerate(data['undone_history']):
-            # This is tricky because we need to know what color they were.
-            # Alternating colors but we need to know the starting color for the stack.
-            # For now, let's just store them as simplified objects or just skip full reconstruction 
-            # if we trust the authoritative sync.
-            pass
+        # Restore the redo line after it; colours simply continue to alternate
+        current = self.tree.current
+        for bx, by in reversed(data['undone_history']):
+            self.tree.play(bx, by)
+        self.tree.current = current
 
         self.current_turn = data['current_turn']
         self.winner = data['winner']
@@ -79,13 +82,29 @@ class GameState:
             # Convert string keys back to int
             self.player_names = {int(k): v for k, v in data['player_names'].items()}
 
+    def _add_stone(self, x: int, y: int, stone_image: Optional[pg.Surface] = None):
+        """Puts the next stone in the sequence on the board and in history."""
+        color = len(self.history) % 2
+        color_key = ['X', 'O'][color]
+        self.board[y][x] = color_key
+        pos = (OFFSET + x * CELL_SIZE, OFFSET + y * CELL_SIZE)
+        self.history.append(GameObject(stone_image or self.stone_images[color], color_key, pos))
+
+    def _remove_stone(self):
+        last_stone = self.history.pop()
+        bx = int(round((last_stone.rect.centerx - OFFSET) / CELL_SIZE))
+        by = int(round((last_stone.rect.centery - OFFSET) / CELL_SIZE))
+        self.board[by][bx] = ' '
+
     def place_stone(self, x: int, y: int, stone_image: pg.Surface) -> bool:
         if self.board[y][x] == ' ' and self.winner is None:
-            color_key = ['X', 'O'][self.current_turn]
-            self.board[y][x] = color_key
-            pos = (OFFSET + x * CELL_SIZE, OFFSET + y * CELL_SIZE)
-            self.history.append(GameObject(stone_image, color_key, pos))
-            self.undone_history.clear()
+            self.stone_images[self.current_turn] = stone_image
+            self._add_stone(x, y, stone_image)
+            # Playing the move that was undone keeps its redo line; anything else starts a new variation
+            self.tree.play(x, y)
+            MOVES_APPLIED.inc()
+            if self.journal is not None:
+                self.journal.place(x, y)
             
             if self.check_win(x, y):
                 self.winner = self.current_turn
@@ -95,51 +114,19 @@ class GameState:
         return False
 
     def evaluate_move(self, x: int, y: int, player_char: str) -> int:
-        score = 0
-        opponent_char = 'X' if player_char == 'O' else 'O'
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        
-        for dx, dy in directions:
-            for start_offset in range(-4, 1):
-                window = []
-                for i in range(5):
-                    nx, ny = x + dx * (start_offset + i), y + dy * (start_offset + i)
-                    if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                        window.append(self.board[ny][nx])
-                    else:
-                        break
-                
-                if len(window) == 5:
-                    count_p = window.count(player_char)
-                    count_o = window.count(opponent_char)
-                    
-                    if count_p > 0 and count_o == 0:
-                        if count_p == 4: score += 1000000 # Win
-                        elif count_p == 3: score += 10000
-                        elif count_p == 2: score += 1000
-                    elif count_o > 0 and count_p == 0:
-                        if count_o == 4: score += 900000 # Critical Block
-                        elif count_o == 3: score += 8000
-                        elif count_o == 2: score += 500
-        return score
+        return evaluation.evaluate_move(self.board, x, y, player_char)
 
     def get_best_move(self) -> Optional[Tuple[int, int]]:
         import random
-        best_score = -1
-        moves = []
-        
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.board[y][x] == ' ':
-                    score = self.evaluate_move(x, y, 'O') + self.evaluate_move(x, y, 'X')
-                    if score > best_score:
-                        best_score = score
-                        moves = [(x, y)]
-                    elif score == best_score:
-                        moves.append((x, y))
-        
+        _, moves, _ = evaluation.best_moves(self.board)
         return random.choice(moves) if moves else None
 
+    def get_move_list(self) -> List[Tuple[int, int]]:
+        """Board coordinates of the played stones, in order."""
+        return [(int(round((obj.rect.centerx - OFFSET) / CELL_SIZE)),
+                 int(round((obj.rect.centery - OFFSET) / CELL_SIZE)))
+                for obj in self.history]
+
     def undo(self) -> bool:
         from constants import MODE_PVC
         if not self.history:
@@ -153,29 +140,74 @@ class GameState:
 
         for _ in range(steps_to_undo):
             if self.history:
-                last_stone = self.history.pop()
-                bx = int(round((last_stone.rect.centerx - OFFSET) / CELL_SIZE))
-                by = int(round((last_stone.rect.centery - OFFSET) / CELL_SIZE))
-                self.board[by][bx] = ' '
-                self.undone_history.append(last_stone)
-                self.current_turn = 1 - self.current_turn
+                self._remove_stone()
+                self.tree.current = self.tree.parents[self.tree.current]
         
         self.winner = None
+        self.current_turn = len(self.history) % 2
+        if self.journal is not None:
+            self.journal.undo()
         return True
 
     def redo(self) -> bool:
-        if self.undone_history:
-            stone = self.undone_history.pop()
-            bx = int(round((stone.rect.centerx - OFFSET) / CELL_SIZE))
-            by = int(round((stone.rect.centery - OFFSET) / CELL_SIZE))
-            self.board[by][bx] = stone.color_key
-            self.history.append(stone)
-            if self.check_win(bx, by):
-                self.winner = self.current_turn
-            else:
-                self.current_turn = 1 - self.current_turn
-            return True
-        return False
+        node = self.tree.selected[self.tree.current]
+        if node == NO_NODE:
+            return False
+        bx, by = self.tree.move(node)
+        self._add_stone(bx, by)
+        self.tree.current = node
+        if self.check_win(bx, by):
+            self.winner = self.current_turn
+        else:
+            self.current_turn = 1 - self.current_turn
+        if self.journal is not None:
+            self.journal.redo()
+        return True
+
+    def set_player_name(self, index: int, name: str):
+        self.player_names[index] = name
+        if self.journal is not None:
+            self.journal.name(index, name)
+
+    def goto_node(self, node: int):
+        """Jumps to any node of the variation tree, touching only the moves that differ."""
+        back, forward = self.tree.path_between(self.tree.current, node)
+        for _ in back:
+            self._remove_stone()
+        for step in forward:
+            self._add_stone(*self.tree.move(step))
+        self.tree.current = node
+        self.tree.select_path(forward)
+
+        self.winner = None
+        self.current_turn = len(self.history) % 2
+        if node != ROOT and self.check_win(*self.tree.move(node)):
+            self.winner = 1 - self.current_turn
+            self.current_turn = self.winner
+
+    def step_back(self) -> bool:
+        if self.tree.current == ROOT:
+            return False
+        self.goto_node(self.tree.parents[self.tree.current])
+        return True
+
+    def step_forward(self) -> bool:
+        node = self.tree.selected[self.tree.current]
+        if node == NO_NODE:
+            return False
+        self.goto_node(node)
+        return True
+
+    def switch_variation(self, delta: int) -> bool:
+        """Swaps the last move for the previous/next alternative played from the same position."""
+        if self.tree.current == ROOT:
+            return False
+        siblings = self.tree.children(self.tree.parents[self.tree.current])
+        if len(siblings) < 2:
+            return False
+        index = (siblings.index(self.tree.current) + delta) % len(siblings)
+        self.goto_node(siblings[index])
+        return True
 
     def check_win(self, x: int, y: int) -> bool:
         color = self.board[y][x]
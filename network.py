@@ -1,183 +1,512 @@
 import socket
 import json
+import secrets
 import threading
 import time
-from typing import Optional, Callable, Set
-from constants import DEFAULT_PORT, NET_BUFFER_SIZE, DISCOVERY_PORT, DISCOVERY_INTERVAL
+from typing import Optional, Callable, Dict, List, Tuple
+from constants import (DEFAULT_PORT, NET_BUFFER_SIZE, DISCOVERY_PORT, BROWSE_PORT, DISCOVERY_VERSION,
+                       DISCOVERY_INTERVAL, DISCOVERY_IDLE_INTERVAL, PROBE_INTERVAL, HOST_TTL,
+                       HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT, RECONNECT_INTERVAL, SESSION_GRACE_PERIOD)
+from log import get_logger
+import metrics
+
+log = get_logger("network")
+
+MESSAGES_SENT = metrics.counter("gobang_net_messages_sent_total", "Frames written to a LAN peer")
+MESSAGES_RECEIVED = metrics.counter("gobang_net_messages_received_total", "Frames read from a LAN peer")
+SYNC_MESSAGES = metrics.counter("gobang_net_sync_messages_total", "Authoritative sync_state messages sent")
+BYTES_SENT = metrics.counter("gobang_net_bytes_sent_total", "Bytes written to LAN peers")
+BYTES_RECEIVED = metrics.counter("gobang_net_bytes_received_total", "Bytes read from LAN peers")
+GARBLED_FRAMES = metrics.counter("gobang_net_garbled_frames_total", "Frames dropped because they were not valid JSON")
+ACTIVE_SESSIONS = metrics.gauge("gobang_active_sessions", "LAN sessions currently open")
+SESSION_RECOVERY = metrics.histogram("gobang_session_recovery_seconds", "Time from link loss to session resumption")
+DISCOVERY_PACKETS = metrics.counter("gobang_discovery_packets_sent_total", "UDP discovery probes, beacons and replies sent")
+DISCOVERY_BROADCASTS = metrics.counter("gobang_discovery_broadcasts_total", "Discovery packets sent to the broadcast address")
+
+def _parse_discovery(data: bytes) -> Optional[dict]:
+    """A discovery message of our protocol version, or None for anything else on the port."""
+    try:
+        message = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(message, dict) or message.get('gobang') != DISCOVERY_VERSION:
+        return None
+    return message
+
+class FrameReader:
+    """Splits a TCP byte stream into newline-delimited JSON messages."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = b""
+
+    def read_frame(self) -> Optional[dict]:
+        """Blocks until a whole frame arrives. Returns None once the peer has closed.
+
+        socket.timeout propagates with any partial frame kept for the next call;
+        a frame that is not valid JSON raises ValueError after being consumed.
+        """
+        while b"\n" not in self.buffer:
+            chunk = self.sock.recv(NET_BUFFER_SIZE)
+            if not chunk:
+                return None
+            BYTES_RECEIVED.inc(len(chunk))
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        MESSAGES_RECEIVED.inc()
+        return json.loads(line.decode('utf-8'))
 
 class NetworkManager:
-    def __init__(self, port: int = DEFAULT_PORT):
+    """One LAN session between a host and a client.
+
+    Application messages carry a sequence number and stay in `outbox` until the
+    peer acknowledges them (acks ride on the heartbeat pings). When the link drops
+    the session survives for `grace_period` seconds: the client keeps reconnecting
+    with its session token and both sides replay only what the other has not seen.
+    """
+
+    def __init__(self, port: int = DEFAULT_PORT, grace_period: float = SESSION_GRACE_PERIOD,
+                 discovery_port: int = DISCOVERY_PORT, browse_port: int = BROWSE_PORT,
+                 broadcast_address: str = '<broadcast>'):
         self.port = port
+        self.grace_period = grace_period
         self.server_socket: Optional[socket.socket] = None
         self.client_socket: Optional[socket.socket] = None
         self.is_host = False
         self.on_data_received: Optional[Callable[[dict], None]] = None
         self.on_connection_established: Optional[Callable[[], None]] = None
         self.on_connection_lost: Optional[Callable[[], None]] = None
+        self.on_connection_interrupted: Optional[Callable[[], None]] = None
+        self.on_connection_resumed: Optional[Callable[[], None]] = None
         self.running = False
         
+        # Session state
+        self.host_ip: Optional[str] = None
+        self.session_token: Optional[str] = None
+        self.link_up = False
+        self.link_down_since = 0.0
+        self.last_recv_time = 0.0
+        self.send_seq = 0
+        self.last_received_seq = 0
+        self.outbox: List[dict] = []
+        self.recoveries: List[float] = []
+        self.frames_garbled = 0
+        self._send_lock = threading.RLock()
+        
         # Discovery state
+        self.discovery_port = discovery_port
+        self.browse_port = browse_port
+        self.broadcast_address = broadcast_address
         self.discovery_socket: Optional[socket.socket] = None
         self.discovery_running = False
-        self.found_hosts: Set[str] = set()
+        self.found_hosts: Dict[str, dict] = {} # ip -> advertised info plus when it was last heard
+        self.advertised = {'name': "", 'room': socket.gethostname()}
+        self._hosts_lock = threading.Lock()
         self.on_host_discovered: Optional[Callable[[str], None]] = None
 
+    def _reset_session(self):
+        with self._send_lock:
+            if self.session_token:
+                ACTIVE_SESSIONS.dec()
+            self.session_token = None
+            self.link_up = False
+            self.send_seq = 0
+            self.last_received_seq = 0
+            self.outbox = []
+
     def start_server(self):
-        """Starts a TCP server and listens for a single connection."""
+        """Starts a TCP server and hosts a single session."""
         self.stop() # Ensure previous session is fully cleaned up
         
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind(('', self.port))
         self.server_socket.listen(1)
+        self.server_socket.settimeout(1.0)
         self.is_host = True
         self.running = True
         
-        # Accept connection in a separate thread to avoid blocking the main game loop
-        thread = threading.Thread(target=self._accept_connection, daemon=True)
-        thread.start()
-        print(f"Server started on port {self.port}. Waiting for connection...")
+        # Accept connections in a separate thread to avoid blocking the main game loop
+        threading.Thread(target=self._accept_connections, daemon=True).start()
+        threading.Thread(target=self._run_heartbeat, daemon=True).start()
+        log.info("Server started, waiting for connection", port=self.port)
 
-    def _accept_connection(self):
-        try:
-            self.client_socket, addr = self.server_socket.accept()
-            print(f"Connected by {addr}")
+    def _accept_connections(self):
+        # Keeps accepting for the whole session so a dropped client can come back
+        while self.running:
+            try:
+                sock, addr = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            except Exception as e:
+                if self.running:
+                    log.error("Error accepting connection", error=str(e))
+                    self._end_session()
+                break
+            try:
+                self._handshake_client(sock, addr)
+            except Exception as e:
+                log.warning("Handshake failed", peer=addr[0], error=str(e))
+                sock.close()
+
+    def _handshake_client(self, sock: socket.socket, addr):
+        sock.settimeout(HEARTBEAT_TIMEOUT)
+        reader = FrameReader(sock)
+        hello = reader.read_frame() or {}
+        
+        if hello.get('ctl') == 'hello' and self.session_token is None:
+            self.session_token = secrets.token_hex(8)
+            ACTIVE_SESSIONS.inc()
+            self._attach(sock, reader)
+            self._send_raw({'ctl': 'welcome', 'token': self.session_token})
+            log.info("Client connected", peer=addr[0])
             if self.on_connection_established:
                 self.on_connection_established()
-            self._listen_for_data()
-        except Exception as e:
-            print(f"Error accepting connection: {e}")
-            self.running = False
-            if self.on_connection_lost:
-                self.on_connection_lost()
+        elif hello.get('ctl') == 'resume' and self.session_token and hello.get('token') == self.session_token:
+            # The client only resumes once it considers the old link dead; drop ours too
+            if self.link_up:
+                self._link_lost(self.client_socket)
+            self._attach(sock, reader)
+            with self._send_lock:
+                self._send_raw({'ctl': 'resumed', 'last_seq': self.last_received_seq})
+                self._replay(hello.get('last_seq', 0))
+            self._resumed()
+        else:
+            log.warning("Rejected connection", peer=addr[0])
+            sock.close()
+            return
+        threading.Thread(target=self._listen_for_data, args=(sock, reader), daemon=True).start()
 
-    def connect_to_server(self, host_ip: str):
-        """Connects to a host server."""
+    def connect_to_server(self, host_ip: str, port: Optional[int] = None):
+        """Connects to a host server and opens a new session, on the port it advertised if given."""
+        if port:
+            self.port = port
         try:
-            self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.client_socket.connect((host_ip, self.port))
+            self._reset_session()
+            sock = socket.create_connection((host_ip, self.port), timeout=HEARTBEAT_TIMEOUT)
+            reader = FrameReader(sock)
             self.is_host = False
             self.running = True
+            self.host_ip = host_ip
+            sock.sendall(json.dumps({'ctl': 'hello'}).encode('utf-8') + b"\n")
+            welcome = reader.read_frame()
+            if not welcome or welcome.get('ctl') != 'welcome':
+                raise ConnectionError("host rejected the session")
+            self.session_token = welcome['token']
+            ACTIVE_SESSIONS.inc()
+            self._attach(sock, reader)
             
             # Listen for data in a separate thread
-            thread = threading.Thread(target=self._listen_for_data, daemon=True)
-            thread.start()
-            print(f"Connected to server at {host_ip}")
+            threading.Thread(target=self._listen_for_data, args=(sock, reader), daemon=True).start()
+            threading.Thread(target=self._run_heartbeat, daemon=True).start()
+            log.info("Connected to server", host=host_ip)
             if self.on_connection_established:
                 self.on_connection_established()
             return True
         except Exception as e:
-            print(f"Failed to connect: {e}")
+            log.error("Failed to connect", host=host_ip, error=str(e))
+            self.running = False
             if self.on_connection_lost:
                 self.on_connection_lost()
             return False
 
-    def _listen_for_data(self):
+    def _reconnect(self):
+        """Client side: retries the host until the session resumes or the grace period ends."""
+        while self.running and not self.link_up and time.time() - self.link_down_since < self.grace_period:
+            try:
+                sock = socket.create_connection((self.host_ip, self.port), timeout=HEARTBEAT_TIMEOUT)
+                reader = FrameReader(sock)
+                resume = {'ctl': 'resume', 'token': self.session_token, 'last_seq': self.last_received_seq}
+                sock.sendall(json.dumps(resume).encode('utf-8') + b"\n")
+                reply = reader.read_frame()
+                if reply and reply.get('ctl') == 'resumed':
+                    self._attach(sock, reader)
+                    with self._send_lock:
+                        self._replay(reply.get('last_seq', 0))
+                    threading.Thread(target=self._listen_for_data, args=(sock, reader), daemon=True).start()
+                    self._resumed()
+                    return
+                sock.close()
+            except (OSError, ValueError):
+                pass
+            time.sleep(RECONNECT_INTERVAL)
+
+    def _attach(self, sock: socket.socket, reader: FrameReader):
+        with self._send_lock:
+            sock.settimeout(HEARTBEAT_INTERVAL)
+            # Messages are tiny and often sent back to back; don't let Nagle hold them for an ACK
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.client_socket = sock
+            self.last_recv_time = time.time()
+            self.link_up = True
+
+    def _resumed(self):
+        recovery = time.time() - self.link_down_since
+        self.recoveries.append(recovery)
+        SESSION_RECOVERY.observe(recovery)
+        log.info("Session resumed", recovery_s=round(recovery, 3))
+        if self.on_connection_resumed:
+            self.on_connection_resumed()
+
+    def _link_lost(self, sock: Optional[socket.socket]):
+        with self._send_lock:
+            if not self.link_up or self.client_socket is not sock:
+                return
+            self.link_up = False
+            self.link_down_since = time.time()
+            try:
+                sock.close()
+            except OSError:
+                pass
+        if not self.running:
+            return
+        log.warning("Link lost, holding session", grace_s=self.grace_period)
+        if self.on_connection_interrupted:
+            self.on_connection_interrupted()
+        if not self.is_host:
+            threading.Thread(target=self._reconnect, daemon=True).start()
+
+    def _end_session(self):
+        """Gives up on the session and notifies the game (grace period over or peer left)."""
+        if not self.running:
+            return
+        self.running = False
+        self._reset_session()
+        if self.on_connection_lost:
+            self.on_connection_lost()
+
+    def _run_heartbeat(self):
         while self.running:
+            time.sleep(HEARTBEAT_INTERVAL)
+            if self.link_up:
+                if time.time() - self.last_recv_time > HEARTBEAT_TIMEOUT:
+                    log.warning("Peer stopped responding", silent_s=round(time.time() - self.last_recv_time, 2))
+                    self._link_lost(self.client_socket)
+                else:
+                    self._send_raw({'ctl': 'ping', 'ack': self.last_received_seq})
+            elif self.session_token and time.time() - self.link_down_since > self.grace_period:
+                log.warning("Session expired")
+                self._end_session()
+
+    def _listen_for_data(self, sock: socket.socket, reader: FrameReader):
+        while self.running and self.client_socket is sock:
             try:
-                data = self.client_socket.recv(NET_BUFFER_SIZE)
-                if not data:
-                    print("Connection closed by peer")
-                    self.running = False
-                    break
-                
-                message = json.loads(data.decode('utf-8'))
-                if self.on_data_received:
-                    self.on_data_received(message)
+                message = reader.read_frame()
+            except socket.timeout:
+                continue # Silence is caught by the heartbeat
+            except ValueError as e:
+                self.frames_garbled += 1
+                GARBLED_FRAMES.inc()
+                log.warning("Dropped garbled frame", error=str(e))
+                continue
             except Exception as e:
-                print(f"Error receiving data: {e}")
-                self.running = False
+                if self.running and self.link_up and self.client_socket is sock:
+                    log.error("Error receiving data", error=str(e))
+                break
+            
+            if message is None:
+                log.info("Connection closed by peer")
                 break
+            self.last_recv_time = time.time()
+            self._handle_message(message)
         
-        # When loop finishes (running=False or break), notify connection lost
-        if self.on_connection_lost:
-            self.on_connection_lost()
+        self._link_lost(sock)
+
+    def _handle_message(self, message: dict):
+        ctl = message.get('ctl')
+        if ctl == 'ping':
+            with self._send_lock:
+                ack = message.get('ack', 0)
+                self.outbox = [m for m in self.outbox if m['seq'] > ack]
+        elif ctl == 'bye':
+            log.info("Peer left the session")
+            self._end_session()
+        elif ctl is None:
+            seq = message.pop('seq', 0)
+            if seq <= self.last_received_seq:
+                return # Already applied before a reconnect
+            self.last_received_seq = seq
+            if self.on_data_received:
+                self.on_data_received(message)
+
+    def _send_raw(self, message: dict):
+        with self._send_lock:
+            if self.client_socket and self.link_up:
+                try:
+                    frame = json.dumps(message).encode('utf-8') + b"\n"
+                    self.client_socket.sendall(frame)
+                    MESSAGES_SENT.inc()
+                    BYTES_SENT.inc(len(frame))
+                    if message.get('type') == 'sync_state':
+                        SYNC_MESSAGES.inc()
+                except Exception as e:
+                    log.error("Error sending data", error=str(e))
+
+    def _replay(self, after_seq: int):
+        # Callers hold _send_lock so replayed frames go out before any newer message
+        self.outbox = [m for m in self.outbox if m['seq'] > after_seq]
+        for message in self.outbox:
+            self._send_raw(message)
 
     def send_data(self, data: dict):
-        """Sends a JSON-encoded dictionary to the connected peer."""
-        if self.client_socket and self.running:
-            try:
-                message = json.dumps(data).encode('utf-8')
-                self.client_socket.sendall(message)
-            except Exception as e:
-                print(f"Error sending data: {e}")
-                self.running = False
+        """Sends a JSON-encoded dictionary to the connected peer, resending it after a reconnect if needed."""
+        if not self.running:
+            return
+        with self._send_lock:
+            self.send_seq += 1
+            message = dict(data, seq=self.send_seq)
+            self.outbox.append(message)
+            self._send_raw(message)
+
+    def advertise(self, **fields):
+        """Updates what this host tells browsing clients (e.g. name=...)."""
+        self.advertised.update(fields)
+
+    def _host_info(self) -> dict:
+        return dict(self.advertised, gobang=DISCOVERY_VERSION, type='host', port=self.port,
+                    players=2 if self.session_token else 1)
+
+    def _open_discovery_socket(self, port: int) -> bool:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        try:
+            sock.bind(('', port))
+        except OSError as e:
+            log.error("Error binding discovery socket", port=port, error=str(e))
+            sock.close()
+            return False
+        self.discovery_socket = sock
+        self.discovery_running = True
+        return True
+
+    def _send_discovery(self, sock: socket.socket, message: dict, addr):
+        sock.sendto(json.dumps(message).encode('utf-8'), addr)
+        DISCOVERY_PACKETS.inc()
+        if addr[0] == self.broadcast_address:
+            DISCOVERY_BROADCASTS.inc()
 
     def start_discovery_beacon(self):
-        """Broadcasts a beacon to the local network to announce presence."""
+        """Answers probes from browsing clients and announces the host with a beacon that slows down while idle."""
         if self.discovery_running:
             return
-        self.discovery_running = True
-        self.discovery_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.discovery_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        thread = threading.Thread(target=self._run_beacon, daemon=True)
+        if not self._open_discovery_socket(self.discovery_port):
+            return
+        thread = threading.Thread(target=self._run_beacon, args=(self.discovery_socket,), daemon=True)
         thread.start()
-        print("Discovery beacon started.")
+        log.info("Discovery responder started")
 
-    def _run_beacon(self):
-        message = b"GOBANG_HOST"
+    def _run_beacon(self, sock: socket.socket):
+        interval = DISCOVERY_INTERVAL
+        next_beacon = time.monotonic()
         while self.discovery_running:
             try:
-                self.discovery_socket.sendto(message, ('<broadcast>', DISCOVERY_PORT))
-                time.sleep(DISCOVERY_INTERVAL)
-            except Exception as e:
-                print(f"Error sending discovery beacon: {e}")
+                now = time.monotonic()
+                if now >= next_beacon:
+                    # A full room still answers probes but stops announcing itself
+                    if not self.session_token:
+                        self._send_discovery(sock, self._host_info(), (self.broadcast_address, self.browse_port))
+                    next_beacon = now + interval
+                    interval = min(interval * 2, DISCOVERY_IDLE_INTERVAL)
+                sock.settimeout(max(0.01, next_beacon - time.monotonic()))
+                try:
+                    data, addr = sock.recvfrom(1024)
+                except socket.timeout:
+                    continue
+                message = _parse_discovery(data)
+                if message and message.get('type') == 'probe':
+                    self._send_discovery(sock, self._host_info(), addr)
+            except OSError as e:
+                if self.discovery_running:
+                    log.error("Error in discovery responder", error=str(e))
                 break
 
     def start_discovery_listener(self):
-        """Listens for discovery beacons from other hosts."""
+        """Browses for hosts: broadcasts a probe and collects the unicast replies and beacons.
+
+        Probes are repeated every PROBE_INTERVAL so live hosts stay fresher than HOST_TTL.
+        """
         if self.discovery_running:
             return
-        self.discovery_running = True
-        self.found_hosts.clear()
-        self.discovery_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.discovery_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        # Handle Windows specific bind for broadcase/discovery
-        try:
-            self.discovery_socket.bind(('', DISCOVERY_PORT))
-        except Exception as e:
-            print(f"Error binding discovery listener: {e}")
-            self.discovery_running = False
+        with self._hosts_lock:
+            self.found_hosts.clear()
+        if not self._open_discovery_socket(self.browse_port):
             return
-            
-        thread = threading.Thread(target=self._run_listener, daemon=True)
+        thread = threading.Thread(target=self._run_listener, args=(self.discovery_socket,), daemon=True)
         thread.start()
-        print("Discovery listener started.")
+        log.info("Discovery browser started")
 
-    def _run_listener(self):
-        self.discovery_socket.settimeout(1.0)
+    def _run_listener(self, sock: socket.socket):
+        next_probe = time.monotonic()
         while self.discovery_running:
             try:
-                data, addr = self.discovery_socket.recvfrom(1024)
-                if data == b"GOBANG_HOST":
-                    ip = addr[0]
-                    if ip not in self.found_hosts:
-                        self.found_hosts.add(ip)
-                        if self.on_host_discovered:
-                            self.on_host_discovered(ip)
-            except socket.timeout:
-                continue
-            except Exception as e:
+                now = time.monotonic()
+                if now >= next_probe:
+                    self._send_discovery(sock, {'gobang': DISCOVERY_VERSION, 'type': 'probe'},
+                                         (self.broadcast_address, self.discovery_port))
+                    next_probe = now + PROBE_INTERVAL
+                sock.settimeout(max(0.01, next_probe - time.monotonic()))
+                try:
+                    data, addr = sock.recvfrom(1024)
+                except socket.timeout:
+                    continue
+                message = _parse_discovery(data)
+                if message is None:
+                    continue
+                if message.get('type') == 'host':
+                    self._record_host(addr[0], message)
+                elif message.get('type') == 'gone':
+                    with self._hosts_lock:
+                        self.found_hosts.pop(addr[0], None)
+            except OSError as e:
                 if self.discovery_running:
-                    print(f"Error in discovery listener: {e}")
+                    log.error("Error in discovery browser", error=str(e))
                 break
 
+    def _record_host(self, ip: str, message: dict):
+        info = {key: message.get(key) for key in ('name', 'room', 'port', 'players')}
+        info['seen'] = time.monotonic()
+        with self._hosts_lock:
+            new = ip not in self.found_hosts
+            self.found_hosts[ip] = info
+        if new:
+            log.info("Discovered host", ip=ip, room=info['room'], name=info['name'])
+            if self.on_host_discovered:
+                self.on_host_discovered(ip)
+
+    def hosts(self) -> List[Tuple[str, dict]]:
+        """Live hosts as (ip, info), sorted by room; entries older than HOST_TTL are dropped first."""
+        cutoff = time.monotonic() - HOST_TTL
+        with self._hosts_lock:
+            for ip in [ip for ip, info in self.found_hosts.items() if info['seen'] < cutoff]:
+                del self.found_hosts[ip]
+            return sorted(self.found_hosts.items(), key=lambda item: (str(item[1]['room']), item[0]))
+
     def stop_discovery(self):
-        """Stops discovery beacon or listener."""
-        self.discovery_running = False
+        """Stops the discovery responder or browser; a host tells browsers it has gone."""
+        was_running, self.discovery_running = self.discovery_running, False
         if self.discovery_socket:
+            if was_running and self.discovery_socket.getsockname()[1] == self.discovery_port:
+                try:
+                    self._send_discovery(self.discovery_socket, {'gobang': DISCOVERY_VERSION, 'type': 'gone'},
+                                         (self.broadcast_address, self.browse_port))
+                except OSError:
+                    pass
             self.discovery_socket.close()
             self.discovery_socket = None
-        print("Discovery stopped.")
+        log.debug("Discovery stopped")
 
     def stop(self):
-        """Closes all sockets and stops threads."""
+        """Leaves the session, closes all sockets and stops threads."""
+        if self.running:
+            self._send_raw({'ctl': 'bye'})
         self.running = False
         self.stop_discovery()
         if self.client_socket:
             self.client_socket.close()
         if self.server_socket:
             self.server_socket.close()
+        self._reset_session()
 
     @staticmethod
     def get_local_ip():
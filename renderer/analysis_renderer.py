@@ -0,0 +1,60 @@
+import math
+import pygame as pg
+from constants import WIDTH, HEIGHT, WHITE, RED, GREEN, BLUNDER_THRESHOLD
+from .utils import draw_gradient
+
+GRAPH_RECT = pg.Rect(40, 110, 500, 360)
+
+def _scale(value: int) -> float:
+    """Log-compresses an evaluation into [-1, 1] so fours and twos fit on one axis."""
+    magnitude = min(1.0, math.log10(1 + abs(value)) / 8)
+    return magnitude if value >= 0 else -magnitude
+
+def draw_analysis(renderer, analysis):
+    draw_gradient(renderer.screen, (20, 20, 30), (40, 40, 60), WIDTH, HEIGHT)
+
+    title = renderer.font_large.render("GAME ANALYSIS", True, WHITE)
+    renderer.screen.blit(title, title.get_rect(center=(WIDTH // 2, 50)))
+
+    if analysis is None:
+        return
+
+    # Evaluation graph (Black advantage up, White advantage down)
+    pg.draw.rect(renderer.screen, (30, 30, 40), GRAPH_RECT)
+    pg.draw.rect(renderer.screen, (100, 100, 110), GRAPH_RECT, width=1)
+    pg.draw.line(renderer.screen, (70, 70, 80), (GRAPH_RECT.left, GRAPH_RECT.centery), (GRAPH_RECT.right, GRAPH_RECT.centery))
+
+    total = max(1, len(analysis.moves) - 1)
+    points = [(GRAPH_RECT.left + GRAPH_RECT.width * ply // total,
+               GRAPH_RECT.centery - int(_scale(value) * (GRAPH_RECT.height // 2 - 5)))
+              for ply, value in analysis.evaluation_curve()]
+    if len(points) > 1:
+        pg.draw.lines(renderer.screen, GREEN, False, points)
+
+    blunders = analysis.blunders()
+    for result in blunders:
+        x = GRAPH_RECT.left + GRAPH_RECT.width * result['ply'] // total
+        pg.draw.line(renderer.screen, RED, (x, GRAPH_RECT.top), (x, GRAPH_RECT.bottom))
+
+    status = f"Analysed {len(analysis.results)}/{len(analysis.moves)}"
+    if analysis.done:
+        status += f" in {analysis.elapsed:.1f}s"
+    status_surf = renderer.font_small.render(status, True, (180, 180, 180))
+    renderer.screen.blit(status_surf, (GRAPH_RECT.left, GRAPH_RECT.bottom + 10))
+
+    # Blunder list
+    header = renderer.font_medium.render("BLUNDERS", True, RED)
+    renderer.screen.blit(header, (580, 110))
+    if not blunders and analysis.done:
+        none_surf = renderer.font_small.render("None found", True, (180, 180, 180))
+        renderer.screen.blit(none_surf, (580, 150))
+    for i, result in enumerate(blunders[:8]):
+        side = ['B', 'W'][result['ply'] % 2]
+        line = f"{result['ply'] + 1}.{side} {result['move']} > {result['best_move']}"
+        proven = result['missed_win'] or result['allows_win']
+        color = RED if proven or result['loss'] >= BLUNDER_THRESHOLD * 10 else WHITE
+        line_surf = renderer.font_small.render(line, True, color)
+        renderer.screen.blit(line_surf, (580, 150 + i * 32))
+
+    for btn in renderer.analysis_buttons.values():
+        btn.draw(renderer.screen)
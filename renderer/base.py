@@ -1,63 +1,114 @@
 import pygame as pg
-from typing import Optional, Set
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 from constants import (WIDTH, HEIGHT, BG_IMG, TITLE_FONT_PATH, MENU_FONT_PATH, 
                        STATE_MENU, STATE_PLAYING, STATE_PVC_CONFIG, 
-                       STATE_LAN_MENU, STATE_NAME_INPUT, BLUE, GREEN, RED, BLACK, WHITE)
+                       STATE_LAN_MENU, STATE_NAME_INPUT, STATE_ANALYSIS, BLUE, GREEN, RED, BLACK, WHITE,
+                       CPU_ENGINES)
 from models import GameState
 from ui import Button
+from assets import load_image
 
 # Import specialized renderers
 from .menu_renderer import draw_menu, draw_pvc_config, draw_lan_menu, draw_name_input
 from .game_renderer import draw_game
+from .analysis_renderer import draw_analysis
+from .hint_renderer import HeatmapOverlay, HintPanel, draw_hints
 
 class Renderer:
+    """Draws every screen. Fonts and button groups are built the first time a screen needs them."""
+
     def __init__(self, screen: pg.Surface):
         self.screen = screen
         self.bg = None
-        self.font_small = pg.font.Font(MENU_FONT_PATH, 20)
-        self.font_medium = pg.font.Font(MENU_FONT_PATH, 25)
-        self.font_large = pg.font.Font(MENU_FONT_PATH, 30)
-        self.font_title = pg.font.Font(TITLE_FONT_PATH, 60)
-        
-        self.buttons = {
+
+    @cached_property
+    def font_small(self) -> pg.font.Font:
+        return pg.font.Font(MENU_FONT_PATH, 20)
+
+    @cached_property
+    def font_medium(self) -> pg.font.Font:
+        return pg.font.Font(MENU_FONT_PATH, 25)
+
+    @cached_property
+    def font_large(self) -> pg.font.Font:
+        return pg.font.Font(MENU_FONT_PATH, 30)
+
+    @cached_property
+    def font_title(self) -> pg.font.Font:
+        return pg.font.Font(TITLE_FONT_PATH, 60)
+
+    @cached_property
+    def buttons(self) -> Dict[str, Button]:
+        return {
             'undo': Button('UNDO', RED, self.font_medium, 700, 150),
             'redo': Button('REDO', BLUE, self.font_medium, 700, 250),
+            'hint': Button('HINT', (90, 180, 200), self.font_medium, 700, 300),
             'restart': Button('RESTART', GREEN, self.font_medium, 700, 350),
-            'exit': Button('MENU', (120, 120, 120), self.font_medium, 700, 450)
+            'exit': Button('MENU', (120, 120, 120), self.font_medium, 700, 450),
+            'analyze': Button('ANALYZE', (200, 150, 50), self.font_medium, 700, 550)
         }
 
-        self.menu_buttons = {
+    @cached_property
+    def heatmap(self) -> HeatmapOverlay:
+        return HeatmapOverlay()
+
+    @cached_property
+    def hint_panel(self) -> HintPanel:
+        return HintPanel()
+
+    @cached_property
+    def menu_buttons(self) -> Dict[str, Button]:
+        return {
             'pvp': Button('PLAYER VS PLAYER', BLUE, self.font_large, WIDTH // 2 - 150, 200),
             'pvc': Button('PLAYER VS CPU', GREEN, self.font_large, WIDTH // 2 - 130, 270),
             'lan': Button('LAN PLAY', (200, 150, 50), self.font_large, WIDTH // 2 - 80, 340),
             'quit': Button('QUIT GAME', (120, 120, 120), self.font_large, WIDTH // 2 - 100, 410),
         }
 
-        self.pvc_config_buttons = {
+    @cached_property
+    def pvc_config_buttons(self) -> Dict[str, Button]:
+        return {
             'black': Button('PLAY AS BLACK', BLACK, self.font_large, WIDTH // 2 - 130, 250),
             'white': Button('PLAY AS WHITE', WHITE, self.font_large, WIDTH // 2 - 130, 320),
-            'back': Button('BACK', (120, 120, 120), self.font_large, WIDTH // 2 - 60, 390),
+            'engine': Button(f'ENGINE: {CPU_ENGINES[0].upper()}', (200, 150, 50), self.font_large, WIDTH // 2 - 130, 390),
+            'back': Button('BACK', (120, 120, 120), self.font_large, WIDTH // 2 - 60, 460),
         }
 
-        self.lan_menu_buttons = {
-            'new_game': Button('NEW GAME', GREEN, self.font_large, WIDTH // 2 - 100, 280),
+    @cached_property
+    def lan_menu_buttons(self) -> Dict[str, Button]:
+        return {
+            'join': Button('JOIN GAME', GREEN, self.font_large, WIDTH // 2 - 100, 220),
+            'new_game': Button('NEW GAME', BLUE, self.font_large, WIDTH // 2 - 100, 280),
             'back': Button('MENU', (120, 120, 120), self.font_large, WIDTH // 2 - 60, 350),
         }
 
-    def draw(self, state: GameState, network_info: Optional[str] = None, found_hosts: Optional[Set[str]] = None, elapsed_time: float = 0.0):
+    @cached_property
+    def analysis_buttons(self) -> Dict[str, Button]:
+        return {
+            'back': Button('BACK', (120, 120, 120), self.font_large, WIDTH // 2 - 60, 540),
+        }
+
+    def draw(self, state: GameState, network_info: Optional[str] = None, found_hosts: Optional[List[Tuple[str, dict]]] = None, elapsed_time: float = 0.0, analysis=None, hints=None):
         if state.game_state == STATE_MENU:
             draw_menu(self)
         elif state.game_state == STATE_PVC_CONFIG:
             draw_pvc_config(self)
         elif state.game_state == STATE_LAN_MENU:
-            draw_lan_menu(self, found_hosts or set(), elapsed_time)
+            draw_lan_menu(self, state, found_hosts or [], elapsed_time)
         elif state.game_state == STATE_NAME_INPUT:
             draw_name_input(self, state)
+        elif state.game_state == STATE_ANALYSIS:
+            draw_analysis(self, analysis)
         elif state.game_state == STATE_PLAYING:
             # Clear screen completely
             self.screen.fill((30, 30, 40))
             
             if self.bg is None:
-                self.bg = pg.image.load(BG_IMG).convert_alpha()
+                self.bg = load_image(BG_IMG)
             self.screen.blit(self.bg, (0, 0))
+            if hints is not None:
+                self.heatmap.draw(self.screen)
             draw_game(self, state, network_info)
+            if hints is not None:
+                draw_hints(self, hints)
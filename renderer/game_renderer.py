@@ -15,14 +15,18 @@ def draw_game(renderer, state: GameState, network_info: Optional[str] = None):
 
     # Draw UI
     visible_keys = []
-    for key in ['undo', 'redo', 'restart', 'exit']:
-        if state.game_mode == MODE_LAN and key in ['undo', 'redo']:
+    for key in ['undo', 'redo', 'hint', 'restart', 'exit', 'analyze']:
+        if state.game_mode == MODE_LAN and key in ['undo', 'redo', 'hint']:
+            continue
+        if key == 'analyze' and state.winner is None:
+            continue
+        if key == 'hint' and state.winner is not None:
             continue
         visible_keys.append(key)
         
-    # Center them vertically in the sidebar area
+    # Center them vertically in the sidebar area; tighter when the hint panel needs the bottom
     start_y = 150 if len(visible_keys) > 2 else 250
-    spacing = 100
+    spacing = 70 if 'hint' in visible_keys else 100
     for i, key in enumerate(visible_keys):
         btn = renderer.buttons[key]
         btn.rect.centery = start_y + i * spacing
@@ -38,6 +42,13 @@ def draw_game(renderer, state: GameState, network_info: Optional[str] = None):
     # Sidebar center shifted to ~745
     renderer.screen.blit(info_text, (745 - info_text.get_width() // 2, 70))
     
+    # Variation browser position (arrow keys)
+    if state.game_mode != MODE_LAN and len(state.tree) > 1:
+        index, count = state.tree.sibling_index()
+        var_text = f"MOVE {len(state.history)}" + (f"  VAR {index}/{count}" if count > 1 else "")
+        var_surf = renderer.font_small.render(var_text, True, (150, 150, 150))
+        renderer.screen.blit(var_surf, (745 - var_surf.get_width() // 2, 100))
+    
     # Player Names
     p1_display = state.player_names[0]
     p2_display = state.player_names[1]
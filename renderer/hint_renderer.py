@@ -0,0 +1,68 @@
+import math
+import pygame as pg
+from typing import Dict, List, Tuple
+from constants import GRID_SIZE, CELL_SIZE, OFFSET, GREEN, WHITE
+
+HEAT_SIZE = CELL_SIZE - 8
+
+class HeatmapOverlay:
+    """Per-cell score tints kept on one transparent surface.
+
+    `apply` repaints only the cells an update changed; each frame then costs a
+    single blit however many cells are tinted. The colour scale is absolute
+    (log of the score), so a new maximum does not force the other cells to change.
+    """
+
+    def __init__(self):
+        size = OFFSET * 2 + (GRID_SIZE - 1) * CELL_SIZE
+        self.surface = pg.Surface((size, size), pg.SRCALPHA)
+        self.bounds = None # area holding every tint, so the blit skips the empty rest
+
+    def clear(self):
+        self.surface.fill((0, 0, 0, 0))
+        self.bounds = None
+
+    def apply(self, changed: Dict[Tuple[int, int], int]):
+        for (x, y), score in changed.items():
+            rect = pg.Rect(0, 0, HEAT_SIZE, HEAT_SIZE)
+            rect.center = (OFFSET + x * CELL_SIZE, OFFSET + y * CELL_SIZE)
+            self.surface.fill((0, 0, 0, 0), rect)
+            strength = min(1.0, math.log10(1 + abs(score)) / 6)
+            if strength < 0.3:
+                continue
+            colour = (255, 90, 40) if score > 0 else (60, 120, 255)
+            pg.draw.rect(self.surface, colour + (int(200 * strength),), rect, border_radius=6)
+            self.bounds = rect if self.bounds is None else self.bounds.union(rect)
+
+    def draw(self, screen: pg.Surface):
+        if self.bounds is not None:
+            screen.blit(self.surface, self.bounds.topleft, self.bounds)
+
+class HintPanel:
+    """Text for the latest hint update, rendered once per update rather than every frame."""
+
+    def __init__(self):
+        self.update = None
+        self.blits: List[Tuple[pg.Surface, pg.Rect]] = []
+
+    def blits_for(self, font: pg.font.Font, update) -> List[Tuple[pg.Surface, pg.Rect]]:
+        if update is self.update:
+            return self.blits
+        self.update = update
+        # Ranks on the candidate cells
+        self.blits = []
+        for rank, line in enumerate(update.lines, 1):
+            x, y = line.move
+            label = font.render(str(rank), True, WHITE)
+            self.blits.append((label, label.get_rect(center=(OFFSET + x * CELL_SIZE, OFFSET + y * CELL_SIZE))))
+        # Candidate list in the sidebar
+        header = f"HINTS  depth {update.depth}" + ("" if update.complete else "...")
+        header_surf = font.render(header, True, GREEN)
+        self.blits.append((header_surf, header_surf.get_rect(topleft=(660, 470))))
+        for rank, line in enumerate(update.lines, 1):
+            text_surf = font.render(f"{rank}. {line.move} {line.score:+d}", True, (200, 200, 200))
+            self.blits.append((text_surf, text_surf.get_rect(topleft=(660, 470 + rank * 25))))
+        return self.blits
+
+def draw_hints(renderer, update):
+    renderer.screen.blits(renderer.hint_panel.blits_for(renderer.font_small, update))
@@ -1,5 +1,5 @@
 import pygame as pg
-from typing import Set, List
+from typing import List, Tuple
 from constants import WIDTH, HEIGHT, WHITE, BLACK, RED, GREEN, SCAN_TIMEOUT, PREFILLED_NAMES
 from ui import Button
 from .utils import draw_gradient
@@ -39,47 +39,59 @@ def draw_pvc_config(renderer):
         btn.rect.centerx = WIDTH // 2
         btn.draw(renderer.screen)
 
-def draw_lan_menu(renderer, found_hosts: Set[str], elapsed_time: float):
+MAX_HOST_ROWS = 4
+
+def host_row_rect(index: int) -> pg.Rect:
+    """Screen area of the index-th discovered host; shared with the click handler."""
+    return pg.Rect(WIDTH // 2 - 240, 210 + index * 40, 480, 34)
+
+def draw_lan_menu(renderer, state, hosts: List[Tuple[str, dict]], elapsed_time: float):
     draw_gradient(renderer.screen, (20, 40, 60), (40, 80, 120), WIDTH, HEIGHT)
     
     title = renderer.font_title.render("LAN PLAY", True, WHITE)
-    title_rect = title.get_rect(center=(WIDTH // 2, 150))
+    title_rect = title.get_rect(center=(WIDTH // 2, 110))
     renderer.screen.blit(title, title_rect)
     
-    show_join = len(found_hosts) > 0
-    show_new = not show_join and elapsed_time >= SCAN_TIMEOUT
-    
     # Discovery Status
-    if show_join:
-        host_ip = list(found_hosts)[0]
-        status_text = f"FOUND HOST: {host_ip}"
+    if hosts:
+        status_text = f"FOUND {len(hosts)} HOST{'S' if len(hosts) > 1 else ''}"
         status_color = GREEN
-        if 'join' not in renderer.lan_menu_buttons:
-            renderer.lan_menu_buttons['join'] = Button('JOIN GAME', GREEN, renderer.font_large, WIDTH // 2 - 100, 220)
-    elif not show_new:
-        remaining = max(0, int(SCAN_TIMEOUT - elapsed_time))
-        status_text = f"Scanning for hosts... [{remaining}]"
+    elif elapsed_time < SCAN_TIMEOUT:
+        status_text = "Scanning for hosts..."
         status_color = (180, 180, 180)
     else:
         status_text = "No hosts discovered."
         status_color = RED
         
     status_surf = renderer.font_medium.render(status_text, True, status_color)
-    status_rect = status_surf.get_rect(center=(WIDTH // 2, 210))
+    status_rect = status_surf.get_rect(center=(WIDTH // 2, 180))
     renderer.screen.blit(status_surf, status_rect)
+
+    # Host browser
+    selected = min(state.selected_host_index, len(hosts) - 1)
+    for i, (ip, info) in enumerate(hosts[:MAX_HOST_ROWS]):
+        rect = host_row_rect(i)
+        full = (info.get('players') or 1) >= 2
+        pg.draw.rect(renderer.screen, (30, 50, 70), rect, border_radius=5)
+        if i == selected:
+            pg.draw.rect(renderer.screen, GREEN, rect, width=2, border_radius=5)
+        label = f"{info.get('name') or 'HOST'} @ {info.get('room') or ip}"
+        detail = f"{ip}:{info.get('port')}  {info.get('players') or 1}/2"
+        color = (120, 120, 120) if full else WHITE
+        renderer.screen.blit(renderer.font_small.render(label, True, color), (rect.x + 12, rect.y + 7))
+        detail_surf = renderer.font_small.render(detail, True, color)
+        renderer.screen.blit(detail_surf, detail_surf.get_rect(midright=(rect.right - 12, rect.centery)))
     
     # Position buttons dynamically
-    y_offset = 300
-    visible_keys = ['back']
-    if show_join: visible_keys.insert(0, 'join')
-    elif show_new: visible_keys.insert(0, 'new_game')
+    y_offset = 420
+    visible_keys = ['new_game', 'back']
+    if hosts: visible_keys.insert(0, 'join')
     
     for key in visible_keys:
-        if key in renderer.lan_menu_buttons:
-            btn = renderer.lan_menu_buttons[key]
-            btn.rect.center = (WIDTH // 2, y_offset)
-            btn.draw(renderer.screen)
-            y_offset += 80
+        btn = renderer.lan_menu_buttons[key]
+        btn.rect.center = (WIDTH // 2, y_offset)
+        btn.draw(renderer.screen)
+        y_offset += 70
 
 def draw_name_input(renderer, state):
     draw_gradient(renderer.screen, (20, 20, 30), (40, 40, 60), WIDTH, HEIGHT)
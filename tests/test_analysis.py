@@ -0,0 +1,52 @@
+import time
+import unittest
+from analysis import GameAnalysis, analyse_position, iter_analysis
+from constants import BLUNDER_THRESHOLD
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self):
+        # Black builds an open four on row 7 while White ignores it on row 0
+        self.moves = [(3, 7), (0, 0), (4, 7), (1, 0), (5, 7), (2, 0), (6, 7), (14, 14), (7, 7)]
+
+    def test_missed_block_is_blunder(self):
+        # White's 8th move (ply 7) ignores Black's four
+        result = analyse_position(self.moves, 7)
+        self.assertGreaterEqual(result['loss'], BLUNDER_THRESHOLD)
+        self.assertIn(result['best_move'], [(2, 7), (7, 7)])
+
+    def test_proven_wins(self):
+        # Black's open three (ply 4) is a forced win; White's 6th move ignores it
+        result = analyse_position(self.moves, 6)
+        self.assertEqual(result['forced_win'], (2, 7))
+        self.assertFalse(result['missed_win'])
+        self.assertTrue(analyse_position(self.moves, 5)['allows_win'])
+
+    def test_budget_covers_the_solver(self):
+        started = time.perf_counter()
+        result = analyse_position(self.moves, 7, budget=0.0)
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertFalse(result['complete'])
+        self.assertFalse(result['missed_win'])
+
+    def test_every_ply_is_analysed(self):
+        results = {r['ply']: r for r in iter_analysis(self.moves, workers=2)}
+        self.assertEqual(sorted(results), list(range(len(self.moves))))
+        self.assertTrue(results[7]['allows_win'])
+        self.assertGreaterEqual(results[7]['loss'], BLUNDER_THRESHOLD)
+        self.assertFalse(results[0]['allows_win'] or results[0]['missed_win'])
+
+    def test_game_analysis_flags_the_blunder(self):
+        analysis = GameAnalysis(self.moves, workers=2)
+        analysis._run()
+        self.assertEqual(analysis.progress, 1.0)
+        self.assertEqual(analysis.blunders()[0]['ply'], 7)
+
+    def test_cancel_stops_the_analysis(self):
+        analysis = GameAnalysis(self.moves, workers=1)
+        analysis.cancel()
+        analysis._run()
+        self.assertTrue(analysis.done)
+        self.assertEqual(analysis.results, {})
+
+if __name__ == '__main__':
+    unittest.main()
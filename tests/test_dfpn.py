@@ -0,0 +1,61 @@
+import time
+import unittest
+from engine.dfpn import DfpnSolver, WIN, NO_WIN, UNKNOWN
+from engine.evaluation import board_from_moves
+
+# Black to move with an open three on row 7; White's stones are scattered
+OPEN_THREE = [(7, 7), (0, 0), (8, 7), (0, 2), (9, 7), (0, 4)]
+# Black to move, two broken lines crossing at (7, 7): only a double three wins
+DOUBLE_THREE = [(5, 7), (0, 0), (6, 7), (0, 2), (7, 5), (0, 4), (7, 6), (14, 14)]
+
+class TestDfpnSolver(unittest.TestCase):
+    def test_proves_a_win_by_fours(self):
+        board = board_from_moves(OPEN_THREE)
+        solution = DfpnSolver().solve(board, 'X')
+        self.assertEqual(solution.result, WIN)
+        self.assertIn(solution.move, [(6, 7), (10, 7)])
+        self.assertEqual(board, board_from_moves(OPEN_THREE))
+
+    def test_defender_has_no_win(self):
+        self.assertEqual(DfpnSolver().solve(board_from_moves(OPEN_THREE), 'O').result, NO_WIN)
+
+    def test_solved_positions_are_cached(self):
+        solver = DfpnSolver()
+        first = solver.solve(board_from_moves(OPEN_THREE), 'X')
+        again = solver.solve(board_from_moves(OPEN_THREE), 'X')
+        self.assertFalse(first.cached)
+        self.assertTrue(again.cached)
+        self.assertEqual((again.result, again.move, again.nodes), (first.result, first.move, 0))
+
+    def test_defender_to_move(self):
+        board = board_from_moves(OPEN_THREE + [(6, 7)]) # Black made an open four, White to move
+        self.assertEqual(DfpnSolver().solve(board, 'X', to_move=False).result, WIN)
+
+    def test_threes_need_vct(self):
+        board = board_from_moves(DOUBLE_THREE)
+        self.assertEqual(DfpnSolver().solve(board, 'X').result, NO_WIN)
+        solution = DfpnSolver(threes=True).solve(board, 'X', max_nodes=50000)
+        self.assertEqual((solution.result, solution.move), (WIN, (7, 7)))
+
+    def test_node_limit(self):
+        solution = DfpnSolver(threes=True).solve(board_from_moves(DOUBLE_THREE), 'X', max_nodes=50)
+        self.assertEqual(solution.result, UNKNOWN)
+        self.assertLessEqual(solution.nodes, 51)
+
+    def test_deadline(self):
+        solver = DfpnSolver(threes=True)
+        solution = solver.solve(board_from_moves(DOUBLE_THREE), 'X', max_nodes=50000, deadline=time.perf_counter())
+        self.assertEqual(solution.result, UNKNOWN)
+        self.assertLessEqual(solution.nodes, 64)
+
+    def test_table_is_collected_when_full(self):
+        solver = DfpnSolver(threes=True, max_entries=200)
+        solver.solve(board_from_moves(DOUBLE_THREE), 'X', max_nodes=2000)
+        self.assertGreater(solver.gcs, 0)
+        self.assertLessEqual(len(solver.table), 200)
+
+    def test_memory_limit_sets_entries(self):
+        self.assertEqual(DfpnSolver(memory_mb=1).max_entries, 5000)
+
+if __name__ == '__main__':
+    unittest.main()
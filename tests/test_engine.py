@@ -0,0 +1,38 @@
+import unittest
+from constants import GRID_SIZE
+from engine import evaluation, zobrist
+from engine.ponder import Ponderer
+from engine.search import Searcher
+
+class TestSearcher(unittest.TestCase):
+    def setUp(self):
+        self.board = evaluation.board_from_moves([(7, 7), (8, 8), (6, 7), (5, 9)])
+
+    def test_matches_full_scan(self):
+        searcher = Searcher()
+        self.assertEqual(searcher.best_moves(self.board), evaluation.best_moves(self.board)[:2])
+
+    def test_child_grid_derived_from_parent(self):
+        searcher = Searcher()
+        key = zobrist.hash_board(self.board)
+        searcher.score_grid(self.board, key)
+        self.board[2][3] = 'X'
+        child = searcher.score_grid(self.board, zobrist.toggle(key, 3, 2, 'X'), (3, 2))
+        self.assertEqual(searcher.derived, 1)
+        expected = [evaluation.score_cell(self.board, x, y) if self.board[y][x] == ' ' else -1
+                    for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+        self.assertEqual(child, expected)
+
+class TestPonderer(unittest.TestCase):
+    def test_predicted_reply_is_answered(self):
+        board = evaluation.board_from_moves([(7, 7), (8, 8), (6, 7)])
+        ponderer = Ponderer(Searcher(), replies=3)
+        ponderer.start(board)
+        ponderer._thread.join()
+        _, reply = Searcher().ranked_moves(board)[0]
+        board[reply[1]][reply[0]] = 'O'
+        self.assertIsNotNone(ponderer.lookup(board))
+        self.assertEqual(ponderer.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
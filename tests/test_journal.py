@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pygame as pg
+from constants import MODE_LAN
+from journal import Journal, HEADER
+from models import GameState
+
+class TestJournal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.img = pg.Surface((20, 20))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "host.journal")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def hosted(self, **options) -> GameState:
+        state = GameState()
+        state.game_mode = MODE_LAN
+        Journal(self.path, **options).attach(state)
+        return state
+
+    def recovered(self) -> GameState:
+        state = GameState()
+        self.assertIsNotNone(Journal(self.path).load(state, self.img, self.img))
+        return state
+
+    def test_replays_moves_names_undo_and_redo(self):
+        state = self.hosted(snapshot_every=4)
+        for x in range(6):
+            state.place_stone(x, 0, self.img)
+        state.set_player_name(0, "ALICE")
+        state.undo()
+        state.undo()
+        state.redo()
+        state.journal.detach(discard=False)
+
+        restored = self.recovered()
+        self.assertEqual(restored.get_move_list(), state.get_move_list())
+        self.assertEqual(restored.get_state_data(), state.get_state_data())
+        self.assertEqual(restored.game_mode, MODE_LAN)
+
+    def test_group_commit(self):
+        state = self.hosted(commit_interval=60, max_batch=1000)
+        for x in range(10):
+            state.place_stone(x, 3, self.img)
+        journal = state.journal
+        journal.flush()
+        self.assertEqual((journal.commits, journal.committed), (1, 11)) # the opening snapshot and ten moves
+        journal.detach(discard=False)
+        self.assertEqual(len(self.recovered().history), 10)
+
+    def test_torn_tail_is_dropped(self):
+        state = self.hosted(commit_interval=0)
+        for x in range(3):
+            state.place_stone(x, 5, self.img)
+        state.journal.detach(discard=False)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        state = GameState()
+        stats = Journal(self.path).load(state, self.img, self.img)
+        self.assertEqual(len(state.history), 2)
+        self.assertEqual(stats['discarded_bytes'], 5)
+
+    def test_journal_older_than_snapshot_is_ignored(self):
+        state = self.hosted(commit_interval=0)
+        state.place_stone(7, 7, self.img)
+        state.journal.detach(discard=False)
+        with open(self.path, "r+b") as f:
+            f.write(HEADER.pack(b"GBJ1", 0))
+        self.assertEqual(len(self.recovered().history), 0)
+
+    def test_leaving_the_game_discards_it(self):
+        state = self.hosted()
+        state.place_stone(7, 7, self.img)
+        state.exit_to_menu()
+        self.assertIsNone(state.journal)
+        self.assertIsNone(Journal(self.path).load(GameState(), self.img, self.img))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import threading
+import unittest
+from constants import GRID_SIZE
+from engine.evaluation import board_from_moves, evaluate_move
+from engine.mcts import MctsSearcher, Playout
+from engine.search import create_searcher
+
+class TestPlayout(unittest.TestCase):
+    def test_window_scores_match_evaluate_move(self):
+        board = board_from_moves([(7, 7), (8, 8), (7, 8), (8, 7), (7, 9), (9, 9), (6, 6)])
+        playout = Playout(board)
+        searcher = MctsSearcher()
+        for y in range(GRID_SIZE):
+            for x in range(GRID_SIZE):
+                if board[y][x] == ' ':
+                    for colour, char in ((1, 'X'), (2, 'O')):
+                        self.assertEqual(playout.score(y * GRID_SIZE + x, colour, searcher.attack, searcher.defence),
+                                         evaluate_move(board, x, y, char))
+
+    def test_five_is_detected(self):
+        playout = Playout(board_from_moves([(3, 7), (0, 0), (4, 7), (1, 0), (5, 7), (2, 0), (6, 7), (14, 14)]))
+        self.assertTrue(playout.play(7 * GRID_SIZE + 7, 1))
+
+    def test_rollout_takes_a_four(self):
+        playout = Playout(board_from_moves([(3, 7), (0, 0), (4, 7), (1, 0), (5, 7), (2, 0), (6, 7), (14, 14)]))
+        self.assertEqual(playout.rollout(1, random.Random(0), 40), 1)
+
+class TestMctsSearcher(unittest.TestCase):
+    def test_completes_five(self):
+        board = board_from_moves([(3, 7), (0, 0), (4, 7), (1, 0), (5, 7), (2, 0), (6, 7), (2, 7)])
+        _, moves = MctsSearcher(playouts=300, seed=1).best_moves(board)
+        self.assertEqual(moves, [(7, 7)])
+
+    def test_blocks_four(self):
+        board = board_from_moves([(3, 7), (0, 0), (4, 7), (1, 0), (5, 7), (2, 0), (6, 7)])
+        _, moves = MctsSearcher(playouts=300, seed=1).best_moves(board)
+        self.assertIn(moves[0], [(2, 7), (7, 7)])
+
+    def test_tree_is_reused(self):
+        searcher = MctsSearcher(playouts=500, seed=1)
+        moves = [(7, 7), (8, 8)]
+        _, best = searcher.best_moves(board_from_moves(moves))
+        played = next(child for child in searcher.root.children if child.move == best[0])
+        reply = max(played.children, key=lambda child: child.visits)
+        searcher.best_moves(board_from_moves(moves + best + [reply.move]))
+        self.assertGreater(searcher.last_reused, 0)
+
+    def test_stop_ends_the_search(self):
+        stop = threading.Event()
+        stop.set()
+        searcher = MctsSearcher(seconds=30, seed=1)
+        _, moves = searcher.best_moves(board_from_moves([(7, 7), (8, 8)]), stop=stop)
+        self.assertEqual(len(moves), 1)
+        self.assertLess(searcher.last_playouts, 100)
+
+    def test_created_from_config(self):
+        searcher = create_searcher({'engine': 'mcts', 'seconds': 0.05, 'seed': 3})
+        self.assertIsInstance(searcher, MctsSearcher)
+        self.assertEqual(searcher.seconds, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from metrics import Registry
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_same_name_returns_same_metric(self):
+        self.assertIs(self.registry.counter("a_total", "A"), self.registry.counter("a_total", "A"))
+
+    def test_render_counter_and_gauge(self):
+        self.registry.counter("moves_total", "Moves").inc(3)
+        gauge = self.registry.gauge("sessions", "Sessions")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        text = self.registry.render()
+        self.assertIn("# TYPE moves_total counter\nmoves_total 3\n", text)
+        self.assertIn("sessions 1\n", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 2.0):
+            hist.observe(value)
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_count 4", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import pygame as pg
+from constants import OFFSET, CELL_SIZE
+from engine.evaluation import board_from_moves
+from engine.multipv import HintWorker, iter_multipv
+from renderer.hint_renderer import HeatmapOverlay
+
+# White to move against Black's open three on column 7
+OPEN_THREE = [(7, 7), (8, 8), (7, 8), (8, 7), (7, 9)]
+
+class TestMultiPv(unittest.TestCase):
+    def test_updates_deepen_and_carry_only_changes(self):
+        updates = list(iter_multipv(board_from_moves(OPEN_THREE), count=3, candidates=4))
+        self.assertEqual(updates[0].depth, 1)
+        self.assertGreater(len(updates[0].changed), 100)
+        self.assertTrue(all(len(u.changed) == 1 for u in updates[1:-1]))
+        self.assertTrue(updates[-1].complete)
+        self.assertEqual(len(updates[-1].lines), 3)
+
+    def test_refined_lines_block_the_three(self):
+        last = list(iter_multipv(board_from_moves(OPEN_THREE)))[-1]
+        self.assertIn(last.lines[0].move, [(7, 6), (7, 10)])
+        self.assertIsNotNone(last.lines[0].reply)
+
+    def test_worker_merges_changes_between_polls(self):
+        seen = []
+        worker = HintWorker(board_from_moves(OPEN_THREE), count=3, on_update=seen.append)
+        worker.start()
+        worker._thread.join()
+        latest, changed = worker.poll()
+        self.assertTrue(latest.complete)
+        self.assertIs(latest, seen[-1])
+        self.assertEqual(set(changed), set(seen[0].changed))
+        self.assertEqual(worker.poll(), (latest, {}))
+
+class TestHeatmapOverlay(unittest.TestCase):
+    def test_apply_touches_only_changed_cells(self):
+        overlay = HeatmapOverlay()
+        overlay.apply({(1, 1): 100000, (2, 2): 100000})
+        overlay.apply({(1, 1): 0})
+        self.assertEqual(overlay.surface.get_at((OFFSET + CELL_SIZE, OFFSET + CELL_SIZE)).a, 0)
+        self.assertGreater(overlay.surface.get_at((OFFSET + 2 * CELL_SIZE, OFFSET + 2 * CELL_SIZE)).a, 0)
+        overlay.draw(pg.Surface((700, 700)))
+
+if __name__ == '__main__':
+    unittest.main()
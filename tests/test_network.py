@@ -0,0 +1,104 @@
+import json
+import socket
+import time
+import unittest
+from constants import HOST_TTL, DISCOVERY_VERSION
+from network import FrameReader, NetworkManager
+
+class TestFrameReader(unittest.TestCase):
+    def setUp(self):
+        self.a, self.b = socket.socketpair()
+        self.reader = FrameReader(self.b)
+
+    def tearDown(self):
+        self.a.close()
+        self.b.close()
+
+    def test_coalesced_and_split_frames(self):
+        self.a.sendall(b'{"type": "move", "x": 1}\n{"type": "mo')
+        self.assertEqual(self.reader.read_frame(), {'type': 'move', 'x': 1})
+        self.a.sendall(b've", "x": 2}\n')
+        self.assertEqual(self.reader.read_frame(), {'type': 'move', 'x': 2})
+
+    def test_garbled_frame_is_skipped(self):
+        self.a.sendall(b'not json\n{"ctl": "ping"}\n')
+        with self.assertRaises(ValueError):
+            self.reader.read_frame()
+        self.assertEqual(self.reader.read_frame(), {'ctl': 'ping'})
+
+    def test_closed_peer(self):
+        self.a.close()
+        self.assertIsNone(self.reader.read_frame())
+
+class TestSessionSequencing(unittest.TestCase):
+    def test_replayed_messages_are_applied_once(self):
+        manager = NetworkManager()
+        received = []
+        manager.on_data_received = received.append
+        for seq in (1, 2, 2, 1, 3):
+            manager._handle_message({'type': 'move', 'x': seq, 'seq': seq})
+        self.assertEqual([m['x'] for m in received], [1, 2, 3])
+
+    def test_ack_trims_outbox(self):
+        manager = NetworkManager()
+        manager.running = True
+        for x in range(3):
+            manager.send_data({'type': 'move', 'x': x})
+        manager._handle_message({'ctl': 'ping', 'ack': 2})
+        self.assertEqual([m['seq'] for m in manager.outbox], [3])
+
+class TestDiscovery(unittest.TestCase):
+    def make(self, **kwargs):
+        manager = NetworkManager(port=15105, discovery_port=15106, browse_port=15107,
+                                 broadcast_address='127.0.0.1', **kwargs)
+        self.addCleanup(manager.stop_discovery)
+        return manager
+
+    def wait_for(self, condition, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_probe_reply_and_gone(self):
+        host = self.make()
+        host.advertise(name="ALICE", room="den")
+        host.start_discovery_beacon()
+        client = self.make()
+        client.start_discovery_listener()
+        self.assertTrue(self.wait_for(lambda: client.hosts()))
+        ip, info = client.hosts()[0]
+        self.assertEqual((ip, info['name'], info['room'], info['port'], info['players']),
+                         ('127.0.0.1', 'ALICE', 'den', 15105, 1))
+        host.stop_discovery()
+        self.assertTrue(self.wait_for(lambda: not client.hosts()))
+
+    def test_untyped_datagrams_are_ignored(self):
+        host = self.make()
+        host.start_discovery_beacon()
+        client = self.make()
+        client.start_discovery_listener()
+        untyped = json.dumps({'gobang': DISCOVERY_VERSION}).encode('utf-8')
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as peer:
+            peer.settimeout(1.0)
+            peer.sendto(untyped, ('127.0.0.1', 15106))
+            peer.sendto(untyped, ('127.0.0.1', 15107))
+            time.sleep(0.1)
+            # Both discovery threads must still be serving
+            peer.sendto(json.dumps({'gobang': DISCOVERY_VERSION, 'type': 'probe'}).encode('utf-8'), ('127.0.0.1', 15106))
+            self.assertEqual(json.loads(peer.recvfrom(1024)[0])['type'], 'host')
+            peer.sendto(json.dumps({'gobang': DISCOVERY_VERSION, 'type': 'host', 'name': 'BOB'}).encode('utf-8'),
+                        ('127.0.0.1', 15107))
+            self.assertTrue(self.wait_for(lambda: any(info['name'] == 'BOB' for _, info in client.hosts())))
+
+    def test_stale_hosts_expire(self):
+        client = NetworkManager()
+        client._record_host('10.0.0.2', {'name': 'OLD', 'port': 5005})
+        client._record_host('10.0.0.3', {'name': 'NEW', 'port': 5005})
+        client.found_hosts['10.0.0.2']['seen'] -= HOST_TTL + 1
+        self.assertEqual([ip for ip, _ in client.hosts()], ['10.0.0.3'])
+
+if __name__ == '__main__':
+    unittest.main()
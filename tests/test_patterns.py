@@ -0,0 +1,75 @@
+import unittest
+from engine import evaluation
+from engine.patterns import (PatternEvaluator, ATTACK_SCORES, DEFENCE_SCORES, score_tables, NONE, TWO, OPEN_TWO, THREE, OPEN_THREE,
+                             FOUR, OPEN_FOUR, FIVE)
+from constants import GRID_SIZE
+
+class TestPatternEvaluator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.evaluator = PatternEvaluator()
+
+    def setUp(self):
+        self.board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+
+    def row(self, pattern: str, y: int = 7, start: int = 3):
+        for i, char in enumerate(pattern):
+            if char != '.':
+                self.board[y][start + i] = char
+
+    def horizontal(self, x: int, player_char: str = 'X') -> int:
+        return self.evaluator.threats(self.board, x, 7, player_char)[0]
+
+    def test_five(self):
+        self.row("XXXX.")
+        self.assertEqual(self.horizontal(7), FIVE)
+
+    def test_open_and_closed_four(self):
+        self.row(".XXX..")
+        self.assertEqual(self.horizontal(7), OPEN_FOUR)
+        self.row("OXXX..")
+        self.assertEqual(self.horizontal(7), FOUR)
+
+    def test_open_and_closed_three(self):
+        self.row("..XX...")
+        self.assertEqual(self.horizontal(7), OPEN_THREE)
+        self.row("OXX....", start=4)
+        self.assertEqual(self.horizontal(7), THREE)
+
+    def test_twos_and_blocked_lines(self):
+        self.row("..X....")
+        self.assertEqual(self.horizontal(6), OPEN_TWO)
+        self.row("O.X.O", start=4)
+        self.assertEqual(self.horizontal(7), NONE)
+        # Against the edge a two can only grow into a closed four
+        self.board[2][0] = 'X'
+        self.assertEqual(self.evaluator.threats(self.board, 1, 2, 'X')[0], TWO)
+
+    def test_block_scores_above_quiet_move(self):
+        self.row("OOOO.")
+        self.assertGreater(self.evaluator.score_move(self.board, 7, 7, 'X'), self.evaluator.score_move(self.board, 0, 0, 'X'))
+
+    def test_open_three_beats_closed_three(self):
+        # The window counter scores these alike; the tables tell them apart
+        self.row("OXX..", y=3, start=0)
+        self.row("..XX..", y=9, start=3)
+        closed = self.evaluator.score_move(self.board, 3, 3, 'X')
+        opened = self.evaluator.score_move(self.board, 7, 9, 'X')
+        self.assertGreater(opened, closed)
+
+    def test_cell_score_is_colour_independent(self):
+        board = evaluation.board_from_moves([(7, 7), (8, 8), (6, 7), (5, 9), (8, 7)])
+        score = self.evaluator.score_cell(board, 9, 7)
+        swapped = [[{'X': 'O', 'O': 'X'}.get(c, c) for c in row] for row in board]
+        self.assertEqual(score, self.evaluator.score_cell(swapped, 9, 7))
+
+    def test_scores_follow_the_score_lists(self):
+        # The cached table holds threat classes only, so edited score lists apply on the next load
+        attack = [score * 2 for score in ATTACK_SCORES]
+        move_scores, _ = score_tables(self.evaluator.threat_table, attack, DEFENCE_SCORES)
+        self.row("XXX.")
+        code = self.evaluator.line_code(self.board, 6, 7, 1, 0, 'X')
+        self.assertEqual(move_scores[code] - self.evaluator.move_scores[code], ATTACK_SCORES[OPEN_FOUR])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import os
+import socket
+import tempfile
+import unittest
+from engine import evaluation
+from engine.protocol import EngineClient, EngineServer, remove_stale_socket, serve
+
+class TestEngineServer(unittest.TestCase):
+    def test_turn_replies_with_a_legal_move(self):
+        server = EngineServer()
+        self.assertEqual(server.handle("START 15"), "OK")
+        x, y = (int(v) for v in server.handle("TURN 7,7").split(","))
+        self.assertEqual(server.board[7][7], 'X')
+        self.assertEqual(server.board[y][x], 'O')
+
+    def test_board_blocks_an_open_four(self):
+        server = EngineServer()
+        server.handle("START 15")
+        self.assertIsNone(server.handle("BOARD"))
+        for line in ("7,7,2", "0,0,1", "8,7,2", "0,2,1", "9,7,2", "0,4,1", "10,7,2"):
+            self.assertIsNone(server.handle(line))
+        self.assertIn(server.handle("DONE"), ("6,7", "11,7"))
+
+    def test_table_stays_warm_across_games(self):
+        server = EngineServer()
+        server.handle("START 15")
+        server.handle("TURN 7,7")
+        server.handle("RESTART")
+        server.handle("TURN 7,7")
+        self.assertEqual(server.searcher.misses, 1)
+
+    def test_errors_and_unknown_commands(self):
+        server = EngineServer()
+        self.assertTrue(server.handle("START 19").startswith("ERROR"))
+        self.assertTrue(server.handle("TURN 99,1").startswith("ERROR"))
+        self.assertEqual(server.handle("FOO"), "UNKNOWN FOO")
+
+    def test_serve_stops_at_end(self):
+        out = io.StringIO()
+        serve(None, io.StringIO("START 15\nINFO timeout_turn 1000\nEND\nABOUT\n"), out)
+        self.assertEqual(out.getvalue(), "OK\n")
+
+class TestEngineClient(unittest.TestCase):
+    def test_drives_engine_process(self):
+        client = EngineClient()
+        try:
+            client.start()
+            moves = [(7, 7)]
+            moves.append(client.best_move(moves))
+            moves.append((3, 3))
+            moves.append(client.best_move(moves)) # incremental TURN
+            board = evaluation.board_from_moves(moves)
+            self.assertEqual(sum(cell != ' ' for row in board for cell in row), 4)
+            moves.pop() # undo forces a full BOARD
+            moves.append(client.best_move(moves))
+            self.assertEqual(len(set(moves)), 4)
+        finally:
+            client.close()
+
+    def test_recovers_after_an_error(self):
+        client = EngineClient()
+        try:
+            client.start()
+            moves = [(7, 7)]
+            moves.append(client.best_move(moves))
+            with self.assertRaises(RuntimeError):
+                client.best_move(moves + [(7, 7)]) # occupied
+            moves.append((3, 3))
+            self.assertNotIn(client.best_move(moves), moves) # resynchronised with a full BOARD
+        finally:
+            client.close()
+
+    def test_stale_socket_is_removed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "engine.sock")
+            live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            live.bind(path)
+            live.listen(1)
+            with self.assertRaises(OSError):
+                remove_stale_socket(path)
+            live.close() # the file outlives the server
+            remove_stale_socket(path)
+            self.assertFalse(os.path.exists(path))
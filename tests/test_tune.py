@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from constants import GRID_SIZE
+from engine import evaluation
+from tools import tune
+
+def python_counts(board, mover):
+    """Reference feature counts: every on-board 5-window, by own/opponent stones."""
+    opponent = 'O' if mover == 'X' else 'X'
+    counts = dict.fromkeys(tune.FEATURES, 0)
+    for y in range(GRID_SIZE):
+        for x in range(GRID_SIZE):
+            for dx, dy in evaluation.DIRECTIONS:
+                ex, ey = x + dx * 4, y + dy * 4
+                if not (0 <= ex < GRID_SIZE and 0 <= ey < GRID_SIZE):
+                    continue
+                window = [board[y + dy * i][x + dx * i] for i in range(5)]
+                own, opp = window.count(mover), window.count(opponent)
+                if own and not opp:
+                    counts[f'own_{own}'] += 1
+                elif opp and not own:
+                    counts[f'opp_{opp}'] += 1
+    return [counts[name] for name in tune.FEATURES]
+
+@unittest.skipIf(tune.np is None, "NumPy is not installed")
+class TestTune(unittest.TestCase):
+    moves = [(7, 7), (8, 8), (6, 7), (5, 9), (8, 7), (0, 14), (9, 7), (14, 0)]
+
+    def test_features_match_python_reference(self):
+        # The chunk buffers are reused, so consume each one before asking for the next
+        chunks = [(tune.extract_features(boards), labels.copy())
+                  for boards, labels in tune.iter_chunks([(self.moves, 0)], chunk_size=3)]
+        self.assertEqual([len(labels) for _, labels in chunks], [3, 3, 2])
+        features = tune.np.vstack([features for features, _ in chunks])
+        for ply in range(len(self.moves)):
+            board = evaluation.board_from_moves(self.moves[:ply])
+            self.assertEqual(features[ply].tolist(), python_counts(board, ['X', 'O'][ply % 2]))
+        labels = tune.np.concatenate([labels for _, labels in chunks])
+        self.assertEqual(labels.tolist(), [1, 0] * 4)
+
+    def test_writes_weights_the_evaluator_loads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "games.jsonl")
+            with open(archive, "w") as f:
+                for winner in (0, 1, 0, None):
+                    f.write(json.dumps({'history': self.moves, 'winner': winner}) + "\n")
+            spooled = os.path.join(tmp, "features.bin")
+            self.assertEqual(tune.spool([tmp], spooled, 5), 4 * len(self.moves))
+            coefficients, _, loss = tune.fit(spooled, 5)
+            self.assertLess(loss, 0.7)
+            weights = tune.to_weights(coefficients)
+            path = os.path.join(tmp, "weights.json")
+            with open(path, "w") as f:
+                json.dump(weights, f)
+            self.assertEqual(evaluation.load_weights(path), weights)
+
+    def test_tuned_weights_keep_their_order(self):
+        # A fit that values threes above blocking a four
+        coefficients = {'opp_2': 5.0, 'opp_3': 4.0, 'opp_4': 0.0, 'own_2': 0.5, 'own_3': 1.0, 'own_4': 0.1}
+        weights = tune.to_weights(coefficients)
+        evaluation.check_weights(weights)
+        self.assertGreater(weights['three'], weights['block_three'])
+
+class TestLoadWeights(unittest.TestCase):
+    def test_missing_file_uses_hand_weights(self):
+        self.assertEqual(evaluation.load_weights("/nonexistent/weights.json"), evaluation.HAND_WEIGHTS)
+
+    def write(self, content: str) -> str:
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_bad_files_fall_back_to_hand_weights(self):
+        for content in ('{"five": 1}', '{"three": ', '[1, 2]', '{"three": 2000000}'):
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(evaluation.load_weights(self.write(content)), evaluation.HAND_WEIGHTS)
+
+if __name__ == '__main__':
+    unittest.main()
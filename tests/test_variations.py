@@ -0,0 +1,93 @@
+import unittest
+import pygame as pg
+from models import GameState
+from variations import VariationTree, ROOT
+
+class TestVariationTree(unittest.TestCase):
+    def test_shared_prefix_and_path(self):
+        tree = VariationTree()
+        tree.play(7, 7)
+        a = tree.play(8, 8)
+        c = tree.play(9, 9)
+        tree.current = a
+        b = tree.play(6, 6)
+        self.assertEqual(len(tree), 5) # root + 4 moves, (7,7) and (8,8) shared
+        self.assertEqual(tree.path_between(b, c), ([b], [c]))
+        self.assertEqual(tree.path_between(c, ROOT), ([c, a, a - 1], []))
+        self.assertEqual(tree.line(), [(7, 7), (8, 8), (6, 6)])
+
+    def test_replaying_a_move_reuses_its_node(self):
+        tree = VariationTree()
+        first = tree.play(7, 7)
+        tree.current = ROOT
+        self.assertEqual(tree.play(7, 7), first)
+        self.assertEqual(len(tree), 2)
+
+    def test_hash_matches_transposed_order(self):
+        tree = VariationTree()
+        tree.play(1, 1); tree.play(2, 2); end_a = tree.play(3, 3)
+        tree.current = ROOT
+        tree.play(3, 3); tree.play(2, 2); end_b = tree.play(1, 1)
+        self.assertEqual(tree.keys[end_a], tree.keys[end_b])
+
+class TestGameStateVariations(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+        cls.img = pg.Surface((20, 20))
+
+    def setUp(self):
+        self.state = GameState()
+
+    def play(self, *moves):
+        for x, y in moves:
+            self.assertTrue(self.state.place_stone(x, y, self.img))
+
+    def test_new_move_after_undo_keeps_old_line(self):
+        self.play((7, 7), (8, 8), (9, 9))
+        self.state.undo()
+        self.play((6, 6))
+        self.assertTrue(self.state.switch_variation(-1))
+        self.assertEqual(self.state.get_move_list(), [(7, 7), (8, 8), (9, 9)])
+        self.assertEqual(self.state.board[6][6], ' ')
+        self.assertEqual(self.state.board[9][9], 'X')
+        self.assertEqual(self.state.current_turn, 1)
+
+    def test_goto_selects_the_new_line(self):
+        self.play((7, 7), (8, 8), (9, 9), (10, 10))
+        deep = self.state.tree.current
+        self.state.goto_node(1) # back to (7, 7)
+        self.play((6, 6), (5, 5))
+        self.state.goto_node(deep)
+        self.state.goto_node(ROOT)
+        while self.state.step_forward():
+            pass
+        self.assertEqual(self.state.get_move_list(), [(7, 7), (8, 8), (9, 9), (10, 10)])
+
+    def test_goto_restores_win(self):
+        self.play((0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1), (3, 0), (3, 1), (4, 0))
+        self.assertEqual(self.state.winner, 0)
+        end = self.state.tree.current
+        self.state.goto_node(ROOT)
+        self.assertEqual(self.state.history, [])
+        self.assertIsNone(self.state.winner)
+        self.state.goto_node(end)
+        self.assertEqual(self.state.winner, 0)
+        self.assertEqual(len(self.state.history), 9)
+
+    def test_sync_keeps_redo_line(self):
+        self.play((7, 7), (8, 8), (9, 9))
+        self.state.undo()
+        self.state.undo()
+        data = self.state.get_state_data()
+        self.assertEqual(data['undone_history'], [(9, 9), (8, 8)])
+
+        client = GameState()
+        client.sync_from_data(data, self.img, self.img)
+        self.assertTrue(client.redo())
+        self.assertTrue(client.redo())
+        self.assertEqual(client.get_move_list(), [(7, 7), (8, 8), (9, 9)])
+        self.assertEqual(client.board[9][9], 'X')
+
+if __name__ == '__main__':
+    unittest.main()
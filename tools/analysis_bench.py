@@ -0,0 +1,47 @@
+"""Measures how game analysis scales with the number of worker processes.
+
+A long game is analysed once per worker count on the shared pool, after a few
+untimed plies have started the workers (as a second ANALYZE in the GUI would
+find them), reporting positions per second and the speedup over one worker.
+Speedup is bounded by the cores available; the report says how many there are.
+Run from the repository root:
+
+    python -m tools.analysis_bench [--moves 120] [--workers 1,2,4,8] [--budget 0.5] [--record game.json]
+"""
+import argparse
+import json
+import os
+import time
+import log
+from analysis import iter_analysis, load_record, shutdown_pool
+from constants import ANALYSIS_POSITION_BUDGET
+from tools.render_bench import drawn_game
+
+def time_analysis(moves, workers: int, budget: float) -> float:
+    list(iter_analysis(moves[:workers], workers, budget)) # starts the pool; the timed plies stay uncached
+    started = time.perf_counter()
+    list(iter_analysis(moves, workers, budget))
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=120, help="plies of the built-in game to analyse")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--budget", type=float, default=ANALYSIS_POSITION_BUDGET, help="seconds per position")
+    parser.add_argument("--record", help="analyse this saved game record instead")
+    args = parser.parse_args()
+    log.configure(log.OFF)
+
+    moves = load_record(args.record) if args.record else drawn_game()[:args.moves]
+    report = {'positions': len(moves), 'cpus': os.cpu_count(), 'workers': {}}
+    base = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        elapsed = time_analysis(moves, workers, args.budget)
+        rate = len(moves) / elapsed
+        base = base or rate
+        report['workers'][str(workers)] = {'positions_per_sec': round(rate, 1), 'speedup': round(rate / base, 2)}
+    shutdown_pool()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Loopback TCP proxy that injects link faults between a LAN client and host."""
+import socket
+import threading
+from typing import List
+
+class _Link:
+    def __init__(self, downstream: socket.socket, upstream: socket.socket):
+        self.downstream = downstream
+        self.upstream = upstream
+        self.blackholed = False
+
+    def close(self):
+        for sock in (self.downstream, self.upstream):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+class FaultProxy:
+    """Forwards `listen_port` to `target_port` on loopback.
+
+    drop() cuts every current link as if a cable was pulled with both ends noticing;
+    blackhole() keeps the links open but silently discards traffic, which only
+    heartbeats can detect.
+    """
+
+    def __init__(self, listen_port: int, target_port: int, target_host: str = '127.0.0.1'):
+        self.listen_port = listen_port
+        self.target = (target_host, target_port)
+        self.links: List[_Link] = []
+        self.running = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(('127.0.0.1', self.listen_port))
+        self.server.listen(8)
+        self.running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while self.running:
+            try:
+                downstream, _ = self.server.accept()
+                upstream = socket.create_connection(self.target)
+            except OSError:
+                break
+            link = _Link(downstream, upstream)
+            with self._lock:
+                self.links.append(link)
+            threading.Thread(target=self._pump, args=(link, downstream, upstream), daemon=True).start()
+            threading.Thread(target=self._pump, args=(link, upstream, downstream), daemon=True).start()
+
+    def _pump(self, link: _Link, src: socket.socket, dst: socket.socket):
+        try:
+            while True:
+                data = src.recv(65536)
+                if not data:
+                    break
+                if not link.blackholed:
+                    dst.sendall(data)
+        except OSError:
+            pass
+        link.close()
+        with self._lock:
+            if link in self.links:
+                self.links.remove(link)
+
+    def drop(self):
+        with self._lock:
+            links, self.links = self.links, []
+        for link in links:
+            link.close()
+
+    def blackhole(self):
+        with self._lock:
+            for link in self.links:
+                link.blackholed = True
+
+    def stop(self):
+        self.running = False
+        self.server.close()
+        self.drop()
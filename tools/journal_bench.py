@@ -0,0 +1,90 @@
+"""Measures the host journal: per-move write overhead and recovery time.
+
+A full game is played into a journal in a temporary directory, once with
+group commit and once with an fsync per record, timing the cost each move adds
+on the caller's thread. Recovery (snapshot load plus tail replay) is then timed
+for journals cut at several points between snapshots. Run from the repository root:
+
+    python -m tools.journal_bench [--moves 225] [--interval 0.05] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+import pygame as pg
+import log
+from journal import Journal
+from models import GameState
+from tools.render_bench import drawn_game
+
+def stones() -> List[pg.Surface]:
+    return [pg.Surface((1, 1)), pg.Surface((1, 1))]
+
+def write_game(path: str, moves: List[List[int]], interval: float, snapshot_every: int) -> dict:
+    """Plays `moves` into a fresh journal at `path`; returns per-move overhead and commit counts."""
+    state = GameState()
+    images = stones()
+    journal = Journal(path, commit_interval=interval, snapshot_every=snapshot_every)
+    journal.attach(state)
+    journal.flush()
+    # Moves are applied here and journaled explicitly, so only the journal's share is timed
+    state.journal = None
+    samples = []
+    started = time.perf_counter()
+    for x, y in moves:
+        state.place_stone(x, y, images[state.current_turn])
+        before = time.perf_counter()
+        journal.place(x, y)
+        samples.append(time.perf_counter() - before)
+    journal.flush()
+    elapsed = time.perf_counter() - started
+    journal.detach(discard=False)
+    ordered = sorted(samples)
+    return {
+        'moves': len(moves),
+        'mean_us': round(statistics.mean(samples) * 1e6, 1),
+        'p99_us': round(ordered[int(len(ordered) * 0.99)] * 1e6, 1),
+        'commits': journal.commits,
+        'records_per_commit': round(journal.committed / journal.commits, 1),
+        'total_ms': round(elapsed * 1000, 1)
+    }
+
+def recover(path: str, runs: int) -> dict:
+    times, stats = [], None
+    for _ in range(runs):
+        stats = Journal(path).load(GameState(), *stones())
+        times.append(stats['seconds'])
+    return {'moves': stats['moves'], 'replayed': stats['replayed'],
+            'median_ms': round(statistics.median(times) * 1000, 3)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=225, help="moves per game (at most 225)")
+    parser.add_argument("--interval", type=float, default=0.05, help="group commit interval in seconds")
+    parser.add_argument("--snapshot-every", type=int, default=64, help="records between snapshots")
+    parser.add_argument("--runs", type=int, default=5, help="recoveries timed per journal")
+    args = parser.parse_args()
+    log.configure(log.OFF)
+
+    moves = drawn_game()[:args.moves]
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "host.journal")
+        report['fsync_per_move'] = write_game(path, moves, 0, args.snapshot_every)
+        report['group_commit'] = write_game(path, moves, args.interval, args.snapshot_every)
+
+        # Replay length grows from 0 to snapshot_every - 1 records between snapshots
+        recovery = {}
+        for count in sorted({args.snapshot_every, args.snapshot_every + args.snapshot_every // 2,
+                             args.moves - 1, args.moves}):
+            if 0 < count <= args.moves:
+                write_game(path, moves[:count], args.interval, args.snapshot_every)
+                recovery[str(count)] = recover(path, args.runs)
+        report['recovery'] = recovery
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
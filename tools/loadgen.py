@@ -0,0 +1,155 @@
+"""Headless load generator for the LAN protocol over loopback.
+
+Starts N host/client pairs of real NetworkManagers (the protocol is one client
+per host, so each pair gets its own port). Both sides play random legal games
+through the normal game callbacks, and the run ends with a JSON report of
+throughput, move round-trip latency, CPU use and lost or garbled frames.
+When the time is up the players stop moving and the frames still in flight
+are given DRAIN_SECONDS to arrive, so only frames that never arrive count as dropped:
+
+    python -m tools.loadgen --pairs 20 --duration 10
+"""
+import argparse
+import json
+import random
+import resource
+import threading
+import time
+import pygame as pg
+import log
+import metrics
+from constants import GRID_SIZE, MODE_LAN, PLAYER_BLACK, PLAYER_WHITE, STATE_PLAYING
+from game.network_callbacks import on_connection_established, on_remote_data_received
+from models import GameState
+from network import NetworkManager
+
+DRAIN_SECONDS = 2.0
+
+class HeadlessPlayer:
+    """The parts of GobangGame the network callbacks touch, without a window."""
+
+    def __init__(self, port: int, color: int, stone_img: pg.Surface):
+        self.state = GameState()
+        self.state.game_mode = MODE_LAN
+        self.state.game_state = STATE_PLAYING
+        self.state.player_color = color
+        self.black_img = self.white_img = stone_img
+        self.network_manager = NetworkManager(port=port)
+        self.network_manager.on_data_received = self.on_data
+        self.lock = threading.Lock()
+        self.move_sent_at = 0.0
+        self.rtts = []
+        self.draining = False # set at the end of the run: apply what arrives, start no new moves
+
+    def random_move(self):
+        empty = [(x, y) for y in range(GRID_SIZE) for x in range(GRID_SIZE) if self.state.board[y][x] == ' ']
+        return random.choice(empty)
+
+    def on_data(self, data: dict):
+        with self.lock:
+            on_remote_data_received(self, data)
+            if self.draining:
+                return
+            if self.network_manager.is_host:
+                self.host_turn()
+            elif data.get('type') == 'sync_state':
+                self.client_turn()
+
+    def host_turn(self):
+        # Finished games restart straight away, like pressing RESTART
+        while True:
+            if self.state.winner is not None or len(self.state.history) == GRID_SIZE * GRID_SIZE:
+                self.state.reset()
+            if self.state.current_turn != PLAYER_BLACK:
+                return
+            x, y = self.random_move()
+            self.state.place_stone(x, y, self.black_img)
+            self.network_manager.send_data({'type': 'sync_state', 'state': self.state.get_state_data()})
+            if self.state.winner is None:
+                return
+
+    def client_turn(self):
+        if self.move_sent_at and len(self.state.history) % 2 == 0:
+            # The host's sync now includes our move: one round trip
+            self.rtts.append(time.perf_counter() - self.move_sent_at)
+            self.move_sent_at = 0.0
+        if self.state.current_turn == PLAYER_WHITE and self.state.winner is None:
+            x, y = self.random_move()
+            if self.state.place_stone(x, y, self.white_img):
+                self.move_sent_at = time.perf_counter()
+                self.network_manager.send_data({'type': 'move', 'x': x, 'y': y})
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run(pairs: int, duration: float, base_port: int) -> dict:
+    stone_img = pg.Surface((1, 1))
+    hosts, clients = [], []
+    for i in range(pairs):
+        host = HeadlessPlayer(base_port + i, PLAYER_BLACK, stone_img)
+        host.network_manager.on_connection_established = lambda host=host: (on_connection_established(host), host.host_turn())
+        host.network_manager.start_server()
+        client = HeadlessPlayer(base_port + i, PLAYER_WHITE, stone_img)
+        hosts.append(host)
+        clients.append(client)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    for client in clients:
+        client.network_manager.connect_to_server('127.0.0.1')
+    time.sleep(duration)
+    for player in hosts + clients:
+        with player.lock:
+            player.draining = True
+    elapsed = time.perf_counter() - started
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    # Let the frames in flight land (a host still answers a late move with one sync)
+    def delivered():
+        return all(host.network_manager.send_seq == client.network_manager.last_received_seq and
+                   client.network_manager.send_seq == host.network_manager.last_received_seq
+                   for host, client in zip(hosts, clients))
+    deadline = time.perf_counter() + DRAIN_SECONDS
+    while not delivered() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    for player in hosts + clients:
+        player.network_manager.running = False # freeze counters; what has not arrived by now counts as dropped
+
+    sent = sum(p.network_manager.send_seq for p in hosts + clients)
+    received = sum(p.network_manager.last_received_seq for p in hosts + clients)
+    rtts = [rtt for client in clients for rtt in client.rtts]
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    for player in hosts + clients:
+        player.network_manager.stop()
+
+    return {
+        'pairs': pairs,
+        'duration_s': round(elapsed, 2),
+        'messages': sent,
+        'messages_per_sec': round(received / elapsed, 1),
+        'moves_per_sec': round(len(rtts) / elapsed, 1),
+        'rtt_p50_ms': round(percentile(rtts, 0.5) * 1000, 2) if rtts else None,
+        'rtt_p99_ms': round(percentile(rtts, 0.99) * 1000, 2) if rtts else None,
+        'cpu_percent': round(100 * cpu / elapsed, 1),
+        'dropped_frames': sent - received,
+        'garbled_frames': sum(p.network_manager.frames_garbled for p in hosts + clients)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--base-port", type=int, default=6000)
+    args = parser.parse_args()
+
+    # The game callbacks log connection events; keep the report readable
+    log.configure(log.OFF)
+    metrics.start_from_env()
+    report = run(args.pairs, args.duration, args.base_port)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measures the per-call overhead of driving the engine through the protocol.
+
+ABOUT round trips give the bare transport cost. TURN round trips are timed over
+the same games on an in-process EngineServer and on each transport: the engines
+are seeded alike and start with empty tables, so every TURN meets the same
+position and search on both sides, and the per-call difference is what the
+process boundary adds to each CPU move. Both pipes and a Unix socket are
+measured. Run from the repository root:
+
+    python -m tools.protocol_bench [--calls 2000] [--games 20]
+"""
+import argparse
+import json
+import os
+import random
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from constants import GRID_SIZE
+from engine.protocol import EngineClient, EngineServer
+
+def summary(samples):
+    samples = sorted(samples)
+    return {
+        'median_us': round(statistics.median(samples) * 1e6, 1),
+        'p99_us': round(samples[int(len(samples) * 0.99)] * 1e6, 1)
+    }
+
+def game_turns(rng: random.Random):
+    """Opponent moves for one game: random empty cells, fed one TURN at a time."""
+    cells = [(x, y) for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+    rng.shuffle(cells)
+    return cells
+
+def time_turns(request, games: int, seed: int):
+    """Plays `games` games against `request` (line -> reply); returns (per-TURN latencies, replies)."""
+    rng = random.Random(seed)
+    samples, replies = [], []
+    for _ in range(games):
+        request("RESTART")
+        taken = set()
+        for x, y in game_turns(rng):
+            if (x, y) in taken:
+                continue
+            if len(taken) + 2 > GRID_SIZE * GRID_SIZE // 2:
+                break
+            started = time.perf_counter()
+            reply = request(f"TURN {x},{y}")
+            samples.append(time.perf_counter() - started)
+            replies.append(reply)
+            taken.add((x, y))
+            taken.add(tuple(int(v) for v in reply.split(",")))
+    return samples, replies
+
+def time_client(client: EngineClient, calls: int, games: int, seed: int, baseline) -> dict:
+    """Transport timings; `baseline` is the in-process (samples, replies) for the same games."""
+    client.start()
+    about = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        client.request("ABOUT")
+        about.append(time.perf_counter() - started)
+    samples, replies = time_turns(client.request, games, seed)
+    if replies != baseline[1]:
+        raise RuntimeError("the engine process played differently from the in-process engine; is it seeded?")
+    return {
+        'about': summary(about),
+        'turn': summary(samples),
+        # Paired per call, so search cost and table state cancel out
+        'turn_overhead_us': round(statistics.median(t - b for t, b in zip(samples, baseline[0])) * 1e6, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="ABOUT round trips per transport")
+    parser.add_argument("--games", type=int, default=20, help="games of TURN round trips per transport")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = [sys.executable, "-m", "engine", "--seed", str(args.seed)]
+    random.seed(args.seed)
+    server = EngineServer()
+    server.handle(f"START {GRID_SIZE}")
+    baseline = time_turns(server.handle, args.games, args.seed)
+    report = {'in_process': {'turn': summary(baseline[0])}}
+
+    client = EngineClient(shlex.join(engine))
+    report['pipe'] = time_client(client, args.calls, args.games, args.seed, baseline)
+    client.close()
+
+    path = os.path.join(tempfile.mkdtemp(), "engine.sock")
+    process = subprocess.Popen(engine + ["--socket", path])
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    client = EngineClient(socket_path=path)
+    report['unix_socket'] = time_client(client, args.calls, args.games, args.seed, baseline)
+    client.close()
+    process.terminate()
+    process.wait()
+    if os.path.exists(path):
+        os.unlink(path)
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
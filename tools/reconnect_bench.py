@@ -0,0 +1,71 @@
+"""Measures how long a LAN session takes to recover from a dropped or silent link.
+
+A host and a client talk through a FaultProxy on loopback. For each trial a
+fault is injected, a move is sent straight away, and the time until the host's
+reply arrives is recorded. Run from the repository root:
+
+    python -m tools.reconnect_bench [--trials 5]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from network import NetworkManager
+from tools.fault_proxy import FaultProxy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--host-port", type=int, default=5105)
+    parser.add_argument("--proxy-port", type=int, default=5106)
+    args = parser.parse_args()
+
+    host = NetworkManager(port=args.host_port)
+    host.on_data_received = lambda data: host.send_data({'type': 'echo', 'n': data['n']})
+    host.start_server()
+
+    proxy = FaultProxy(args.proxy_port, args.host_port)
+    proxy.start()
+
+    replies = {}
+    reply_event = threading.Condition()
+    def on_reply(data):
+        with reply_event:
+            replies[data['n']] = time.perf_counter()
+            reply_event.notify_all()
+
+    client = NetworkManager(port=args.proxy_port)
+    client.on_data_received = on_reply
+    if not client.connect_to_server('127.0.0.1'):
+        raise SystemExit("client could not connect")
+
+    results = {'drop': [], 'blackhole': []}
+    n = 0
+    for _ in range(args.trials):
+        for mode, inject in (('drop', proxy.drop), ('blackhole', proxy.blackhole)):
+            time.sleep(1.0) # let acks settle so only the new move is outstanding
+            n += 1
+            started = time.perf_counter()
+            inject()
+            client.send_data({'type': 'move', 'n': n})
+            with reply_event:
+                reply_event.wait_for(lambda: n in replies, timeout=client.grace_period)
+            if n in replies:
+                results[mode].append(replies[n] - started)
+
+    report = {}
+    for mode, samples in results.items():
+        report[mode] = {
+            'recovered': f"{len(samples)}/{args.trials}",
+            'median_ms': round(statistics.median(samples) * 1000, 1) if samples else None,
+            'max_ms': round(max(samples) * 1000, 1) if samples else None
+        }
+    report['client_resumes'] = len(client.recoveries)
+    client.stop()
+    host.stop()
+    proxy.stop()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
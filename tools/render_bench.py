@@ -0,0 +1,211 @@
+"""Headless rendering benchmark: replays a recorded session and times every frame.
+
+GobangGame runs with SDL's dummy video driver. A script of input and network
+events is fed through the real event loop (clicks and keys are posted to the
+pygame queue, LAN messages go through the network manager's callback), one
+frame is drawn after every event, and idle frames are drawn where a step asks
+for them. Frame times are reported per screen, together with the time spent in
+draw_gradient, draw_game and Button.draw. Run from the repository root:
+
+    python -m tools.render_bench [--script session.json] [--save session.json] [--idle 120]
+
+A script is a list of steps {"screen": label, "events": [...], "frames": n}.
+Events are {"click": "menu:pvp"} (a button, by group and name), {"cell": [x, y]},
+{"key": "up"}, {"net": {...message...}}, or {"set": {...}} for state that has no
+input path here (the LAN menu and name input, discovered hosts).
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List
+import pygame as pg
+import log
+from constants import (GRID_SIZE, OFFSET, CELL_SIZE, STATE_LAN_MENU, STATE_NAME_INPUT, STATE_PLAYING,
+                       MODE_LAN, PLAYER_WHITE, SCAN_TIMEOUT)
+from game import GobangGame
+
+BUTTON_GROUPS = {
+    'menu': 'menu_buttons',
+    'pvc': 'pvc_config_buttons',
+    'lan': 'lan_menu_buttons',
+    'game': 'buttons',
+    'analysis': 'analysis_buttons'
+}
+
+def drawn_game() -> List[List[int]]:
+    """225 moves that fill the board without five in a row: runs of two in every direction."""
+    black = [[x, y] for y in range(GRID_SIZE) for x in range(GRID_SIZE) if (x + 2 * y) % 4 < 2]
+    white = [[x, y] for y in range(GRID_SIZE) for x in range(GRID_SIZE) if (x + 2 * y) % 4 >= 2]
+    moves = []
+    for i in range(len(black)):
+        moves.append(black[i])
+        if i < len(white):
+            moves.append(white[i])
+    return moves
+
+def default_script(idle: int) -> List[dict]:
+    moves = drawn_game()
+    script = [
+        {'screen': 'menu', 'events': [], 'frames': idle},
+        {'screen': 'pvc_config', 'events': [{'click': 'menu:pvc'}], 'frames': idle},
+        {'screen': 'menu', 'events': [{'click': 'pvc:back'}], 'frames': 0},
+        {'screen': 'lan_menu', 'events': [{'set': {'game_state': STATE_LAN_MENU, 'game_mode': MODE_LAN, 'scan_age': 0}}],
+         'frames': idle},
+        {'screen': 'lan_menu', 'events': [{'set': {'scan_age': SCAN_TIMEOUT, 'hosts': ['192.168.1.20', '192.168.1.21', '192.168.1.22']}}],
+         'frames': idle},
+        {'screen': 'name_input', 'events': [{'set': {'game_state': STATE_NAME_INPUT, 'hosts': []}}]
+         + [{'key': 'down'}] * 3 + [{'key': 'up'}], 'frames': idle},
+        # A full local game, sampled at 0, 100 and 225 stones
+        {'screen': 'menu', 'events': [{'set': {'game_state': 'MENU', 'game_mode': None}}], 'frames': 0},
+        {'screen': 'game_0', 'events': [{'click': 'menu:pvp'}], 'frames': idle},
+        {'screen': 'game_moves', 'events': [{'cell': move} for move in moves[:100]], 'frames': 0},
+        {'screen': 'game_100', 'events': [], 'frames': idle},
+        {'screen': 'game_hint', 'events': [{'click': 'game:hint'}], 'frames': idle},
+        {'screen': 'game_moves', 'events': [{'cell': move} for move in moves[100:]], 'frames': 0},
+        {'screen': 'game_225', 'events': [], 'frames': idle},
+        {'screen': 'undo_redo', 'events': [{'click': 'game:undo'}] * 60 + [{'click': 'game:redo'}] * 60
+         + [{'key': 'left'}] * 30 + [{'key': 'right'}] * 30, 'frames': 0},
+        {'screen': 'menu', 'events': [{'click': 'game:exit'}], 'frames': 0},
+        # A LAN client following the host's authoritative state
+        {'screen': 'lan_sync', 'events': [{'set': {'game_state': STATE_PLAYING, 'game_mode': MODE_LAN,
+                                                   'player_color': PLAYER_WHITE}}]
+         + [{'net': {'type': 'sync_state', 'state': {
+             'history': moves[:n], 'undone_history': [], 'current_turn': n % 2, 'winner': None,
+             'player_names': {'0': 'HOST', '1': 'YOU'}}}} for n in range(1, len(moves) + 1, 2)],
+         'frames': idle},
+    ]
+    return script
+
+class Profiler:
+    """Wraps module-level functions and methods to total their time per frame."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    def wrap(self, owner, name: str, label: str):
+        original = getattr(owner, name)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.seconds[label] += time.perf_counter() - started
+                self.calls[label] += 1
+        setattr(owner, name, timed)
+
+    def report(self) -> dict:
+        return {label: {'calls': self.calls[label],
+                        'total_ms': round(self.seconds[label] * 1000, 1),
+                        'per_call_us': round(self.seconds[label] / self.calls[label] * 1e6, 1)}
+                for label in sorted(self.calls)}
+
+def instrument(profiler: Profiler):
+    # Patch the names the renderers actually call through
+    import ui
+    import renderer.base
+    import renderer.menu_renderer
+    import renderer.analysis_renderer
+    profiler.wrap(renderer.menu_renderer, 'draw_gradient', 'draw_gradient')
+    profiler.wrap(renderer.analysis_renderer, 'draw_gradient', 'draw_gradient')
+    profiler.wrap(renderer.base, 'draw_game', 'draw_game')
+    profiler.wrap(ui.Button, 'draw', 'Button.draw')
+
+def apply(game: GobangGame, event: dict):
+    if 'click' in event:
+        target = event['click']
+        if isinstance(target, str):
+            group, name = target.split(":")
+            pos = getattr(game.renderer, BUTTON_GROUPS[group])[name].rect.center
+        else:
+            pos = tuple(target)
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=pos, button=1))
+    elif 'cell' in event:
+        x, y = event['cell']
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(OFFSET + x * CELL_SIZE, OFFSET + y * CELL_SIZE), button=1))
+    elif 'key' in event:
+        pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.key.key_code(event['key'])))
+    elif 'net' in event:
+        game.network_manager.on_data_received(event['net'])
+    elif 'set' in event:
+        for key, value in event['set'].items():
+            if key == 'scan_age':
+                game.state.scan_start_time = time.time() - value
+            elif key == 'hosts':
+                game.network_manager.found_hosts.clear()
+                for i, ip in enumerate(value):
+                    game.network_manager.found_hosts[ip] = {'name': f"PLAYER {i + 1}", 'room': f"room-{i + 1}",
+                                                            'port': 5005, 'players': 1, 'seen': time.monotonic()}
+            else:
+                setattr(game.state, key, value)
+    game.handle_events()
+
+def run(script: List[dict]) -> dict:
+    game = GobangGame()
+    frames: Dict[str, List[float]] = defaultdict(list)
+    input_seconds = 0.0
+
+    def frame(screen: str):
+        started = time.perf_counter()
+        game.draw_frame()
+        frames[screen].append(time.perf_counter() - started)
+
+    for step in script:
+        for event in step['events']:
+            started = time.perf_counter()
+            apply(game, event)
+            input_seconds += time.perf_counter() - started
+            frame(step['screen'])
+        for _ in range(step['frames']):
+            game.handle_events()
+            frame(step['screen'])
+
+    screens = {}
+    for screen, samples in frames.items():
+        ordered = sorted(samples)
+        screens[screen] = {
+            'frames': len(samples),
+            'median_ms': round(statistics.median(ordered) * 1000, 3),
+            'p95_ms': round(ordered[int(len(ordered) * 0.95)] * 1000, 3),
+            'max_ms': round(ordered[-1] * 1000, 3)
+        }
+    report = {'screens': screens, 'input_handling_ms': round(input_seconds * 1000, 1)}
+    pg.quit()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", help="replay this recorded session (JSON) instead of the built-in one")
+    parser.add_argument("--save", help="write the built-in session to this file and exit")
+    parser.add_argument("--idle", type=int, default=120, help="idle frames per sampled screen")
+    parser.add_argument("--no-breakdown", action="store_true", help="skip per-function timing wrappers")
+    args = parser.parse_args()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(default_script(args.idle), f)
+        return
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+    else:
+        script = default_script(args.idle)
+
+    log.configure(log.OFF)
+    profiler = Profiler()
+    if not args.no_breakdown:
+        instrument(profiler)
+    report = run(script)
+    if not args.no_breakdown:
+        report['functions'] = profiler.report()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Solves a batch of positions with the df-pn solver and reports each result.
+
+Positions are read from JSONL files (or stdin with "-"), one per line, as
+{"moves": [[x, y], ...]} or a saved game record with a "history"; the side to
+move is the attacker unless the line names one with "attacker": "X"/"O". One
+solver serves the whole batch, so repeated positions come from its cache:
+
+    python -m tools.solve puzzles.jsonl [--nodes 100000] [--threes] [--memory-mb 50]
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from constants import DFPN_MAX_NODES, DFPN_TT_SIZE
+from engine.dfpn import DfpnSolver
+from engine.evaluation import board_from_moves
+
+Move = Tuple[int, int]
+
+def iter_positions(paths: Iterable[str]) -> Iterator[Tuple[List[Move], Optional[str]]]:
+    """(moves, attacker or None) for every non-empty line under `paths`."""
+    for path in paths:
+        f = sys.stdin if path == "-" else open(path)
+        try:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    moves = record['moves'] if 'moves' in record else record['history']
+                    yield [tuple(m) for m in moves], record.get('attacker')
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def solve_all(solver: DfpnSolver, positions: Iterable[Tuple[List[Move], Optional[str]]],
+              max_nodes: Optional[int] = None) -> Iterator[dict]:
+    for index, (moves, attacker) in enumerate(positions):
+        attacker = attacker or ['X', 'O'][len(moves) % 2]
+        started = time.perf_counter()
+        solution = solver.solve(board_from_moves(moves), attacker, max_nodes)
+        yield {
+            'index': index,
+            'attacker': attacker,
+            'result': solution.result,
+            'move': solution.move,
+            'nodes': solution.nodes,
+            'cached': solution.cached,
+            'ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="JSONL files of positions, or - for stdin")
+    parser.add_argument("--nodes", type=int, default=DFPN_MAX_NODES, help="node limit per position")
+    parser.add_argument("--entries", type=int, default=DFPN_TT_SIZE, help="proof table entries before collection")
+    parser.add_argument("--memory-mb", type=float, help="bound the proof table by memory instead of entries")
+    parser.add_argument("--threes", action="store_true", help="allow open threes (VCT) as well as fours (VCF)")
+    args = parser.parse_args()
+
+    solver = DfpnSolver(max_nodes=args.nodes, max_entries=args.entries, memory_mb=args.memory_mb,
+                        threes=args.threes)
+    counts = {}
+    started = time.perf_counter()
+    for result in solve_all(solver, iter_positions(args.paths)):
+        counts[result['result']] = counts.get(result['result'], 0) + 1
+        print(json.dumps(result))
+    print(json.dumps({
+        'positions': sum(counts.values()),
+        'results': counts,
+        'nodes': solver.nodes,
+        'cache_hits': solver.solved_hits,
+        'table_entries': len(solver.table),
+        'collections': solver.gcs,
+        'seconds': round(time.perf_counter() - started, 2)
+    }))
+
+if __name__ == "__main__":
+    main()
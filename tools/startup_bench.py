@@ -0,0 +1,53 @@
+"""Cold-start benchmark: time from interpreter start to the first menu frame.
+
+Each run is a fresh process with SDL's dummy video driver, so import and asset
+costs are measured as a player would see them. Run from the repository root:
+
+    python -m tools.startup_bench [--runs 10] [--bundle]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+from game import GobangGame
+t_import = time.perf_counter()
+game = GobangGame()
+t_init = time.perf_counter()
+game.handle_events()
+game.draw_frame()
+t_frame = time.perf_counter()
+import json, sys
+print(json.dumps({'import': t_import - t0, 'init': t_init - t_import,
+                  'first_frame': t_frame - t0, 'modules': len(sys.modules)}))
+"""
+
+def run_once(env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--bundle", action="store_true", help="pack data/assets.bundle before measuring")
+    args = parser.parse_args()
+
+    if args.bundle:
+        subprocess.run([sys.executable, "assets.py"], check=True)
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = [run_once(env) for _ in range(args.runs)]
+    report = {key: round(statistics.median(s[key] for s in samples) * 1000, 2)
+              for key in ("import", "init", "first_frame")}
+    report = {f"{key}_ms": value for key, value in report.items()}
+    report["modules_loaded"] = samples[-1]["modules"]
+    report["runs"] = args.runs
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Engine-vs-engine tournament with Elo estimates and SPRT early stopping.
+
+Two engine configs (see engine.search.create_searcher) play pairs of games from
+balanced random openings, each opening once with either colour. Games run on a
+process pool; after every pair the sequential probability ratio test decides
+whether config A is at least `elo1` better than B (H1) or no better than `elo0` (H0).
+The two games of a pair share their opening, so they are not independent: the
+test and the error bars treat each pair's mean score as one sample.
+A config of the form {"command": "..."} plays through a protocol engine process
+(see engine.protocol), e.g. {"command": "python -m engine"} or an external pbrain.
+Thinking time per move is reported for both sides, so engines with a time budget
+(e.g. {"engine": "mcts", "seconds": 0.2}) can be compared on strength per second.
+
+    python -m tools.tournament --a '{"weights": {"three": 12000}}' --games 2000
+    python -m tools.tournament --a '{"engine": "mcts", "seconds": 0.2}' --games 200
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Optional, Tuple
+from constants import GRID_SIZE
+from engine import zobrist
+from engine.evaluation import evaluate_position
+from engine.search import Searcher, create_searcher
+from engine.protocol import shared_client
+
+Move = Tuple[int, int]
+
+BALANCE_LIMIT = 2000 # |evaluate_position| an opening may have
+WIN_LINES = [(1, 0), (0, 1), (1, 1), (1, -1)]
+PAIR_VAR_FLOOR = 0.01 # per-pair variance floor, so all-win or all-loss runs still reach a decision
+
+def make_opening(rng: random.Random, stones: int = 3) -> List[Move]:
+    """Random stones near the centre, retried until neither side is clearly ahead."""
+    centre = GRID_SIZE // 2
+    while True:
+        moves = [(centre, centre)]
+        while len(moves) < stones:
+            move = (centre + rng.randint(-2, 2), centre + rng.randint(-2, 2))
+            if move not in moves:
+                moves.append(move)
+        board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+        for i, (x, y) in enumerate(moves):
+            board[y][x] = ['X', 'O'][i % 2]
+        if abs(evaluate_position(board)) <= BALANCE_LIMIT:
+            return moves
+
+def is_five(board: List[List[str]], x: int, y: int) -> bool:
+    char = board[y][x]
+    for dx, dy in WIN_LINES:
+        count = 1
+        for sign in (1, -1):
+            nx, ny = x + dx * sign, y + dy * sign
+            while 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and board[ny][nx] == char:
+                count += 1
+                nx, ny = nx + dx * sign, ny + dy * sign
+        if count >= 5:
+            return True
+    return False
+
+def play_game(black: dict, white: dict, opening: List[Move], seed: int) -> Tuple[Optional[int], List[float], List[int]]:
+    """Plays one game; returns (0 if Black wins, 1 if White wins, None for a draw; thinking seconds
+    and moves chosen per side)."""
+    rng = random.Random(seed)
+    thinking, chosen = [0.0, 0.0], [0, 0]
+    searchers = [None if 'command' in config else create_searcher(config) for config in (black, white)]
+    played: List[Move] = []
+    board = [[' '] * GRID_SIZE for _ in range(GRID_SIZE)]
+    key = 0
+    last_move = None
+    for ply in range(GRID_SIZE * GRID_SIZE):
+        side = ply % 2
+        char = ['X', 'O'][side]
+        if ply < len(opening):
+            x, y = opening[ply]
+        else:
+            started = time.perf_counter()
+            if searchers[side] is None:
+                x, y = shared_client((black, white)[side]['command']).best_move(played)
+            else:
+                _, moves = searchers[side].best_moves(board, key, last_move)
+                x, y = rng.choice(moves)
+            thinking[side] += time.perf_counter() - started
+            chosen[side] += 1
+        board[y][x] = char
+        key = zobrist.toggle(key, x, y, char)
+        last_move = (x, y)
+        played.append(last_move)
+        if is_five(board, x, y):
+            return side, thinking, chosen
+        # Keep both tables one ply behind so every grid is derived incrementally
+        if isinstance(searchers[1 - side], Searcher):
+            searchers[1 - side].score_grid(board, key, last_move)
+    return None, thinking, chosen
+
+def play_pair(config_a: dict, config_b: dict, opening: List[Move], seed: int) -> Tuple[List[float], List[float], List[int]]:
+    """A plays Black then White from the same opening; returns (A's two scores, [A, B] thinking seconds, [A, B] moves)."""
+    first, first_time, first_moves = play_game(config_a, config_b, opening, seed)
+    second, second_time, second_moves = play_game(config_b, config_a, opening, seed + 1)
+    scores = [0.5 if first is None else float(first == 0), 0.5 if second is None else float(second == 1)]
+    return (scores, [first_time[0] + second_time[1], first_time[1] + second_time[0]],
+            [first_moves[0] + second_moves[1], first_moves[1] + second_moves[0]])
+
+def elo_from_score(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+def score_from_elo(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def summarise(scores: List[float]) -> Tuple[float, float, float]:
+    """(mean, per-sample variance, standard error) of A's scores."""
+    n = len(scores)
+    mean = sum(scores) / n
+    var = sum((s - mean) ** 2 for s in scores) / n
+    return mean, var, math.sqrt(var / n)
+
+def sprt_llr(pairs: List[float], elo0: float, elo1: float) -> float:
+    """Generalised SPRT log-likelihood ratio under a normal approximation, over per-pair mean scores.
+
+    The variance is floored at PAIR_VAR_FLOOR: with none, a run where A wins (or
+    loses) every pair would have zero variance and never cross a bound.
+    """
+    mean, var, _ = summarise(pairs)
+    var = max(var, PAIR_VAR_FLOOR)
+    s0, s1 = score_from_elo(elo0), score_from_elo(elo1)
+    return len(pairs) * (s1 - s0) * (2 * mean - s0 - s1) / (2 * var)
+
+def report(scores: List[float], pairs: List[float], llr: float, bounds: Tuple[float, float], decision: str,
+           elapsed: float, workers: int, thinking: List[float], moves: List[int]) -> dict:
+    mean, var, _ = summarise(pairs)
+    stderr = math.sqrt(max(var, PAIR_VAR_FLOOR) / len(pairs)) # floored as in sprt_llr
+    elo = elo_from_score(mean)
+    return {
+        'games': len(scores),
+        'wins': scores.count(1.0),
+        'draws': scores.count(0.5),
+        'losses': scores.count(0.0),
+        'score': round(mean, 4),
+        'elo': round(elo, 1),
+        'elo_95': [round(elo_from_score(mean - 1.96 * stderr), 1), round(elo_from_score(mean + 1.96 * stderr), 1)],
+        'llr': round(llr, 3),
+        'llr_bounds': [round(bounds[0], 3), round(bounds[1], 3)],
+        'sprt': decision,
+        'games_per_sec_per_core': round(len(scores) / elapsed / workers, 2),
+        'ms_per_move': {side: round(thinking[i] / max(1, moves[i]) * 1000, 2) for i, side in enumerate('ab')}
+    }
+
+def run(config_a: dict, config_b: dict, games: int, workers: int, elo0: float, elo1: float,
+        alpha: float, beta: float, seed: int) -> dict:
+    if games < 2:
+        raise ValueError("games are played in pairs, so at least 2 are needed")
+    rng = random.Random(seed)
+    lower, upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    scores: List[float] = []
+    pairs: List[float] = []
+    thinking, moves = [0.0, 0.0], [0, 0]
+    llr = 0.0
+    decision = 'inconclusive'
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        submitted = 0
+        # Keep the pool a little over-subscribed rather than queueing every game up front
+        while submitted < games // 2 or pending:
+            while submitted < games // 2 and len(pending) < workers * 4:
+                pending.add(pool.submit(play_pair, config_a, config_b, make_opening(rng), rng.getrandbits(32)))
+                submitted += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pair_scores, pair_thinking, pair_moves = future.result()
+                scores.extend(pair_scores)
+                pairs.append(sum(pair_scores) / 2)
+                for i in range(2):
+                    thinking[i] += pair_thinking[i]
+                    moves[i] += pair_moves[i]
+            llr = sprt_llr(pairs, elo0, elo1)
+            if llr >= upper or llr <= lower:
+                decision = 'H1 accepted (A stronger)' if llr >= upper else 'H0 accepted (no gain)'
+                for future in pending:
+                    future.cancel()
+                break
+
+    return report(scores, pairs, llr, (lower, upper), decision, time.perf_counter() - started, workers, thinking, moves)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--a", default="{}", help="engine config under test (JSON)")
+    parser.add_argument("--b", default="{}", help="baseline engine config (JSON)")
+    parser.add_argument("--games", type=int, default=2000, help="maximum games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=20.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.games < 2:
+        parser.error("--games must be at least 2 (games are played in pairs)")
+
+    result = run(json.loads(args.a), json.loads(args.b), args.games, args.workers,
+                 args.elo0, args.elo1, args.alpha, args.beta, args.seed)
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Fits the window-evaluation weights to game outcomes by logistic regression.
+
+Positions are streamed from saved game records (`get_state_data` dumps as .json
+files, or one record per line in .jsonl archives) and batched into fixed-size
+NumPy chunks. Each position is described by the open 5-windows on the board
+holding 1-4 of the mover's stones and 1-4 of the opponent's, counted for the
+whole chunk at once, and a logistic model of "the mover wins" is fitted on them
+by Newton's method. Features are spooled to a memory-mapped file under the cache
+directory and every Newton step reads it back chunk by chunk, so memory stays
+bounded by the chunk size however large the archive is.
+
+`evaluate_move` scores a cell by the windows through it, so each move weight is
+the fitted value a stone there adds: turning one of our k-windows into a
+(k+1)-window, or wiping out one of the opponent's. `four` completes five, which
+the model never sees, so it stays hand-picked.
+Needs NumPy (not a game dependency):
+
+    python -m tools.tune games/*.jsonl [--out data/weights.json]
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from constants import GRID_SIZE, WEIGHTS_FILE, CACHE_DIR
+from engine.evaluation import DIRECTIONS, HAND_WEIGHTS, LESSER_WEIGHTS, WINDOWS_PER_CELL, check_weights
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OWN = ['own_1', 'own_2', 'own_3', 'own_4']
+OPP = ['opp_1', 'opp_2', 'opp_3', 'opp_4']
+FEATURES = OWN + OPP
+EDGE = 2 # padding value outside the board
+PAD = 4
+RECORD = None if np is None else np.dtype([('x', np.int16, len(FEATURES)), ('y', np.float32)])
+
+Move = Tuple[int, int]
+
+def iter_records(paths: Iterable[str]) -> Iterator[Tuple[List[Move], Optional[int]]]:
+    """(moves, winner) for every record under `paths`; directories are searched recursively."""
+    for path in paths:
+        if os.path.isdir(path):
+            found = glob.glob(os.path.join(path, "**", "*.json*"), recursive=True)
+            yield from iter_records(sorted(found))
+        elif path.endswith(".jsonl"):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield [tuple(m) for m in record['history']], record.get('winner')
+        else:
+            with open(path) as f:
+                record = json.load(f)
+            yield [tuple(m) for m in record['history']], record.get('winner')
+
+def iter_chunks(records: Iterable[Tuple[List[Move], Optional[int]]], chunk_size: int):
+    """Yields (boards, labels) arrays of at most `chunk_size` positions.
+
+    One position per ply, before the move: boards are flat and seen from the
+    mover's side (1 own, -1 opponent, 0 empty), labels 1/0.5/0 for win/draw/loss.
+    The buffers are reused between chunks.
+    """
+    boards = np.zeros((chunk_size, GRID_SIZE * GRID_SIZE), dtype=np.int8)
+    labels = np.zeros(chunk_size, dtype=np.float32)
+    filled = 0
+    for moves, winner in records:
+        colours = np.array([1 if ply % 2 == 0 else -1 for ply in range(len(moves))], dtype=np.int8)
+        # Row p holds the stones placed before ply p, Black = 1
+        game = np.zeros((len(moves), GRID_SIZE * GRID_SIZE), dtype=np.int8)
+        for ply, (x, y) in enumerate(moves[:-1]):
+            game[ply + 1:, y * GRID_SIZE + x] = colours[ply]
+        game *= colours[:, None]
+        if winner is None:
+            outcome = np.full(len(moves), 0.5, dtype=np.float32)
+        else:
+            outcome = (np.arange(len(moves)) % 2 == winner).astype(np.float32)
+
+        start = 0
+        while start < len(moves):
+            take = min(len(moves) - start, chunk_size - filled)
+            boards[filled:filled + take] = game[start:start + take]
+            labels[filled:filled + take] = outcome[start:start + take]
+            filled += take
+            start += take
+            if filled == chunk_size:
+                yield boards, labels
+                filled = 0
+    if filled:
+        yield boards[:filled], labels[:filled]
+
+def extract_features(boards):
+    """(n, 8) counts of open windows with 1-4 own / opponent stones, in FEATURES order."""
+    n = len(boards)
+    size = GRID_SIZE + 2 * PAD
+    padded = np.full((n, size, size), EDGE, dtype=np.int8)
+    padded[:, PAD:PAD + GRID_SIZE, PAD:PAD + GRID_SIZE] = boards.reshape(n, GRID_SIZE, GRID_SIZE)
+
+    counts = np.zeros((n, len(FEATURES)), dtype=np.int16)
+    for dx, dy in DIRECTIONS:
+        # One window per start cell; windows running off the board contain EDGE
+        cells = [padded[:, PAD + dy * i:PAD + dy * i + GRID_SIZE, PAD + dx * i:PAD + dx * i + GRID_SIZE]
+                 for i in range(5)]
+        own = sum((c == 1).astype(np.int8) for c in cells)
+        opp = sum((c == -1).astype(np.int8) for c in cells)
+        on_board = ~np.logical_or.reduce([c == EDGE for c in cells])
+        for k in range(1, 5):
+            counts[:, k - 1] += (on_board & (opp == 0) & (own == k)).sum(axis=(1, 2), dtype=np.int16)
+            counts[:, 3 + k] += (on_board & (own == 0) & (opp == k)).sum(axis=(1, 2), dtype=np.int16)
+    return counts
+
+def spool(paths: Iterable[str], path: str, chunk_size: int) -> int:
+    """Extracts every position's features into a flat file of RECORDs; returns the position count."""
+    positions = 0
+    with open(path, "wb") as f:
+        for boards, labels in iter_chunks(iter_records(paths), chunk_size):
+            rows = np.empty(len(labels), dtype=RECORD)
+            rows['x'] = extract_features(boards)
+            rows['y'] = labels
+            f.write(rows.tobytes())
+            positions += len(labels)
+    return positions
+
+def fit(path: str, chunk_size: int, l2: float = 1.0, iterations: int = 25):
+    """Ridge-penalised logistic regression over the spooled features by Newton's method.
+
+    Every iteration streams the memory-mapped file in chunks and sums the gradient
+    and Hessian. Returns (coefficients per feature, intercept, mean log-loss).
+    """
+    data = np.memmap(path, dtype=RECORD, mode="r")
+    width = len(FEATURES) + 1
+    penalty = np.full(width, l2)
+    penalty[0] = 0.0 # the intercept is not shrunk
+
+    def chunks():
+        for start in range(0, len(data), chunk_size):
+            rows = data[start:start + chunk_size]
+            yield np.hstack([np.ones((len(rows), 1)), rows['x'].astype(np.float64)]), rows['y'].astype(np.float64)
+
+    beta = np.zeros(width)
+    for _ in range(iterations):
+        gradient = -penalty * beta
+        hessian = np.diag(penalty)
+        for X, y in chunks():
+            p = 1 / (1 + np.exp(-X @ beta))
+            gradient += X.T @ (y - p)
+            hessian += (X * (p * (1 - p))[:, None]).T @ X
+        step = np.linalg.solve(hessian, gradient)
+        beta += step
+        if np.abs(step).max() < 1e-6:
+            break
+
+    loss = 0.0
+    for X, y in chunks():
+        p = np.clip(1 / (1 + np.exp(-X @ beta)), 1e-12, 1 - 1e-12)
+        loss -= (y * np.log(p) + (1 - y) * np.log(1 - p)).sum()
+    return dict(zip(FEATURES, beta[1:].tolist())), float(beta[0]), loss / len(data)
+
+def to_weights(coefficients: Dict[str, float]) -> Dict[str, int]:
+    """Move weights from window values, scaled so the tuned ones sum like the hand-picked ones.
+
+    After our move the opponent is the mover, so a move is worth minus the fitted
+    evaluation from their side: extending our k-window swaps opp_k for opp_k+1, and
+    blocking their k-window removes an own_k. The scale keeps score-based thresholds
+    such as BLUNDER_THRESHOLD meaningful.
+    """
+    tuned = {
+        'two': coefficients['opp_2'] - coefficients['opp_3'],
+        'three': coefficients['opp_3'] - coefficients['opp_4'],
+        'block_two': coefficients['own_2'],
+        'block_three': coefficients['own_3'],
+        'block_four': coefficients['own_4']
+    }
+    tuned = {name: max(0.0, value) for name, value in tuned.items()}
+    total = sum(tuned.values())
+    if total == 0:
+        raise ValueError("no window predicts the outcome; is the archive large enough?")
+    scale = sum(HAND_WEIGHTS[name] for name in tuned) / total
+    weights = {name: int(round(value * scale)) for name, value in tuned.items()}
+    weights['four'] = HAND_WEIGHTS['four']
+    # The fit knows nothing of the ordering the searcher relies on, so restore it:
+    # block_four sits below four and above every lesser window through a cell together
+    lesser = max(weights[name] for name in LESSER_WEIGHTS)
+    weights['block_four'] = min(max(weights['block_four'], WINDOWS_PER_CELL * lesser + 1), weights['four'] - 1)
+    limit = (weights['block_four'] - 1) // WINDOWS_PER_CELL
+    if lesser > limit:
+        weights.update({name: weights[name] * limit // lesser for name in LESSER_WEIGHTS})
+    check_weights(weights)
+    return weights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="game records (.json), archives (.jsonl) or directories")
+    parser.add_argument("--out", default=WEIGHTS_FILE, help="weights file the evaluator loads at startup")
+    parser.add_argument("--chunk", type=int, default=16384, help="positions per NumPy batch")
+    parser.add_argument("--l2", type=float, default=1.0, help="ridge penalty on the coefficients")
+    parser.add_argument("--dry-run", action="store_true", help="print the weights without writing them")
+    args = parser.parse_args()
+    if np is None:
+        raise SystemExit("tools.tune needs NumPy: pip install numpy")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    spool_path = os.path.join(CACHE_DIR, "tune_features.bin")
+    started = time.perf_counter()
+    positions = spool(args.paths, spool_path, args.chunk)
+    if not positions:
+        raise SystemExit("no positions found")
+    extracted = time.perf_counter() - started
+
+    coefficients, intercept, loss = fit(spool_path, args.chunk, args.l2)
+    os.remove(spool_path)
+    weights = to_weights(coefficients)
+    if not args.dry_run:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(weights, f, indent=2)
+
+    print(json.dumps({
+        'positions': positions,
+        'positions_per_sec': round(positions / extracted),
+        'fit_seconds': round(time.perf_counter() - started - extracted, 2),
+        'log_loss': round(loss, 4),
+        'baseline_log_loss': round(math.log(2), 4),
+        'intercept': round(intercept, 4),
+        'coefficients': {name: round(value, 4) for name, value in coefficients.items()},
+        'weights': weights,
+        'written': None if args.dry_run else args.out
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
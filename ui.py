@@ -9,6 +9,12 @@ class Button:
         self.surface = font.render(text, True, color)
         self.rect = self.surface.get_rect(topleft=(x, y))
 
+    def set_text(self, text: str):
+        """Re-renders the label, keeping the button's top-left corner."""
+        self.text = text
+        self.surface = self.font.render(text, True, self.color)
+        self.rect = self.surface.get_rect(topleft=self.rect.topleft)
+
     def is_clicked(self, pos: Tuple[int, int]) -> bool:
         return self.rect.collidepoint(pos)
 
@@ -0,0 +1,134 @@
+from array import array
+from typing import List, Optional, Tuple
+from constants import GRID_SIZE
+from engine import zobrist
+
+Move = Tuple[int, int]
+
+ROOT = 0
+NO_NODE = -1
+
+class VariationTree:
+    """Every line explored in a game, stored once per move with shared prefixes.
+
+    Nodes are indices into parallel arrays (about 28 bytes per move) instead of
+    objects or board copies. Each node knows its parent, its first child and next
+    sibling, the child that `forward` follows, its depth and the Zobrist hash of
+    its position, so any two nodes can be compared or joined without replaying
+    the game from the start.
+    """
+
+    def __init__(self):
+        self.moves = array('H', [0])        # y * GRID_SIZE + x; unused for the root
+        self.parents = array('i', [NO_NODE])
+        self.first_child = array('i', [NO_NODE])
+        self.next_sibling = array('i', [NO_NODE])
+        self.selected = array('i', [NO_NODE]) # child `forward` follows (last one played or visited)
+        self.depths = array('H', [0])
+        self.keys = array('Q', [0])
+        self.current = ROOT
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def move(self, node: int) -> Move:
+        return self.moves[node] % GRID_SIZE, self.moves[node] // GRID_SIZE
+
+    def children(self, node: int) -> List[int]:
+        result = []
+        child = self.first_child[node]
+        while child != NO_NODE:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def find_child(self, node: int, x: int, y: int) -> int:
+        code = y * GRID_SIZE + x
+        child = self.first_child[node]
+        while child != NO_NODE and self.moves[child] != code:
+            child = self.next_sibling[child]
+        return child
+
+    def play(self, x: int, y: int) -> int:
+        """Moves to the child for (x, y), creating it if this line is new."""
+        node = self.find_child(self.current, x, y)
+        if node == NO_NODE:
+            node = len(self.moves)
+            parent = self.current
+            char = 'X' if self.depths[parent] % 2 == 0 else 'O'
+            self.moves.append(y * GRID_SIZE + x)
+            self.parents.append(parent)
+            self.first_child.append(NO_NODE)
+            self.selected.append(NO_NODE)
+            self.depths.append(self.depths[parent] + 1)
+            self.keys.append(zobrist.toggle(self.keys[parent], x, y, char))
+            # New variations go last so sibling order follows the order they were explored
+            self.next_sibling.append(NO_NODE)
+            last = self.first_child[parent]
+            if last == NO_NODE:
+                self.first_child[parent] = node
+            else:
+                while self.next_sibling[last] != NO_NODE:
+                    last = self.next_sibling[last]
+                self.next_sibling[last] = node
+        self.selected[self.current] = node
+        self.current = node
+        return node
+
+    def path_between(self, source: int, target: int) -> Tuple[List[int], List[int]]:
+        """Nodes to take back from `source` (deepest first) and to play towards `target` (in order).
+
+        Walks both nodes up to their common ancestor, so the cost is proportional
+        to how far apart they are, not to the length of the game.
+        """
+        back, forward = [], []
+        while self.depths[source] > self.depths[target]:
+            back.append(source)
+            source = self.parents[source]
+        while self.depths[target] > self.depths[source]:
+            forward.append(target)
+            target = self.parents[target]
+        while source != target:
+            back.append(source)
+            forward.append(target)
+            source = self.parents[source]
+            target = self.parents[target]
+        forward.reverse()
+        return back, forward
+
+    def select_path(self, forward: List[int]):
+        """Makes `forward` (as returned by `path_between`) the line `forward` follows.
+
+        The line from the root to `current` is always selected already, so only
+        the nodes below the common ancestor need marking: O(depth difference).
+        """
+        for node in forward:
+            self.selected[self.parents[node]] = node
+
+    def line(self, node: Optional[int] = None) -> List[Move]:
+        """Moves from the start of the game to `node` (default: the current node)."""
+        node = self.current if node is None else node
+        moves = []
+        while node != ROOT:
+            moves.append(self.move(node))
+            node = self.parents[node]
+        moves.reverse()
+        return moves
+
+    def continuation(self, node: Optional[int] = None) -> List[int]:
+        """Nodes `forward` would step through from `node` to the end of its selected line."""
+        node = self.current if node is None else node
+        result = []
+        node = self.selected[node]
+        while node != NO_NODE:
+            result.append(node)
+            node = self.selected[node]
+        return result
+
+    def sibling_index(self, node: Optional[int] = None) -> Tuple[int, int]:
+        """(1-based position, count) of `node` among its parent's children."""
+        node = self.current if node is None else node
+        if node == ROOT:
+            return 1, 1
+        siblings = self.children(self.parents[node])
+        return siblings.index(node) + 1, len(siblings)